@@ -19,20 +19,50 @@
 # along with this program. If not, see http://www.gnu.org/licenses/.
 #------------------------------------------------------------------------------
 
+import os
+import sys
 import time
+from array import array
 from datetime import datetime, timedelta, tzinfo
-import calendar
-import re
 import math
 
-import pytz
-import six
+from . import clock, tzindex
+from .cache import IntervalCache
+from .timestamp import Timestamp
+from .cal import Calendar
 
 #------------------------------------------------------------------------------
 
-DEFAULT_TZ              = pytz.UTC
+# note: None means UTC, which avoids importing the timezone backend
+#       (e.g. pytz) until a timezone is actually needed.
+DEFAULT_TZ              = None
+DEFAULT_BACKEND         = 'pytz'
 DAYSPERYEAR             = 365.2422
 
+_EPOCH_ORDINAL          = 719163
+_DAYSINMONTH            = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_TIMEFIELDS             = ('hour', 'minute', 'second', 'microsecond')
+_INTEGER_TYPES          = ( int, ) if sys.version_info[0] >= 3 else ( int, long )
+_STRING_TYPES           = ( str, ) if sys.version_info[0] >= 3 else ( basestring, )
+_tzindexes              = dict()
+# tzinfo => UTC offset in seconds, or None if it has transitions (see
+# `_fixedOffset`)
+_fixedOffsets           = dict()
+# the timezone backend (see `setBackend`), created on first use
+_backend                = None
+# the active clock and its bound methods (see `setClock`)
+_clock                  = clock.PreciseClock()
+_now                    = _clock.time
+_nowNs                  = _clock.time_ns
+_periods                = IntervalCache(maxsize=1024)
+
+_ZULU_MS                = tuple('.%03dZ' % (ms,) for ms in range(1000))
+_ZULU_MSB               = tuple(ms.encode('ascii') for ms in _ZULU_MS)
+# the most recently formatted (second, prefix, bytes prefix) and
+# (day, date prefix) of `zulu`
+_zulu_second            = ( None, None, None )
+_zulu_day               = ( None, None )
+
 #------------------------------------------------------------------------------
 def setDefaultTz(tz):
   global DEFAULT_TZ
@@ -40,14 +70,52 @@ def setDefaultTz(tz):
 
 #------------------------------------------------------------------------------
 def getDefaultTz():
+  '''
+  Returns the package-default timezone's `datetime.tzinfo` object.
+  Note that `DEFAULT_TZ` itself is None (meaning UTC) until
+  :func:`setDefaultTz` is called.
+  '''
   return getTz()
 
+#------------------------------------------------------------------------------
+def setBackend(name):
+  '''
+  Selects the timezone backend that :func:`getTz` uses to resolve
+  timezone names: ``'pytz'`` (the default) or ``'zoneinfo'`` (the
+  standard library's `zoneinfo` module). The initial backend can also
+  be selected with the ``EPOCH_TZ_BACKEND`` environment variable.
+  Changing the backend empties the period interval cache and the
+  transition index cache; `tzinfo` objects that were already resolved
+  (including the default timezone, if set) remain usable.
+  '''
+  global _backend
+  from . import backends
+  _backend = backends.create(name)
+  _tzindexes.clear()
+  _fixedOffsets.clear()
+  _periods.clear()
+
+#------------------------------------------------------------------------------
+def getBackend():
+  '''
+  Returns the name of the current timezone backend (see
+  :func:`setBackend`).
+  '''
+  return ( _backend or _initBackend() ).name
+
+#------------------------------------------------------------------------------
+def _initBackend():
+  if _backend is None:
+    setBackend(os.environ.get('EPOCH_TZ_BACKEND') or DEFAULT_BACKEND)
+  return _backend
+
 #------------------------------------------------------------------------------
 def getTz(tz=None):
   '''
-  Returns the `datetime.tzinfo` object for timezone `tz`. If `tz` is
-  None or not specified, returns the package-default timezone, which
-  defaults to UTC.
+  Returns the `datetime.tzinfo` object for timezone `tz`, which is
+  resolved by the current backend (see :func:`setBackend`) if it is a
+  timezone name. If `tz` is None or not specified, returns the
+  package-default timezone, which defaults to UTC.
   '''
   # todo: should `tz` default to the machines default locale? this is
   #       good for client-side programs, but not for server-side
@@ -55,11 +123,160 @@ def getTz(tz=None):
   tz = tz or DEFAULT_TZ
   if isinstance(tz, tzinfo):
     return tz
-  return pytz.timezone(tz)
+  backend = _backend or _initBackend()
+  if tz is None:
+    return backend.utc
+  return backend.timezone(tz)
+
+#------------------------------------------------------------------------------
+def getTzIndex(tz=None):
+  '''
+  Returns the :class:`epoch.tzindex.TzIndex` compiled transition
+  index for timezone `tz`, which can be anything accepted by
+  :func:`getTz`. Indexes are built on first use and then cached. If
+  the timezone's type is not supported (e.g. `zoneinfo` timezones,
+  which do their own transition lookups), None is returned.
+  '''
+  tz = getTz(tz)
+  try:
+    return _tzindexes[tz]
+  except KeyError:
+    pass
+  # note: pytz attaches a distinct tzinfo object to a `datetime` for
+  #       each period of a timezone, so they are all mapped to the
+  #       index of the timezone that they belong to.
+  zone = tz
+  infos = getattr(tz, '_transition_info', None)
+  tzinfos = getattr(tz, '_tzinfos', None)
+  if infos and tzinfos:
+    zone = tzinfos.get(infos[0], tz)
+  if zone not in _tzindexes:
+    _tzindexes[zone] = tzindex.build(zone)
+  ret = _tzindexes[tz] = _tzindexes[zone]
+  return ret
+
+#------------------------------------------------------------------------------
+def _localize(dt):
+  # equivalent to ``dt.tzinfo.localize(dt.replace(tzinfo=None))``, but
+  # uses the compiled transition index when available.
+  if not dt.tzinfo:
+    raise TypeError('cannot localize a naive datetime')
+  index = getTzIndex(dt.tzinfo)
+  if index is None:
+    if hasattr(dt.tzinfo, 'localize'):
+      return dt.tzinfo.localize(dt.replace(tzinfo=None))
+    return _localizeFold(dt)
+  local = ( dt.toordinal() - _EPOCH_ORDINAL ) * 86400 \
+    + dt.hour * 3600 + dt.minute * 60 + dt.second
+  return dt.replace(tzinfo=index.tzinfos[index.localize(local)[1]])
+
+#------------------------------------------------------------------------------
+def _ts2local(sec, tz):
+  # converts the integer UTC epoch seconds `sec` to local "wall clock"
+  # seconds since 1970/01/01 in timezone `tz`
+  tz = getTz(tz)
+  index = getTzIndex(tz)
+  if index is not None:
+    return index.toLocal(sec)
+  offset = ts2dt(sec, tz).utcoffset()
+  return sec + offset.days * 86400 + offset.seconds
+
+#------------------------------------------------------------------------------
+def _local2ts(local, tz):
+  # converts the integer local "wall clock" seconds since 1970/01/01
+  # `local` in timezone `tz` to UTC epoch seconds, resolving
+  # non-existent and ambiguous times as `_localize` does.
+  tz = getTz(tz)
+  index = getTzIndex(tz)
+  if index is not None:
+    return index.localize(local)[0]
+  days, tod = divmod(local, 86400)
+  year, month, day = _days2civil(days)
+  dt = datetime(
+    year, month, day, tod // 3600, tod // 60 % 60, tod % 60, tzinfo=tz)
+  return int(dt2ts(_localize(dt)))
+
+#------------------------------------------------------------------------------
+def _localizeFold(dt):
+  # resolves `dt` on a PEP 495 (i.e. `fold`-aware) timezone, such as
+  # `zoneinfo`, exactly as pytz's ``localize(is_dst=False)`` does:
+  # times in a gap use the offset from before the gap, and ambiguous
+  # times use the non-DST (or, failing that, the later) occurrence.
+  first = dt.replace(fold=0)
+  second = dt.replace(fold=1)
+  before = first.utcoffset()
+  after = second.utcoffset()
+  if before == after or after > before:
+    # unambiguous, or in a gap (where `fold=0` is the offset before)
+    return first
+  if bool(first.dst()) != bool(second.dst()):
+    return second if first.dst() else first
+  return second
+
+#------------------------------------------------------------------------------
+def setClock(source=None, *args, **kw):
+  '''
+  Selects the clock used by :func:`now` (and therefore by every
+  function whose timestamp defaults to the current time). `source` can
+  be an :class:`epoch.clock.Clock` instance, or the name of one of the
+  clocks in :mod:`epoch.clock` (``'precise'``, ``'monotonic'``,
+  ``'coarse'`` or ``'frozen'``), in which case any additional
+  parameters are passed to its constructor. If `source` is None, the
+  default precise clock (i.e. :func:`time.time`) is restored. The
+  previously active clock is stopped, and the new one is started and
+  returned. Example:
+
+  .. code:: python
+
+    epoch.setClock('coarse', resolution=0.01)
+    frozen = epoch.setClock('frozen', 1446303600)
+    frozen.advance(60)
+  '''
+  global _clock, _now, _nowNs
+  if source is None:
+    source = clock.PreciseClock()
+  elif not isinstance(source, clock.Clock):
+    source = clock.create(source, *args, **kw)
+  if source is _clock:
+    return source
+  previous = _clock
+  source.start()
+  _clock, _now, _nowNs = source, source.time, source.time_ns
+  previous.stop()
+  return source
+
+#------------------------------------------------------------------------------
+def getClock():
+  '''
+  Returns the active :class:`epoch.clock.Clock` (see :func:`setClock`).
+  '''
+  return _clock
 
 #------------------------------------------------------------------------------
 def now():
-  return time.time()
+  '''
+  Returns the current epoch time, as a float, from the active clock
+  (see :func:`setClock`).
+  '''
+  return _now()
+
+#------------------------------------------------------------------------------
+def now_ns():
+  '''
+  Returns the current epoch time as an integer number of nanoseconds
+  (see :mod:`epoch.ns`).
+  '''
+  from . import ns
+  return ns.now()
+
+#------------------------------------------------------------------------------
+def now_us():
+  '''
+  Returns the current epoch time as an integer number of microseconds
+  (see :mod:`epoch.us`).
+  '''
+  from . import us
+  return us.now()
 
 #------------------------------------------------------------------------------
 def zulu(ts=None, ms=True):
@@ -74,13 +291,109 @@ def zulu(ts=None, ms=True):
   '''
   if ts is None:
     ts = now()
+  sec = int(math.floor(ts))
+  prefix = _zulu_second
+  if prefix[0] != sec:
+    prefix = _zuluPrefix(sec)
   # todo: should this really truncate to three digits?...
-  ms = '.%03dZ' % (round(ts * 1000) % 1000,) if ms else 'Z'
-  return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ts)) + ms
+  if ms:
+    return prefix[1] + _ZULU_MS[int(round(ts * 1000) % 1000)]
+  return prefix[1] + 'Z'
 z = zulu
 
 #------------------------------------------------------------------------------
-def parse(text):
+def _zuluPrefix(sec):
+  # returns (and caches) the ``(sec, 'YYYY-MM-DDTHH:MM:SS', b'...')``
+  # zulu prefix of the epoch second `sec`, reusing the cached date
+  # prefix if `sec` is on the same day.
+  global _zulu_second, _zulu_day
+  day, rem = divmod(sec, 86400)
+  date = _zulu_day
+  if date[0] != day:
+    date = _zulu_day = (
+      day, time.strftime('%Y-%m-%dT', time.gmtime(day * 86400)))
+  prefix = '%s%02d:%02d:%02d' % (date[1], rem // 3600, rem // 60 % 60, rem % 60)
+  ret = _zulu_second = ( sec, prefix, prefix.encode('ascii') )
+  return ret
+
+#------------------------------------------------------------------------------
+def zulu_many(values, ms=True, out=None):
+  '''
+  Formats the epoch timestamps in the iterable `values` with
+  :func:`zulu` (with the same `ms` semantics) and returns a list of the
+  resulting strings. Consecutive timestamps that fall within the same
+  second (or day) reuse the previously formatted prefix.
+
+  If `out` is specified, it must be a writable buffer (such as a
+  `bytearray`) of sufficient size, and the ASCII-encoded results are
+  written into it back-to-back (each being 24 bytes long, or 20 if
+  `ms` is falsy) instead of creating a string for each one; the
+  number of bytes written is then returned.
+
+  If `values` is a NumPy array, the formatting is vectorized (see
+  :func:`epoch.vec.zulu`) and, if `out` is not specified, a NumPy
+  string array of the same shape is returned.
+  '''
+  if hasattr(values, 'dtype') and hasattr(values, 'shape'):
+    from . import vec
+    if out is None:
+      return vec.zulu(values, ms=ms)
+    data = vec._zulu(values, ms).reshape(-1)
+    memoryview(out)[:data.size] = memoryview(data)
+    return data.size
+  if out is None:
+    return [zulu(ts, ms) for ts in values]
+  view = memoryview(out)
+  size = 24 if ms else 20
+  pos = 0
+  for ts in values:
+    sec = int(math.floor(ts))
+    prefix = _zulu_second
+    if prefix[0] != sec:
+      prefix = _zuluPrefix(sec)
+    view[pos:pos + 19] = prefix[2]
+    view[pos + 19:pos + size] = \
+      _ZULU_MSB[int(round(ts * 1000) % 1000)] if ms else b'Z'
+    pos += size
+  return pos
+
+#------------------------------------------------------------------------------
+def formatter(pattern, tz=None):
+  '''
+  Returns a callable that formats an epoch timestamp (or None for the
+  current time) in timezone `tz` according to the strftime-like
+  `pattern`, e.g. ``epoch.formatter('%Y-%m-%d %H:%M %Z',
+  'Europe/Paris')(1446303600)`` => ``'2015-10-31 16:00 CET'``. The
+  callable also accepts NumPy arrays (returning a string array) and
+  other iterables (returning a list).
+
+  `pattern` can also be one of the presets ``'iso8601'``,
+  ``'compact'``, ``'rfc3339'`` or ``'rfc1123'`` (the ``'compact'`` and
+  ``'rfc1123'`` presets are always rendered in UTC, as they end in a
+  ``Z`` and ``GMT`` designator respectively). Patterns are compiled
+  once and cached per (pattern, tz); local offsets are taken from the
+  timezone's transition index. See :mod:`epoch.fmt` for the supported
+  directives.
+  '''
+  from . import fmt
+  return fmt.formatter(pattern, tz)
+
+#------------------------------------------------------------------------------
+def cron(expr, tz=None):
+  '''
+  Compiles the cron expression `expr` (e.g. ``'30 9 * * mon-fri'``)
+  in timezone `tz` and returns an :class:`epoch.crontab.Cron` object,
+  whose ``next(ts)``, ``prev(ts)`` and ``iter(start, end)`` methods
+  return its fire times. Compiled expressions are cached per (expr,
+  tz). See :mod:`epoch.crontab` for the supported syntax and
+  :func:`epoch.crontab.next_many` for evaluating many expressions at
+  once.
+  '''
+  from . import crontab
+  return crontab.cron(expr, tz)
+
+#------------------------------------------------------------------------------
+def parse(text, tz=None):
   '''
   Tries the following methods of extracting an epoch timestamp from
   `text`:
@@ -88,22 +401,82 @@ def parse(text):
   * Checks for None, integer, or float type (and returns that as-is)
   * Checks for an all-digits text, and casts that to float
   * Fallsback to parsing via :func:`parseZulu`
+  * Fallsback to parsing via :func:`epoch.iso.parse`, which also
+    accepts UTC offsets, date-only values, ordinal and week dates and
+    fractions of any precision; values without a UTC offset are
+    interpreted as local times in timezone `tz`
 
   Note that this function is intended to be used with code-generated
   strings (such as those generated by `epoch.zulu`), and is therefore
   not very forgiving. For a much more human-friendly parser, see the
   example in :func:`parseZulu`.
   '''
-  if text is None or isinstance(text, six.integer_types + (float,)):
+  if text is None or isinstance(text, _INTEGER_TYPES + (float,)):
     return text
+  if isinstance(text, _STRING_TYPES):
+    ret = _parseZuluFast(text)
+    if ret is not None:
+      return ret
   try:
     return float(text)
   except ValueError:
     pass
-  return parseZulu(text)
+  if not isinstance(text, _STRING_TYPES) or _zuluRegex().match(text):
+    return parseZulu(text)
+  from . import iso
+  return iso.parse(text, tz)
+
+#------------------------------------------------------------------------------
+def parse_many(values, numpy=False, tz=None):
+  '''
+  Parses each value in the iterable `values` with :func:`parse`
+  (`bytes` values are decoded as ASCII first) and returns the results
+  as an ``array.array('d')``, or as a NumPy float64 array if `numpy`
+  is truthy. None values are returned as NaN.
+
+  Strings that are not in the canonical :func:`zulu` format are parsed
+  with an :class:`epoch.iso.Parser`, which sniffs the layout of the
+  first such value and parses subsequent values with the same layout
+  without rescanning them.
+
+  If `values` is a NumPy string array, the parsing is vectorized (see
+  :func:`epoch.vec.parseZulu`) and a NumPy array is always returned.
+  '''
+  if hasattr(values, 'dtype') and values.dtype.kind in 'SU':
+    from . import vec
+    return vec.parseZulu(values)
+  ret = array('d')
+  append = ret.append
+  sniffer = None
+  for value in values:
+    if isinstance(value, bytes) and not isinstance(value, str):
+      value = value.decode('ascii')
+    if isinstance(value, _STRING_TYPES):
+      ts = _parseZuluFast(value)
+      if ts is None:
+        # note: numeric strings are epoch timestamps, exactly as in
+        #       `parse`, and not layouts to sniff (e.g. ``20151031``).
+        try:
+          ts = float(value)
+        except ValueError:
+          pass
+      if ts is None:
+        if sniffer is None:
+          from . import iso
+          sniffer = iso.Parser(tz)
+        ts = sniffer(value)
+    else:
+      ts = parse(value)
+      if ts is None:
+        ts = float('nan')
+    append(ts)
+  if numpy:
+    import numpy
+    return numpy.frombuffer(ret, dtype=numpy.float64)
+  return ret
 
 #------------------------------------------------------------------------------
-_zulu_cre = re.compile(r'^(\d{4})-?(\d{2})-?(\d{2})T(\d{2}):?(\d{2}):?(\d{2})(\.(\d{1,6})(\d*))?Z$')
+_zulu_cre = None
 def parseZulu(text):
   '''
   Parses an ISO 8601 Combined string into an epoch timestamp. Note
@@ -119,7 +492,10 @@ def parseZulu(text):
   for example ``01/02/03`` gets interpreted without hesitation as
   ``2003/01/02``... ugh.
   '''
-  res = _zulu_cre.match(text)
+  ret = _parseZuluFast(text)
+  if ret is not None:
+    return ret
+  res = _zuluRegex().match(text)
   if not res:
     raise SyntaxError(
       '%r is not a valid ISO 8601 Combined date/time string' % (text,))
@@ -130,7 +506,114 @@ def parseZulu(text):
       res[6] = float(res[6] + '.' + res[8])
   else:
     res[6] = 0
-  return dt2ts(pytz.UTC.localize(datetime(*[int(x) for x in res[:7]])))
+  return dt2ts(datetime(*[int(x) for x in res[:7]]))
+
+#------------------------------------------------------------------------------
+def _zuluRegex():
+  # compiles `_zulu_cre` on first use, so that `re` is not imported by
+  # programs that never need it
+  global _zulu_cre
+  if _zulu_cre is None:
+    import re
+    _zulu_cre = re.compile(
+      r'^(\d{4})-?(\d{2})-?(\d{2})T(\d{2}):?(\d{2}):?(\d{2})(\.(\d{1,6})(\d*))?Z$')
+  return _zulu_cre
+
+#------------------------------------------------------------------------------
+def scan(source, column=0, sep=b' ', chunksize=None, errors='raise', numpy=None):
+  '''
+  Generator that extracts the epoch timestamp in field `column` (as
+  separated by the single byte `sep`) of each line of the file,
+  filename or buffer `source`, and yields the parsed values in
+  constant-size chunks as NumPy arrays (or ``array('d')`` objects if
+  NumPy is not available). See :func:`epoch.stream.scan` for details.
+  '''
+  from . import stream
+  return stream.scan(
+    source, column=column, sep=sep,
+    chunksize=chunksize or stream.DEFAULT_CHUNKSIZE,
+    errors=errors, numpy=numpy)
+
+#------------------------------------------------------------------------------
+def _parseZuluFast(text):
+  # parses the canonical output of `zulu`, i.e. 'YYYY-MM-DDTHH:MM:SSZ'
+  # or 'YYYY-MM-DDTHH:MM:SS.mmmZ', arithmetically. returns None for
+  # anything else (including invalid dates), which must then be handled
+  # by the regex-based parser.
+  ret = _zuluFields(text)
+  if ret is None:
+    return None
+  return float(ret[0]) + ( ret[1] * 1000 / 1000000.0 )
+
+#------------------------------------------------------------------------------
+def _zuluFields(text):
+  # the implementation of `_parseZuluFast`, which returns the parsed
+  # tuple of integer (seconds, milliseconds) instead.
+  size = len(text)
+  if size == 24:
+    if text[19] != '.':
+      return None
+    digits = text[20:23]
+  elif size == 20:
+    digits = '0'
+  else:
+    return None
+  if text[4] != '-' or text[7] != '-' or text[10] != 'T' \
+      or text[13] != ':' or text[16] != ':' or text[-1] != 'Z':
+    return None
+  digits += text[:4] + text[5:7] + text[8:10] \
+    + text[11:13] + text[14:16] + text[17:19]
+  if not digits.isdigit():
+    return None
+  try:
+    year, month, day = int(text[:4]), int(text[5:7]), int(text[8:10])
+    hour, minute, second = int(text[11:13]), int(text[14:16]), int(text[17:19])
+    msec = int(text[20:23]) if size == 24 else 0
+  except ValueError:
+    return None
+  if not 1 <= month <= 12 or day < 1 or hour > 23 or minute > 59 \
+      or second > 59 or year < 1 or day > _daysInMonth(year, month):
+    return None
+  return (
+    _civil2days(year, month, day) * 86400 + hour * 3600 + minute * 60 + second,
+    msec )
+
+#------------------------------------------------------------------------------
+def _isLeap(year):
+  return year % 4 == 0 and ( year % 100 != 0 or year % 400 == 0 )
+
+#------------------------------------------------------------------------------
+def _daysInMonth(year, month):
+  if month == 2 and _isLeap(year):
+    return 29
+  return _DAYSINMONTH[month]
+
+#------------------------------------------------------------------------------
+def _days2civil(days):
+  # returns the proleptic Gregorian (year, month, day) of the number of
+  # days since 1970/01/01 `days`. see:
+  #   http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+  days += 719468
+  era = days // 146097
+  doe = days - era * 146097
+  yoe = ( doe - doe // 1460 + doe // 36524 - doe // 146096 ) // 365
+  doy = doe - ( 365 * yoe + yoe // 4 - yoe // 100 )
+  mp = ( 5 * doy + 2 ) // 153
+  day = doy - ( 153 * mp + 2 ) // 5 + 1
+  month = mp + 3 if mp < 10 else mp - 9
+  return ( yoe + era * 400 + ( 1 if month <= 2 else 0 ), month, day )
+
+#------------------------------------------------------------------------------
+def _civil2days(year, month, day):
+  # returns the number of days since 1970/01/01 of the specified
+  # proleptic Gregorian date. see:
+  #   http://howardhinnant.github.io/date_algorithms.html#days_from_civil
+  if month <= 2:
+    year -= 1
+  era = year // 400
+  yoe = year - era * 400
+  doy = ( 153 * ( month - 3 if month > 2 else month + 9 ) + 2 ) // 5 + day - 1
+  return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
 
 #------------------------------------------------------------------------------
 def dt2ts(dt):
@@ -138,7 +621,16 @@ def dt2ts(dt):
   Returns a UNIX epoch timestamp for the specified `datetime.datetime`
   object.
   '''
-  return float(calendar.timegm(dt.utctimetuple())) + ( dt.microsecond / 1000000.0 )
+  # note: this is ``calendar.timegm(dt.utctimetuple())``, but without
+  #       the `time.struct_time` (or the import of `calendar`)
+  ret = ( dt.toordinal() - _EPOCH_ORDINAL ) * 86400 \
+    + dt.hour * 3600 + dt.minute * 60 + dt.second
+  offset = dt.utcoffset()
+  if offset:
+    ret -= offset.days * 86400 + offset.seconds
+    if offset.microseconds > dt.microsecond:
+      ret -= 1
+  return float(ret) + ( dt.microsecond / 1000000.0 )
 
 #------------------------------------------------------------------------------
 def ts2dt(ts, tz=None):
@@ -158,7 +650,9 @@ def dtreplace(dt, *args, **kw):
   '''
   if 'tzinfo' in kw:
     raise TypeError('dtreplace cannot be used to replace `tzinfo`')
-  return dt.tzinfo.localize(dt.replace(tzinfo=None).replace(*args, **kw))
+  if not dt.tzinfo:
+    raise TypeError('dtreplace cannot be used with naive datetimes')
+  return _localize(dt.replace(*args, **kw))
 
 #------------------------------------------------------------------------------
 def tsreplace(ts=None, tz=None, *args, **kw):
@@ -185,6 +679,15 @@ def tsreplace(ts=None, tz=None, *args, **kw):
   '''
   if ts is None:
     ts = now()
+  if not args:
+    tz = getTz(tz)
+    fixed = _fixedOffset(tz)
+    if fixed is not None:
+      local = _fixedLocal(ts, fixed)
+      if local is not None:
+        ret = _fixedResult(_fixedFields(*local), fixed, kw)
+        if ret is not None:
+          return ret
   return dt2ts(dtreplace(ts2dt(ts, tz=tz), *args, **kw))
 
 #------------------------------------------------------------------------------
@@ -198,7 +701,7 @@ def tzcorrect(dt):
   '''
   if not dt.tzinfo:
     raise TypeError('tzcorrect cannot be used with naive datetimes')
-  return dt.tzinfo.localize(dt.replace(tzinfo=None))
+  return _localize(dt)
 
 #------------------------------------------------------------------------------
 def sod(ts=None, tz=None, boundary=None, offset=None, replace=None):
@@ -236,6 +739,15 @@ def sod(ts=None, tz=None, boundary=None, offset=None, replace=None):
   tz = getTz(tz)
   if ts is None:
     ts = now()
+  fixed = _fixedOffset(tz)
+  if fixed is not None:
+    ret = _fixedSod(ts, fixed, offset, replace, boundary)
+    if ret is not None:
+      return ret
+  return _cached(_sod, ts, tz, offset, replace, boundary=boundary)
+
+#------------------------------------------------------------------------------
+def _sod(ts, tz, offset=None, replace=None, boundary=None):
   offset = int(offset or 0)
   ret = ts2dt(ts, tz=tz)
   if boundary:
@@ -268,6 +780,15 @@ def sow(ts=None, tz=None, offset=None, day=None, replace=None):
   tz = getTz(tz)
   if ts is None:
     ts = now()
+  fixed = _fixedOffset(tz)
+  if fixed is not None:
+    ret = _fixedSow(ts, fixed, offset, replace, day)
+    if ret is not None:
+      return ret
+  return _cached(_sow, ts, tz, offset, replace, day=day)
+
+#------------------------------------------------------------------------------
+def _sow(ts, tz, offset=None, replace=None, day=None):
   offset = int(offset or 0)
   ret = dtreplace(ts2dt(ts, tz=tz), hour=0, minute=0, second=0, microsecond=0)
   day = min(max(int(day or 0), 0), 6)
@@ -302,6 +823,15 @@ def som(ts=None, tz=None, offset=None, replace=None):
   tz = getTz(tz)
   if ts is None:
     ts = now()
+  fixed = _fixedOffset(tz)
+  if fixed is not None:
+    ret = _fixedSom(ts, fixed, offset, replace)
+    if ret is not None:
+      return ret
+  return _cached(_som, ts, tz, offset, replace)
+
+#------------------------------------------------------------------------------
+def _som(ts, tz, offset=None, replace=None):
   offset = int(offset or 0)
   ret = dtreplace(ts2dt(ts, tz=tz), day=1, hour=0, minute=0, second=0, microsecond=0)
   if offset:
@@ -340,6 +870,15 @@ def soy(ts=None, tz=None, offset=None, replace=None):
   tz = getTz(tz)
   if ts is None:
     ts = now()
+  fixed = _fixedOffset(tz)
+  if fixed is not None:
+    ret = _fixedSoy(ts, fixed, offset, replace)
+    if ret is not None:
+      return ret
+  return _cached(_soy, ts, tz, offset, replace)
+
+#------------------------------------------------------------------------------
+def _soy(ts, tz, offset=None, replace=None):
   offset = int(offset or 0)
   ret = dtreplace(ts2dt(ts, tz=tz), month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
   if offset:
@@ -348,6 +887,422 @@ def soy(ts=None, tz=None, offset=None, replace=None):
     ret = dtreplace(ret, **replace)
   return dt2ts(ret)
 
+#------------------------------------------------------------------------------
+def iter_sod(start, end=None, tz=None, step=1):
+  '''
+  Generator of the epoch timestamps of the start of each day, in
+  timezone `tz`, from the day containing `start` up to (but excluding)
+  `end`, or indefinitely if `end` is None. If `step` is specified, it
+  is the number of days to advance by at each iteration. This yields
+  the same values as repeatedly calling ``ts = epoch.sod(ts, tz,
+  offset=step)``, but each day is derived arithmetically from the
+  previous one and only days within 24 hours of a DST transition
+  require a full localization.
+  '''
+  return _iterPeriods(_sod, start, end, tz, step, _nextDay)
+
+#------------------------------------------------------------------------------
+def iter_sow(start, end=None, tz=None, step=1, day=None):
+  '''
+  Generator of the epoch timestamps of the start of each week (where
+  `day` is the first day of the week, as for :func:`sow`) in timezone
+  `tz`, from the week containing `start` up to (but excluding) `end`,
+  advancing by `step` weeks. See :func:`iter_sod` for details.
+  '''
+  return _iterPeriods(_sow, start, end, tz, step, _nextWeek, day=day)
+
+#------------------------------------------------------------------------------
+def iter_som(start, end=None, tz=None, step=1):
+  '''
+  Generator of the epoch timestamps of the start of each month in
+  timezone `tz`, from the month containing `start` up to (but
+  excluding) `end`, advancing by `step` months. See :func:`iter_sod`
+  for details.
+  '''
+  return _iterPeriods(_som, start, end, tz, step, _nextMonth)
+
+#------------------------------------------------------------------------------
+def iter_soy(start, end=None, tz=None, step=1):
+  '''
+  Generator of the epoch timestamps of the start of each year in
+  timezone `tz`, from the year containing `start` up to (but
+  excluding) `end`, advancing by `step` years. See :func:`iter_sod`
+  for details.
+  '''
+  return _iterPeriods(_soy, start, end, tz, step, _nextYear)
+
+#------------------------------------------------------------------------------
+def bucketize(ts, period='day', tz=None, boundary=None, day=None, counts=False):
+  '''
+  Assigns each epoch timestamp in the array `ts` to the local day,
+  week, month or year (as selected by `period`) that contains it in
+  timezone `tz`, and returns a tuple of the array of bucket start
+  timestamps and the array of each element's bucket index, plus the
+  array of bucket counts if `counts` is truthy. The period boundaries
+  are computed once for the whole span of `ts`. This requires NumPy;
+  see :func:`epoch.vec.bucketize` for details.
+  '''
+  from . import vec
+  return vec.bucketize(
+    ts, period=period, tz=tz, boundary=boundary, day=day, counts=counts)
+
+#------------------------------------------------------------------------------
+def fields(ts, tz=None, which=None):
+  '''
+  Returns the local calendar fields (e.g. ``('year', 'month',
+  'weekday')``, which defaults to the year, month, day, hour, minute,
+  second and weekday) of each epoch timestamp in the array `ts` in
+  timezone `tz`, as a tuple of one integer array per field. The UTC
+  offsets are taken from the timezone's transition index and the
+  dates are computed for the whole array at once. This requires
+  NumPy; see :func:`epoch.vec.fields` for details.
+  '''
+  from . import vec
+  return vec.fields(ts, tz=tz, which=vec.FIELDS if which is None else which)
+
+#------------------------------------------------------------------------------
+def _nextDay(day, step):
+  return day + step
+
+#------------------------------------------------------------------------------
+def _nextWeek(day, step):
+  return day + step * 7
+
+#------------------------------------------------------------------------------
+def _nextMonth(day, step):
+  year, month, _ = _days2civil(day)
+  month += step - 1
+  return _civil2days(year + month // 12, month % 12 + 1, 1)
+
+#------------------------------------------------------------------------------
+def _nextYear(day, step):
+  return _civil2days(_days2civil(day)[0] + step, 1, 1)
+
+#------------------------------------------------------------------------------
+def _iterPeriods(func, start, end, tz, step, advance, **kw):
+  # the implementation of the `iter_*` generators: `func` is the
+  # (uncached) period function and `advance(day, step)` returns the
+  # local day number (i.e. days since 1970/01/01) of the period that
+  # is `step` periods after the one starting on local day `day`.
+  tz = getTz(tz)
+  step = int(step)
+  if step < 1:
+    raise ValueError('`step` must be a positive integer, not %r' % (step,))
+  if start is None:
+    start = now()
+  ts = func(start, tz, **kw)
+  index = getTzIndex(tz)
+  if index is None:
+    while end is None or ts < end:
+      yield ts
+      ts = func(ts, tz, step, **kw)
+    return
+  times = index.times
+  offsets = index.offsets
+  count = len(times)
+  # note: a DST gap can only shift a period start forward within its
+  #       day, so the local day of the first start is never off.
+  day = int(index.toLocal(ts)) // 86400
+  idx = index.period(ts)
+  while end is None or ts < end:
+    yield ts
+    day = advance(day, step)
+    local = day * 86400
+    utc = local - offsets[idx]
+    # note: if the candidate is more than a day away from the edges
+    #       of the current period, no other period can claim it, i.e.
+    #       it is neither ambiguous nor in a gap.
+    if utc < times[idx] + 86400 \
+        or ( idx + 1 < count and utc + 86400 >= times[idx + 1] ):
+      utc, idx = index.localize(local)
+    ts = float(utc)
+
+#------------------------------------------------------------------------------
+def setCacheSize(size):
+  '''
+  Sets the maximum number of period intervals that are kept by the
+  cache used by :func:`sod`, :func:`sow`, :func:`som` and
+  :func:`soy` (defaults to 1024). Setting it to zero disables the
+  cache.
+  '''
+  _periods.resize(size)
+
+#------------------------------------------------------------------------------
+def getCacheStats():
+  '''
+  Returns a dictionary of the period interval cache statistics:
+  `hits`, `misses`, `evictions`, the current `size` and the
+  `maxsize`.
+  '''
+  return _periods.stats()
+
+#------------------------------------------------------------------------------
+def clearCache():
+  '''
+  Empties the period interval cache and resets its statistics.
+  '''
+  _periods.clear()
+
+#------------------------------------------------------------------------------
+def _fixedOffset(tz):
+  # returns (and caches) the UTC offset, in seconds, of the tzinfo `tz`
+  # if it has no transitions (e.g. UTC or a fixed-offset zone) and a
+  # whole number of seconds, otherwise None.
+  try:
+    return _fixedOffsets[tz]
+  except KeyError:
+    pass
+  index = getTzIndex(tz)
+  ret = None
+  if index is not None and index.fixed:
+    offset = tz.utcoffset(None)
+    if offset is not None and not offset.microseconds:
+      ret = index.offsets[0]
+  _fixedOffsets[tz] = ret
+  return ret
+
+# the range of days since 1970/01/01 that `datetime` supports
+_MINDAYS                = 1 - _EPOCH_ORDINAL
+_MAXDAYS                = 3652059 - _EPOCH_ORDINAL
+_FIXEDFIELDS            = dict(
+  year = 0, month = 1, day = 2, hour = 3, minute = 4, second = 5, microsecond = 6)
+
+#------------------------------------------------------------------------------
+def _splitTs(ts):
+  # returns the integer (seconds, microseconds) of the epoch timestamp
+  # `ts`, rounded exactly as `ts2dt` (i.e. `datetime.fromtimestamp`)
+  # does.
+  frac, whole = math.modf(ts)
+  sec = int(whole)
+  usec = int(round(frac * 1000000))
+  if usec >= 1000000:
+    sec += 1
+    usec -= 1000000
+  elif usec < 0:
+    sec -= 1
+    usec += 1000000
+  return ( sec, usec )
+
+#------------------------------------------------------------------------------
+def _fixedLocal(ts, offset):
+  # returns the local (days since 1970/01/01, seconds into the day,
+  # microseconds) of the epoch timestamp `ts` in a zone with the fixed
+  # UTC `offset`, or None if it is out of `datetime`'s range.
+  sec, usec = _splitTs(ts)
+  days, tod = divmod(sec + offset, 86400)
+  if not _MINDAYS <= days <= _MAXDAYS:
+    return None
+  return ( days, tod, usec )
+
+#------------------------------------------------------------------------------
+def _fixedFields(days, tod=0, usec=0):
+  # returns the local (year, month, day, hour, minute, second,
+  # microsecond) list for the output of `_fixedLocal`
+  return list(_days2civil(days)) + [tod // 3600, tod // 60 % 60, tod % 60, usec]
+
+#------------------------------------------------------------------------------
+def _wallResult(fields, replace=None):
+  # returns the local "wall clock" (seconds since 1970/01/01,
+  # microseconds) of the local `fields` (see `_fixedFields`) after
+  # replacing the fields in the dictionary `replace`. returns None for
+  # anything that `datetime.replace` would reject (or that is not a
+  # plain field replacement), so that the caller can fall back to the
+  # `datetime` implementation, which raises the appropriate exception.
+  if replace:
+    for key, value in replace.items():
+      idx = _FIXEDFIELDS.get(key)
+      if idx is None or not isinstance(value, _INTEGER_TYPES):
+        return None
+      fields[idx] = value
+  year, month, day, hour, minute, second, usec = fields
+  if not 1 <= year <= 9999 or not 1 <= month <= 12 \
+      or not 1 <= day <= _daysInMonth(year, month) \
+      or not 0 <= hour <= 23 or not 0 <= minute <= 59 \
+      or not 0 <= second <= 59 or not 0 <= usec <= 999999:
+    return None
+  ret = _civil2days(year, month, day) * 86400 \
+    + hour * 3600 + minute * 60 + second
+  return ( ret, usec )
+
+#------------------------------------------------------------------------------
+def _fixedResult(fields, offset, replace=None):
+  # returns the epoch timestamp of the local `fields` in a zone with the
+  # fixed UTC `offset` after `replace`, exactly as ``dt2ts(dtreplace(dt,
+  # **replace))`` would, or None (see `_wallResult`).
+  ret = _wallResult(fields, replace)
+  if ret is None:
+    return None
+  return float(ret[0] - offset) + ( ret[1] / 1000000.0 )
+
+#------------------------------------------------------------------------------
+def _fixedStart(days, fixed, replace):
+  # returns the epoch timestamp of the local midnight that starts
+  # `days` (see `_fixedResult`)
+  if not _MINDAYS <= days <= _MAXDAYS:
+    return None
+  if not replace:
+    return float(days * 86400 - fixed)
+  return _fixedResult(_fixedFields(days), fixed, replace)
+
+#------------------------------------------------------------------------------
+def _fixedSod(ts, fixed, offset=None, replace=None, boundary=None):
+  # the fixed-offset arithmetic version of `_sod`, or None (see
+  # `_fixedResult`)
+  local = _fixedLocal(ts, fixed)
+  if local is None:
+    return None
+  if boundary:
+    edge = _fixedResult(_fixedFields(*local), fixed, boundary)
+    if edge is None:
+      return None
+    if ts < edge:
+      local = _fixedLocal(ts - 43200, fixed)
+      if local is None:
+        return None
+  return _fixedStart(local[0] + int(offset or 0), fixed, replace)
+
+#------------------------------------------------------------------------------
+def _fixedSow(ts, fixed, offset=None, replace=None, day=None):
+  # the fixed-offset arithmetic version of `_sow`, or None
+  local = _fixedLocal(ts, fixed)
+  if local is None:
+    return None
+  days = local[0]
+  # note: 1970/01/01 was a thursday
+  weekday = ( days + 3 ) % 7
+  day = min(max(int(day or 0), 0), 6)
+  days += day - weekday if day <= weekday else day - weekday - 7
+  # note: `_sow` steps back to the start of the week first, which must
+  #       itself be within range.
+  if days < _MINDAYS:
+    return None
+  return _fixedStart(days + int(offset or 0) * 7, fixed, replace)
+
+#------------------------------------------------------------------------------
+def _fixedSom(ts, fixed, offset=None, replace=None):
+  # the fixed-offset arithmetic version of `_som`, or None
+  local = _fixedLocal(ts, fixed)
+  if local is None:
+    return None
+  year, month, _ = _days2civil(local[0])
+  year, month = divmod(year * 12 + month - 1 + int(offset or 0), 12)
+  if not 1 <= year <= 9999:
+    return None
+  if replace:
+    return _fixedResult([year, month + 1, 1, 0, 0, 0, 0], fixed, replace)
+  return float(_civil2days(year, month + 1, 1) * 86400 - fixed)
+
+#------------------------------------------------------------------------------
+def _fixedSoy(ts, fixed, offset=None, replace=None):
+  # the fixed-offset arithmetic version of `_soy`, or None
+  local = _fixedLocal(ts, fixed)
+  if local is None:
+    return None
+  year = _days2civil(local[0])[0] + int(offset or 0)
+  if not 1 <= year <= 9999:
+    return None
+  if replace:
+    return _fixedResult([year, 1, 1, 0, 0, 0, 0], fixed, replace)
+  return float(_civil2days(year, 1, 1) * 86400 - fixed)
+
+#------------------------------------------------------------------------------
+def _freeze(value):
+  if isinstance(value, dict):
+    return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+  return value
+
+#------------------------------------------------------------------------------
+def _timeOfDay(boundary):
+  # returns `boundary` with any unspecified lower-order time fields set
+  # to zero if it is a time of day (i.e. it specifies the hour, or the
+  # hour and minute, etc), otherwise None. for a time of day, replacing
+  # only the specified fields in a `datetime` and comparing against it
+  # is the same as comparing against this value.
+  if set(boundary) != set(_TIMEFIELDS[:len(boundary)]):
+    return None
+  ret = dict.fromkeys(_TIMEFIELDS, 0)
+  ret.update(boundary)
+  return ret
+
+#------------------------------------------------------------------------------
+def _interval(func, ts, tz, boundary=None, **kw):
+  # returns the interval ``(start, end)`` around `ts` in which `func`
+  # (with any offset and replacements) evaluates to the same value, or
+  # None if it cannot be determined.
+  #
+  # note: the interval is *not* simply ``[func(ts), func(ts, 1))``,
+  #       since a period start can be after `ts` (e.g. when the local
+  #       midnight is repeated) or the local period can end before the
+  #       next start (e.g. when the next midnight is skipped). instead,
+  #       it is limited to the span of `tz` with the same UTC offset
+  #       as `ts`, in which the result only depends on the local time.
+  index = getTzIndex(tz)
+  if index is None:
+    return None
+  times = index.times
+  idx = index.period(ts)
+  lo = times[idx] if idx > 0 else None
+  hi = times[idx + 1] if idx + 1 < len(times) else None
+  offset = index.offsets[idx]
+  if not boundary:
+    # the local period containing the local time of `ts`, in local
+    # "wall clock" seconds (i.e. as if the local time were UTC)
+    utc = getTz('UTC')
+    start = func(ts + offset, utc, **kw)
+    points = [start - offset, func(start, utc, 1, **kw) - offset]
+  else:
+    tod = _timeOfDay(boundary)
+    if tod is None:
+      return None
+    # the result depends on the day of `ts`, whether `ts` is before
+    # that day's boundary, and the day of ``ts - 12h``, so the offset
+    # must be constant for a while around `ts`...
+    if ( lo is not None and ts - 172800 < lo ) \
+        or ( hi is not None and ts + 172800 >= hi ):
+      return None
+    day = func(ts, tz)
+    prev = func(ts - 43200, tz)
+    points = [
+      day,
+      func(day, tz, 1),
+      tsreplace(day, tz, **tod),
+      prev + 43200,
+      func(prev, tz, 1) + 43200,
+    ]
+  start = [point for point in points if point <= ts]
+  end = [point for point in points if point > ts]
+  if lo is not None:
+    start.append(lo)
+  if hi is not None:
+    end.append(hi)
+  if not start or not end:
+    return None
+  # note: `datetime` rounds to the nearest microsecond, so the last
+  #       microsecond of the interval may belong to the next one...
+  start, end = max(start), min(end) - 0.000001
+  if not start <= ts < end:
+    return None
+  return ( start, end )
+
+#------------------------------------------------------------------------------
+def _cached(func, ts, tz, offset, replace, **kw):
+  # returns ``func(ts, tz, offset, replace, **kw)``, first consulting
+  # (and, on a miss, populating) the period interval cache.
+  if _periods.maxsize <= 0:
+    return func(ts, tz, offset, replace, **kw)
+  try:
+    key = ( func, tz, int(offset or 0), _freeze(replace), _freeze(kw) )
+    ret = _periods.get(key, ts)
+  except TypeError:
+    # unhashable parameters
+    return func(ts, tz, offset, replace, **kw)
+  if ret is None:
+    ret = func(ts, tz, offset, replace, **kw)
+    span = _interval(func, ts, tz, **kw)
+    if span:
+      _periods.put(key, span[0], span[1], ret)
+  return ret
+
 #------------------------------------------------------------------------------
 def ts2age(ts, origin=None, tz=None):
   '''
@@ -416,6 +1371,12 @@ def age2ts(age, origin=None, tz=None):
   if age is None:
     return None
   at = ts2dt(origin, tz=getTz(tz))
+  # note: the origin's UTC offset is used throughout (i.e. there is no
+  #       DST correction), which is done with a naive `datetime` so that
+  #       timezones that re-evaluate the offset (e.g. `zoneinfo`) do not
+  #       change it.
+  offset = at.utcoffset()
+  at = at.replace(tzinfo=None)
   if math.trunc(age) != 0:
     at = at.replace(year=at.year + math.trunc(age))
     age -= math.trunc(age)
@@ -433,7 +1394,7 @@ def age2ts(age, origin=None, tz=None):
     age -= math.trunc(age)
   age *= ( DAYSPERYEAR / 12.0 )
   at = at + timedelta(days=age)
-  return dt2ts(at)
+  return dt2ts(at - offset)
 
 #------------------------------------------------------------------------------
 # end of $Id$
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import sys
+
+from .convert import main
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+  sys.exit(main())
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Timezone backends, which resolve timezone names to `datetime.tzinfo`
+objects for :func:`epoch.getTz`. See :func:`epoch.setBackend`.
+'''
+
+#------------------------------------------------------------------------------
+class PytzBackend(object):
+  '''
+  Resolves timezone names with :func:`pytz.timezone` (the default).
+  '''
+
+  name = 'pytz'
+
+  #----------------------------------------------------------------------------
+  def __init__(self):
+    import pytz
+    self.timezone = pytz.timezone
+    self.utc      = pytz.UTC
+
+#------------------------------------------------------------------------------
+class ZoneinfoBackend(object):
+  '''
+  Resolves timezone names with the standard library's
+  :class:`zoneinfo.ZoneInfo` (Python 3.9+, or the `backports.zoneinfo`
+  package), whose instances disambiguate DST transitions with the
+  `fold` attribute instead of pytz's `localize`/`normalize` idiom.
+  '''
+
+  name = 'zoneinfo'
+
+  #----------------------------------------------------------------------------
+  def __init__(self):
+    from datetime import timezone
+    try:
+      from zoneinfo import ZoneInfo
+    except ImportError:
+      from backports.zoneinfo import ZoneInfo
+    self.timezone = ZoneInfo
+    # note: `datetime.timezone.utc` has a fixed offset, which allows a
+    #       transition index to be built for it (unlike ``ZoneInfo('UTC')``)
+    self.utc      = timezone.utc
+
+#------------------------------------------------------------------------------
+
+BACKENDS                = dict(
+  pytz      = PytzBackend,
+  zoneinfo  = ZoneinfoBackend,
+)
+
+#------------------------------------------------------------------------------
+def create(name):
+  '''
+  Returns a new instance of the backend named `name`.
+  '''
+  try:
+    factory = BACKENDS[name]
+  except KeyError:
+    raise ValueError(
+      'unknown timezone backend %r (expected one of %s)'
+      % (name, ', '.join(sorted(BACKENDS))))
+  return factory()
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
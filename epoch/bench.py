@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Offline benchmark suite for the `epoch` package.
+
+Runs every public function over a set of timezones (UTC, fixed-offset
+and DST-heavy ones) with timestamps both near and far from DST
+transitions, in scalar and (where available) bulk forms, and writes
+the results to a JSON file. Two result files can be compared, with a
+non-zero exit status if any benchmark regressed by more than a
+threshold::
+
+  python -m epoch.bench --output before.json
+  # ... make changes ...
+  python -m epoch.bench --output after.json --compare before.json
+
+Times are the best of `--repeat` runs, divided by the number of
+timestamps processed, i.e. they are in seconds per timestamp.
+'''
+
+import sys
+import json
+import random
+import argparse
+import platform
+import fnmatch
+import timeit
+from datetime import timedelta
+
+import epoch
+from . import ns, us, iso, stream
+from .timestamp import Timestamp
+from .cal import Calendar
+
+try:
+  import numpy as np
+  from . import vec, columns
+except ImportError:
+  np = vec = columns = None
+
+#------------------------------------------------------------------------------
+
+ZONES                   = (
+  'UTC',
+  'Etc/GMT-10',
+  'America/Anchorage',
+  'Europe/Paris',
+  'Australia/Lord_Howe',
+)
+SAMPLES                 = 2000
+DEFAULT_REPEAT          = 5
+DEFAULT_THRESHOLD       = 0.2
+MINTIME                 = 0.1
+# the range that samples are drawn from: 2010/01/01 to 2030/01/01
+_RANGE                  = ( 1262304000, 1893456000 )
+
+#------------------------------------------------------------------------------
+def samples(tz, near, count=SAMPLES, seed=7):
+  '''
+  Returns a list of `count` (pseudo-random, but reproducible) float
+  timestamps within :data:`_RANGE`. If `near` is truthy, they are
+  within two hours of one of timezone `tz`'s DST transitions,
+  otherwise they are at least two weeks away from any. Zones without
+  transitions (or without a transition index, such as `zoneinfo`
+  timezones) return uniformly distributed timestamps for both.
+  '''
+  rnd = random.Random(seed)
+  index = epoch.getTzIndex(tz)
+  times = index.times if index is not None else ()
+  trans = [ts for ts in times if _RANGE[0] <= ts < _RANGE[1]]
+  ret = []
+  while len(ret) < count:
+    if near and trans:
+      ts = rnd.choice(trans) + rnd.uniform(-7200, 7200)
+    else:
+      ts = rnd.uniform(*_RANGE)
+      if trans and min(abs(ts - point) for point in trans) < 14 * 86400:
+        continue
+    ret.append(round(ts, 3))
+  return ret
+
+#------------------------------------------------------------------------------
+def cases(tz, near):
+  '''
+  Generates tuples of ``(name, setup)`` for the benchmarks of timezone
+  `tz` with timestamps near (or far from) DST transitions, where
+  `setup` returns a tuple of a zero-argument callable to time and the
+  number of timestamps that it processes.
+  '''
+  values = samples(tz, near)
+  zulus = [epoch.zulu(ts) for ts in values]
+  origin = epoch.parse('2000-02-13T23:31:30Z')
+  ages = [epoch.ts2age(ts, origin, tz) for ts in values]
+  dts = [epoch.ts2dt(ts, tz) for ts in values]
+  # note: shifted by a day without re-timezoning, i.e. what `tzcorrect`
+  #       is for, which crosses some DST transitions when `near`.
+  shifted = [dt + timedelta(days=1) for dt in dts]
+  isos = [epoch.formatter('rfc3339', tz)(ts) for ts in values]
+  nsvalues = [ns.fromts(ts) for ts in values]
+  usvalues = [us.fromts(ts) for ts in values]
+  count = len(values)
+
+  def scalar(func, args, **kw):
+    def setup():
+      def run():
+        for arg in args:
+          func(arg, **kw)
+      return ( run, count )
+    return setup
+
+  def nocache(func, args, **kw):
+    run = scalar(func, args, **kw)()[0]
+    def setup():
+      def wrapped():
+        size = epoch.getCacheStats()['maxsize']
+        epoch.setCacheSize(0)
+        try:
+          run()
+        finally:
+          epoch.setCacheSize(size)
+      return ( wrapped, count )
+    return setup
+
+  def call(func, *args, **kw):
+    def setup():
+      return ( lambda: func(*args, **kw), count )
+    return setup
+
+  def iterate(func, step):
+    def setup():
+      def run():
+        for _ in func(_RANGE[0], _RANGE[1], tz, step=step):
+          pass
+      # note: normalized per generated period
+      return ( run, sum(1 for _ in func(_RANGE[0], _RANGE[1], tz, step=step)) )
+    return setup
+
+  # note: all timezone-independent benchmarks are only run for UTC
+  if tz == 'UTC' and not near:
+    yield 'zulu', scalar(epoch.zulu, values)
+    yield 'zulu_many', call(epoch.zulu_many, values)
+    yield 'parseZulu', scalar(epoch.parseZulu, zulus)
+    yield 'parse', scalar(epoch.parse, zulus)
+    yield 'parse_many', call(epoch.parse_many, zulus)
+    yield 'ns.zulu', scalar(ns.zulu, nsvalues)
+    yield 'ns.parse', scalar(ns.parse, [ns.zulu(val) for val in nsvalues])
+    data = ''.join('%s %d\n' % (val, idx) for idx, val in enumerate(zulus))
+    yield 'stream.scan', call(
+      lambda: list(stream.scan(data.encode('ascii'), numpy=vec is not None)))
+    if vec is not None:
+      yield 'vec.zulu', call(vec.zulu, np.array(values))
+      yield 'vec.parseZulu', call(vec.parseZulu, np.array(zulus))
+  if not near:
+    yield 'getTz', scalar(epoch.getTz, [tz] * count)
+  yield 'ts2dt', scalar(epoch.ts2dt, values, tz=tz)
+  yield 'dt2ts', scalar(epoch.dt2ts, dts)
+  yield 'dtreplace', scalar(epoch.dtreplace, dts, hour=2, minute=30)
+  yield 'tzcorrect', scalar(epoch.tzcorrect, shifted)
+  yield 'sod', scalar(epoch.sod, values, tz=tz)
+  yield 'sod.nocache', nocache(epoch.sod, values, tz=tz)
+  yield 'sod.offset', scalar(epoch.sod, values, tz=tz, offset=1)
+  yield 'sod.boundary', scalar(epoch.sod, values, tz=tz, boundary=dict(hour=4))
+  yield 'sow', scalar(epoch.sow, values, tz=tz)
+  yield 'sow.nocache', nocache(epoch.sow, values, tz=tz)
+  yield 'som', scalar(epoch.som, values, tz=tz)
+  yield 'som.nocache', nocache(epoch.som, values, tz=tz)
+  yield 'soy', scalar(epoch.soy, values, tz=tz)
+  yield 'tsreplace', scalar(epoch.tsreplace, values, tz=tz, hour=2, minute=30)
+  yield 'ts2age', scalar(epoch.ts2age, values, origin=origin, tz=tz)
+  yield 'age2ts', scalar(epoch.age2ts, ages, origin=origin, tz=tz)
+  if not near:
+    yield 'iter_sod', iterate(epoch.iter_sod, 1)
+    yield 'iter_som', iterate(epoch.iter_som, 1)
+  # note: the later, specialized APIs, to compare against the above
+  yield 'parse.iso', scalar(epoch.parse, isos, tz=tz)
+  yield 'iso.parse', scalar(iso.parse, isos, tz=tz)
+  yield 'iso.Parser', scalar(iso.Parser(tz), isos)
+  yield 'ns.sod', scalar(ns.sod, nsvalues, tz=tz)
+  yield 'ns.sow', scalar(ns.sow, nsvalues, tz=tz)
+  yield 'ns.som', scalar(ns.som, nsvalues, tz=tz)
+  yield 'ns.soy', scalar(ns.soy, nsvalues, tz=tz)
+  yield 'us.sod', scalar(us.sod, usvalues, tz=tz)
+  yield 'formatter.iso8601', scalar(epoch.formatter('iso8601', tz), values)
+  yield 'formatter.pattern', scalar(
+    epoch.formatter('%a, %d %b %Y %H:%M:%S %Z', tz), values)
+  yield 'cron.next', scalar(epoch.cron('*/15 9-17 * * 1-5', tz).next, values)
+  yield 'cron.next.monthly', scalar(epoch.cron('30 2 1 * *', tz).next, values)
+  yield 'Timestamp', scalar(Timestamp, values, tz=tz)
+  yield 'Timestamp.fields', scalar(
+    lambda ts: Timestamp(ts, tz).hour, values)
+  yield 'Timestamp.sod', scalar(lambda ts: Timestamp(ts, tz).sod(), values)
+  calendar = Calendar(tz, boundary=dict(hour=4), week_start=6)
+  yield 'Calendar.sod', scalar(calendar.sod, values)
+  yield 'Calendar.sow', scalar(calendar.sow, values)
+  yield 'Calendar.som', scalar(calendar.som, values)
+  if vec is not None:
+    array = np.array(values)
+    yield 'vec.sod', call(vec.sod, array, tz=tz)
+    yield 'vec.sod.boundary', call(vec.sod, array, tz=tz, boundary=dict(hour=4))
+    yield 'vec.sow', call(vec.sow, array, tz=tz)
+    yield 'vec.som', call(vec.som, array, tz=tz)
+    yield 'vec.soy', call(vec.soy, array, tz=tz)
+    yield 'vec.bucketize', call(vec.bucketize, array, 'day', tz=tz, counts=True)
+    yield 'vec.ts2age', call(vec.ts2age, array, origin, tz=tz)
+    yield 'vec.age2ts', call(vec.age2ts, np.array(ages), origin, tz=tz)
+    yield 'vec.fields', call(vec.fields, array, tz=tz)
+    yield 'vec.formatter', call(epoch.formatter('iso8601', tz), array)
+    column = np.array(nsvalues, dtype=np.int64).view('M8[ns]')
+    yield 'columns.sod', call(columns.sod, column, tz=tz)
+    yield 'columns.som', call(columns.som, column, tz=tz)
+    yield 'columns.tots', call(columns.tots, column)
+
+#------------------------------------------------------------------------------
+def run(zones=ZONES, repeat=DEFAULT_REPEAT, pattern=None, log=None):
+  '''
+  Runs the benchmarks (optionally only those whose full name matches
+  the glob `pattern`) and returns the results as a dictionary that
+  maps each benchmark's full name, e.g. ``'sod[Europe/Paris,near]'``,
+  to its best time in seconds per timestamp. Progress is written to
+  the file-like object `log`, if specified.
+  '''
+  ret = dict()
+  for tz in zones:
+    for near in (False, True):
+      for name, setup in cases(tz, near):
+        name = '%s[%s,%s]' % (name, tz, 'near' if near else 'far')
+        if pattern and not fnmatch.fnmatchcase(name, pattern):
+          continue
+        func, count = setup()
+        # note: the first call warms up caches and lazy imports, and is
+        #       used to scale each run to about `MINTIME` seconds.
+        number = max(1, int(MINTIME / max(timeit.timeit(func, number=1), 1e-9)))
+        best = min(timeit.repeat(func, number=number, repeat=repeat))
+        ret[name] = best / number / count
+        if log:
+          log.write('%-48s %10.3f us\n' % (name, ret[name] * 1000000))
+          log.flush()
+  return ret
+
+#------------------------------------------------------------------------------
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+  '''
+  Compares the benchmark `results` against the `baseline` results
+  (both as returned by :func:`run`) and returns a list of tuples of
+  ``(name, baseline, result, ratio)`` for each benchmark that is more
+  than `threshold` (a fraction, e.g. ``0.2`` for 20%) slower.
+  '''
+  ret = []
+  for name in sorted(set(results) & set(baseline)):
+    ratio = results[name] / baseline[name] if baseline[name] else 1.0
+    if ratio > 1.0 + threshold:
+      ret.append(( name, baseline[name], results[name], ratio ))
+  return ret
+
+#------------------------------------------------------------------------------
+def _environment():
+  return dict(
+    python    = platform.python_version(),
+    platform  = platform.platform(),
+    numpy     = np.__version__ if np is not None else None,
+    time      = epoch.zulu(),
+  )
+
+#------------------------------------------------------------------------------
+def main(args=None):
+  cli = argparse.ArgumentParser(
+    prog='python -m epoch.bench',
+    description='Benchmarks the `epoch` package.')
+  cli.add_argument(
+    '-o', '--output', metavar='FILENAME',
+    help='write the results, as JSON, to FILENAME')
+  cli.add_argument(
+    '-c', '--compare', metavar='FILENAME',
+    help='compare the results against the baseline results in FILENAME'
+    ' and exit with a non-zero status if any regressed')
+  cli.add_argument(
+    '-t', '--threshold', metavar='FRACTION', type=float,
+    default=DEFAULT_THRESHOLD,
+    help='the slowdown that is considered a regression (default: %(default)s)')
+  cli.add_argument(
+    '-r', '--repeat', metavar='COUNT', type=int, default=DEFAULT_REPEAT,
+    help='the number of times to run each benchmark (default: %(default)s)')
+  cli.add_argument(
+    '-z', '--zone', metavar='TZ', action='append', dest='zones',
+    help='the timezone(s) to benchmark (default: %s)' % (', '.join(ZONES),))
+  cli.add_argument(
+    '-k', '--filter', metavar='PATTERN', dest='pattern',
+    help='only run benchmarks whose full name matches the glob PATTERN')
+  cli.add_argument(
+    '-q', '--quiet', action='store_true',
+    help='do not display per-benchmark progress')
+  options = cli.parse_args(args)
+  results = run(
+    zones=options.zones or ZONES, repeat=options.repeat,
+    pattern=options.pattern, log=None if options.quiet else sys.stdout)
+  if options.output:
+    with open(options.output, 'w') as fp:
+      json.dump(
+        dict(environment=_environment(), results=results),
+        fp, indent=2, sort_keys=True)
+  if not options.compare:
+    return 0
+  with open(options.compare) as fp:
+    baseline = json.load(fp)['results']
+  regressions = compare(results, baseline, options.threshold)
+  for name, before, after, ratio in regressions:
+    sys.stdout.write('REGRESSION: %s: %.3f us => %.3f us (%+.0f%%)\n' % (
+      name, before * 1000000, after * 1000000, ( ratio - 1 ) * 100))
+  return 1 if regressions else 0
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+  sys.exit(main())
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
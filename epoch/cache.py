@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+A bounded LRU cache of intervals of epoch timestamps.
+'''
+
+from bisect import bisect_right, insort
+from collections import OrderedDict
+
+# note: the low-level lock avoids importing `threading` (and all that it
+#       imports) at `import epoch` time.
+try:
+  from _thread import allocate_lock
+except ImportError:
+  from thread import allocate_lock
+
+#------------------------------------------------------------------------------
+class IntervalCache(object):
+  '''
+  A thread-safe, bounded, least-recently-used cache that maps
+  half-open intervals ``[start, end)`` of epoch timestamps, grouped by
+  a hashable key, to a value. This is used to memoize functions such
+  as :func:`epoch.sod`, whose result is the same for every timestamp
+  within a day, week, month, etc.
+
+  The cache holds at most `maxsize` intervals (across all keys); a
+  `maxsize` of zero disables it.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, maxsize=1024):
+    self.maxsize    = maxsize
+    self.hits       = 0
+    self.misses     = 0
+    self.evictions  = 0
+    self._lock      = allocate_lock()
+    # (key, start) => (end, value), in least- to most-recently used order
+    self._entries   = OrderedDict()
+    # key => sorted list of starts
+    self._starts    = dict()
+
+  #----------------------------------------------------------------------------
+  def get(self, key, ts):
+    '''
+    Returns the value of the interval for `key` that contains `ts`,
+    or None if no such interval is cached.
+    '''
+    with self._lock:
+      starts = self._starts.get(key)
+      if starts:
+        idx = bisect_right(starts, ts) - 1
+        if idx >= 0:
+          ekey = ( key, starts[idx] )
+          entry = self._entries.pop(ekey)
+          self._entries[ekey] = entry
+          if ts < entry[0]:
+            self.hits += 1
+            return entry[1]
+      self.misses += 1
+      return None
+
+  #----------------------------------------------------------------------------
+  def put(self, key, start, end, value):
+    '''
+    Stores `value` for all timestamps in the interval [`start`,
+    `end`) of `key`, evicting the least-recently used interval(s) if
+    the cache is full.
+    '''
+    with self._lock:
+      if self.maxsize <= 0 or start >= end:
+        return
+      ekey = ( key, start )
+      if ekey in self._entries:
+        del self._entries[ekey]
+      else:
+        insort(self._starts.setdefault(key, []), start)
+      self._entries[ekey] = ( end, value )
+      self._trim(self.maxsize)
+
+  #----------------------------------------------------------------------------
+  def _trim(self, size):
+    while len(self._entries) > size:
+      ( key, start ), _ = self._entries.popitem(last=False)
+      starts = self._starts[key]
+      starts.remove(start)
+      if not starts:
+        del self._starts[key]
+      self.evictions += 1
+
+  #----------------------------------------------------------------------------
+  def resize(self, maxsize):
+    '''
+    Changes the maximum number of intervals held by this cache,
+    evicting entries as needed.
+    '''
+    with self._lock:
+      self.maxsize = max(int(maxsize), 0)
+      self._trim(self.maxsize)
+
+  #----------------------------------------------------------------------------
+  def clear(self):
+    '''
+    Removes all intervals from the cache and resets its statistics.
+    '''
+    with self._lock:
+      self._entries.clear()
+      self._starts.clear()
+      self.hits = self.misses = self.evictions = 0
+
+  #----------------------------------------------------------------------------
+  def stats(self):
+    '''
+    Returns a dictionary of this cache's `hits`, `misses`, `evictions`,
+    current `size` and `maxsize`.
+    '''
+    with self._lock:
+      return dict(
+        hits      = self.hits,
+        misses    = self.misses,
+        evictions = self.evictions,
+        size      = len(self._entries),
+        maxsize   = self.maxsize,
+      )
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+
+'''
+Calendars: timezone, day boundary and week start configurations that
+are resolved once and then reused.
+'''
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+_TIMELIMITS             = dict(hour=23, minute=59, second=59, microsecond=999999)
+
+#------------------------------------------------------------------------------
+class Calendar(object):
+  '''
+  A pre-bound configuration of the `epoch` period functions: the
+  timezone `tz` is resolved (with :func:`epoch.getTz`) and the
+  day `boundary` (see :func:`epoch.sod`) and `week_start` (the `day`
+  of :func:`epoch.sow`, where ``0`` is Monday) are validated once, when
+  the calendar is created, instead of on every call.
+
+  The `boundary` must be a time of day (i.e. `hour`, optionally
+  followed by `minute`, `second` and `microsecond`), which is compiled
+  into seconds since midnight. The local midnights and boundaries that
+  the calendar resolves to UTC are cached per instance (up to
+  `cachesize` of them).
+
+  The results of the methods are identical to those of the
+  corresponding `epoch` functions with the same configuration.
+  Calendars are picklable; only the configuration is pickled, not the
+  caches, and a timezone specified by name is resolved again (by the
+  then current backend) when unpickled.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, tz=None, boundary=None, week_start=None, cachesize=1024):
+    self.zone       = tz
+    self.tz         = epoch.getTz(tz)
+    self.boundary   = dict(boundary) if boundary else None
+    self.week_start = int(week_start or 0)
+    self.cachesize  = int(cachesize)
+    if not 0 <= self.week_start <= 6:
+      raise ValueError(
+        '`week_start` must be 0 (monday) to 6 (sunday), not %r' % (week_start,))
+    # the boundary in local seconds since midnight and microseconds
+    self._bsec      = None
+    self._busec     = 0
+    self._bfields   = None
+    if self.boundary:
+      tod = epoch._timeOfDay(self.boundary)
+      if tod is None:
+        raise ValueError(
+          'calendar boundaries must be a time of day, not %r' % (boundary,))
+      for key, value in tod.items():
+        if not isinstance(value, epoch._INTEGER_TYPES) \
+            or not 0 <= value <= _TIMELIMITS[key]:
+          raise ValueError('invalid boundary %s: %r' % (key, value))
+      self._bfields = tod
+      self._bsec    = tod['hour'] * 3600 + tod['minute'] * 60 + tod['second']
+      self._busec   = tod['microsecond']
+    self._index     = epoch.getTzIndex(self.tz)
+    self._fixed     = epoch._fixedOffset(self.tz)
+    # local wall clock seconds => UTC epoch seconds
+    self._utc       = dict()
+
+  #----------------------------------------------------------------------------
+  def __reduce__(self):
+    return (
+      Calendar, (self.zone, self.boundary, self.week_start, self.cachesize))
+
+  #----------------------------------------------------------------------------
+  def __repr__(self):
+    return 'Calendar(tz=%r, boundary=%r, week_start=%r)' % (
+      self.zone, self.boundary, self.week_start)
+
+  #----------------------------------------------------------------------------
+  def _local(self, ts):
+    # returns the local (days since 1970/01/01, seconds of day,
+    # microseconds) of `ts`, or None if it is out of range
+    sec, usec = epoch._splitTs(ts)
+    if self._index is not None:
+      local = self._index.toLocal(sec)
+    else:
+      local = epoch._ts2local(sec, self.tz)
+    days, tod = divmod(local, 86400)
+    if not epoch._MINDAYS <= days <= epoch._MAXDAYS:
+      return None
+    return ( days, tod, usec )
+
+  #----------------------------------------------------------------------------
+  def _toUtc(self, local):
+    # converts local wall clock seconds to UTC epoch seconds, resolving
+    # non-existent and ambiguous times as `epoch.dtreplace` does
+    if self._fixed is not None:
+      return local - self._fixed
+    try:
+      return self._utc[local]
+    except KeyError:
+      pass
+    ret = epoch._local2ts(local, self.tz)
+    if len(self._utc) >= self.cachesize:
+      self._utc.clear()
+    if self.cachesize > 0:
+      self._utc[local] = ret
+    return ret
+
+  #----------------------------------------------------------------------------
+  def _resolve(self, fields, replace):
+    ret = epoch._wallResult(fields, replace)
+    if ret is None:
+      return None
+    return float(self._toUtc(ret[0])) + ( ret[1] / 1000000.0 )
+
+  #----------------------------------------------------------------------------
+  def _start(self, days, replace):
+    # returns the epoch timestamp of the local midnight that starts
+    # `days`, after `replace`, or None
+    if not epoch._MINDAYS <= days <= epoch._MAXDAYS:
+      return None
+    if not replace:
+      return float(self._toUtc(days * 86400))
+    return self._resolve(list(epoch._days2civil(days)) + [0, 0, 0, 0], replace)
+
+  #----------------------------------------------------------------------------
+  def _first(self, year, month, replace):
+    # returns the epoch timestamp of the local midnight that starts
+    # `month` of `year`, after `replace`, or None
+    if replace or not 1 <= year <= 9999:
+      return self._resolve([year, month, 1, 0, 0, 0, 0], replace)
+    return float(self._toUtc(epoch._civil2days(year, month, 1) * 86400))
+
+  #----------------------------------------------------------------------------
+  def sod(self, ts=None, offset=None, replace=None):
+    '''
+    Returns :func:`epoch.sod` of `ts` (or the current time) with this
+    calendar's timezone and boundary.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    local = self._local(ts)
+    ret = None
+    if local is not None:
+      days = local[0]
+      if self._bsec is not None:
+        edge = float(self._toUtc(days * 86400 + self._bsec)) \
+          + ( self._busec / 1000000.0 )
+        if ts < edge:
+          local = self._local(ts - 43200)
+      if local is not None:
+        ret = self._start(local[0] + int(offset or 0), replace)
+    if ret is None:
+      return epoch.sod(
+        ts, tz=self.tz, boundary=self._bfields, offset=offset, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def sow(self, ts=None, offset=None, replace=None):
+    '''
+    Returns :func:`epoch.sow` of `ts` (or the current time) with this
+    calendar's timezone and week start.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    local = self._local(ts)
+    ret = None
+    if local is not None:
+      days = local[0]
+      # note: 1970/01/01 was a thursday
+      weekday = ( days + 3 ) % 7
+      first = self.week_start
+      days += first - weekday if first <= weekday else first - weekday - 7
+      if days >= epoch._MINDAYS:
+        ret = self._start(days + int(offset or 0) * 7, replace)
+    if ret is None:
+      return epoch.sow(
+        ts, tz=self.tz, offset=offset, day=self.week_start, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def som(self, ts=None, offset=None, replace=None):
+    '''
+    Returns :func:`epoch.som` of `ts` (or the current time) with this
+    calendar's timezone.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    local = self._local(ts)
+    ret = None
+    if local is not None:
+      year, month, _ = epoch._days2civil(local[0])
+      year, month = divmod(year * 12 + month - 1 + int(offset or 0), 12)
+      ret = self._first(year, month + 1, replace)
+    if ret is None:
+      return epoch.som(ts, tz=self.tz, offset=offset, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def soy(self, ts=None, offset=None, replace=None):
+    '''
+    Returns :func:`epoch.soy` of `ts` (or the current time) with this
+    calendar's timezone.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    local = self._local(ts)
+    ret = None
+    if local is not None:
+      year = epoch._days2civil(local[0])[0] + int(offset or 0)
+      ret = self._first(year, 1, replace)
+    if ret is None:
+      return epoch.soy(ts, tz=self.tz, offset=offset, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def tsreplace(self, ts=None, **kw):
+    '''
+    Returns :func:`epoch.tsreplace` of `ts` (or the current time) with
+    this calendar's timezone.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    local = self._local(ts)
+    ret = None
+    if local is not None:
+      days, tod, usec = local
+      ret = self._resolve(
+        list(epoch._days2civil(days))
+        + [tod // 3600, tod // 60 % 60, tod % 60, usec], kw)
+    if ret is None:
+      return epoch.tsreplace(ts, self.tz, **kw)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def ts2dt(self, ts=None):
+    '''
+    Returns :func:`epoch.ts2dt` of `ts` (or the current time) in this
+    calendar's timezone.
+    '''
+    return epoch.ts2dt(epoch.now() if ts is None else ts, self.tz)
+
+  #----------------------------------------------------------------------------
+  def timestamp(self, ts=None):
+    '''
+    Returns an :class:`epoch.Timestamp` of `ts` (or the current time)
+    in this calendar's timezone.
+    '''
+    return epoch.Timestamp(ts, self.tz)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
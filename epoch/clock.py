@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Clock sources for :func:`epoch.now` (see :func:`epoch.setClock`).
+
+Each clock provides a `time()` method that returns the current epoch
+time as a float number of seconds, and a `time_ns()` method that
+returns it as an integer number of nanoseconds. The following clocks
+are available:
+
+* :class:`PreciseClock`: the system's wall clock (the default).
+
+* :class:`MonotonicClock`: wall time derived from the monotonic clock
+  plus an offset that is re-anchored to the wall clock periodically.
+
+* :class:`CoarseClock`: a cached wall time that is refreshed by a
+  background thread at a configurable resolution.
+
+* :class:`FrozenClock`: a fixed (manually advanced) time, e.g. for
+  deterministic tests and benchmarks.
+'''
+
+import math
+import time
+
+#------------------------------------------------------------------------------
+def _time_ns():
+  # `time.time_ns` is only available in python 3.7+
+  return int(round(time.time() * 1000000000))
+_time_ns = getattr(time, 'time_ns', _time_ns)
+
+#------------------------------------------------------------------------------
+def _monotonic_ns():
+  return int(round(time.monotonic() * 1000000000))
+_monotonic_ns = getattr(time, 'monotonic_ns', _monotonic_ns)
+
+#------------------------------------------------------------------------------
+class Clock(object):
+  '''
+  The base class of clocks. Subclasses must implement :meth:`time_ns`,
+  and should override :meth:`time` if it can be done more efficiently.
+  Clocks that need resources (such as a thread) acquire them in
+  :meth:`start` and release them in :meth:`stop`, which are called
+  by :func:`epoch.setClock` when the clock is activated and
+  deactivated.
+  '''
+
+  name = None
+
+  #----------------------------------------------------------------------------
+  def time(self):
+    '''
+    Returns the current epoch time as a float number of seconds.
+    '''
+    return self.time_ns() / 1000000000.0
+
+  #----------------------------------------------------------------------------
+  def time_ns(self):
+    '''
+    Returns the current epoch time as an integer number of nanoseconds.
+    '''
+    raise NotImplementedError()
+
+  #----------------------------------------------------------------------------
+  def start(self):
+    pass
+
+  #----------------------------------------------------------------------------
+  def stop(self):
+    pass
+
+#------------------------------------------------------------------------------
+class PreciseClock(Clock):
+  '''
+  The system's wall clock, i.e. :func:`time.time`.
+  '''
+
+  name = 'precise'
+
+  #----------------------------------------------------------------------------
+  def __init__(self):
+    self.time     = time.time
+    self.time_ns  = _time_ns
+
+#------------------------------------------------------------------------------
+class MonotonicClock(Clock):
+  '''
+  A clock that derives the wall time from :func:`time.monotonic_ns`
+  (so it never goes backwards between re-anchorings) plus an offset to
+  the wall clock, which is re-measured every `refresh` seconds.
+  '''
+
+  name = 'monotonic'
+
+  #----------------------------------------------------------------------------
+  def __init__(self, refresh=60.0):
+    self.refresh  = int(refresh * 1000000000)
+    self._anchor  = None
+    self._offset  = 0
+
+  #----------------------------------------------------------------------------
+  def time_ns(self):
+    mono = _monotonic_ns()
+    if self._anchor is None or mono - self._anchor >= self.refresh:
+      self._offset = _time_ns() - mono
+      self._anchor = mono
+    return mono + self._offset
+
+#------------------------------------------------------------------------------
+class CoarseClock(Clock):
+  '''
+  A clock that returns a cached wall time, which is refreshed every
+  `resolution` seconds by a background (daemon) thread while the clock
+  is started. Reading it is just an attribute access, at the cost of
+  being up to `resolution` seconds behind.
+  '''
+
+  name = 'coarse'
+
+  #----------------------------------------------------------------------------
+  def __init__(self, resolution=0.001):
+    self.resolution = float(resolution)
+    self._thread    = None
+    self._stopped   = None
+    self._update()
+
+  #----------------------------------------------------------------------------
+  def _update(self):
+    value = _time_ns()
+    self._value = ( value / 1000000000.0, value )
+
+  #----------------------------------------------------------------------------
+  def time(self):
+    return self._value[0]
+
+  #----------------------------------------------------------------------------
+  def time_ns(self):
+    return self._value[1]
+
+  #----------------------------------------------------------------------------
+  def start(self):
+    import threading
+    if self._thread is not None:
+      return
+    self._update()
+    self._stopped = stopped = threading.Event()
+    def run():
+      while not stopped.wait(self.resolution):
+        self._update()
+    self._thread = threading.Thread(target=run, name='epoch-coarse-clock')
+    self._thread.daemon = True
+    self._thread.start()
+
+  #----------------------------------------------------------------------------
+  def stop(self):
+    if self._thread is None:
+      return
+    self._stopped.set()
+    self._thread.join()
+    self._thread = self._stopped = None
+
+#------------------------------------------------------------------------------
+class FrozenClock(Clock):
+  '''
+  A clock that always returns the epoch time `ts` (in seconds), until
+  changed with :meth:`set` or :meth:`advance`.
+  '''
+
+  name = 'frozen'
+
+  #----------------------------------------------------------------------------
+  def __init__(self, ts=0):
+    self.set(ts)
+
+  #----------------------------------------------------------------------------
+  def set(self, ts):
+    '''
+    Sets the time of this clock to the epoch time `ts`, in seconds.
+    '''
+    # note: the whole and fractional seconds are scaled separately,
+    #       which avoids the float rounding of ``ts * 1e9``.
+    sec = int(math.floor(ts))
+    self._value = ( float(ts), sec * 1000000000 + int(round(( ts - sec ) * 1000000000)) )
+
+  #----------------------------------------------------------------------------
+  def advance(self, seconds):
+    '''
+    Moves the time of this clock forward by `seconds` seconds.
+    '''
+    self.set(self._value[0] + seconds)
+
+  #----------------------------------------------------------------------------
+  def time(self):
+    return self._value[0]
+
+  #----------------------------------------------------------------------------
+  def time_ns(self):
+    return self._value[1]
+
+#------------------------------------------------------------------------------
+
+CLOCKS                  = dict(
+  precise   = PreciseClock,
+  monotonic = MonotonicClock,
+  coarse    = CoarseClock,
+  frozen    = FrozenClock,
+)
+
+#------------------------------------------------------------------------------
+def create(name, *args, **kw):
+  '''
+  Returns a new instance of the clock named `name`, passing any
+  additional parameters to its constructor.
+  '''
+  try:
+    factory = CLOCKS[name]
+  except KeyError:
+    raise ValueError(
+      'unknown clock %r (expected one of %s)'
+      % (name, ', '.join(sorted(CLOCKS))))
+  return factory(*args, **kw)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
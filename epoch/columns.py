@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+
+'''
+Zero-copy adapters between `epoch` and timestamp columns: NumPy
+``datetime64`` arrays and Arrow ``timestamp`` arrays (and chunked
+arrays).
+
+Columns are read through an int64 view of their data buffer, so
+nothing is converted per element, and :func:`to_datetime64` and
+:func:`to_arrow` return views of the same memory when the unit already
+matches. The period functions (:func:`sod` etc.) return a column of
+the same kind, unit and timezone metadata as their input, with null
+(or ``NaT``) elements passed through. The timezone of an Arrow column
+(e.g. ``timestamp[us, tz=Europe/Paris]``) is used as the default `tz`,
+and passed to :func:`epoch.getTz`.
+
+This module requires `numpy`; `pyarrow` is only needed for Arrow
+columns.
+'''
+
+import re
+from datetime import timedelta, timezone
+
+import numpy as np
+
+import epoch
+from . import vec
+
+#------------------------------------------------------------------------------
+
+# unit => units per second
+UNITS                   = dict(s=1, ms=1000, us=1000000, ns=1000000000)
+
+_NAT                    = np.iinfo(np.int64).min
+_offset_cre             = re.compile(r'^([+-])(\d{2}):?(\d{2})$')
+
+#------------------------------------------------------------------------------
+def _isArrow(column):
+  # note: this avoids importing `pyarrow` unless it is already in use
+  return type(column).__module__.split('.', 1)[0] == 'pyarrow'
+
+#------------------------------------------------------------------------------
+def _arrow():
+  import pyarrow
+  return pyarrow
+
+#------------------------------------------------------------------------------
+def getTz(name):
+  '''
+  Returns the `datetime.tzinfo` for the timezone metadata `name` of an
+  Arrow timestamp type, which is either a timezone name (resolved by
+  :func:`epoch.getTz`) or a fixed UTC offset such as ``'+05:30'``.
+  None (i.e. a "naive" column) is the package-default timezone.
+  '''
+  if not name:
+    return epoch.getTz(None)
+  res = _offset_cre.match(name)
+  if not res:
+    return epoch.getTz(name)
+  minutes = int(res.group(2)) * 60 + int(res.group(3))
+  if not minutes:
+    return epoch.getTz('UTC')
+  return timezone(timedelta(minutes=minutes if res.group(1) == '+' else -minutes))
+
+#------------------------------------------------------------------------------
+def _unit(unit):
+  if unit not in UNITS:
+    raise ValueError('unsupported timestamp unit: %r' % (unit,))
+  return unit
+
+#------------------------------------------------------------------------------
+def _rescale(values, src, dst):
+  # converts the int64 array `values` from unit `src` to `dst`, which
+  # is a no-op (and returns `values` itself) if they are the same.
+  if src == dst:
+    return values
+  src, dst = UNITS[src], UNITS[dst]
+  if dst > src:
+    return values * ( dst // src )
+  return values // ( src // dst )
+
+#------------------------------------------------------------------------------
+def view(column):
+  '''
+  Returns a tuple of ``(values, unit, tz, valid)`` for the
+  ``datetime64`` array or (non-chunked) Arrow timestamp array
+  `column`, where `values` is an int64 NumPy view of the column's data
+  (no data is copied), `unit` is one of ``'s'``, ``'ms'``, ``'us'`` or
+  ``'ns'``, `tz` is the Arrow timezone metadata (always None for
+  ``datetime64``) and `valid` is a boolean array of the non-null
+  elements, or None if there are no nulls. The values of null
+  elements are undefined.
+
+  ``datetime64`` arrays in other units (e.g. days) are converted to
+  seconds, which allocates a new array.
+  '''
+  if _isArrow(column):
+    pa = _arrow()
+    if isinstance(column, pa.ChunkedArray):
+      raise TypeError('chunked arrays must be viewed one chunk at a time')
+    if not pa.types.is_timestamp(column.type):
+      raise TypeError('expected an Arrow timestamp array, not %s' % (column.type,))
+    values = np.frombuffer(
+      column.buffers()[1], dtype=np.int64,
+      count=len(column), offset=column.offset * 8)
+    valid = None
+    if column.null_count:
+      valid = column.is_valid().to_numpy(zero_copy_only=False)
+    return ( values, column.type.unit, column.type.tz, valid )
+  column = np.asarray(column)
+  if column.dtype.kind != 'M':
+    raise TypeError('expected a datetime64 array, not %r' % (column.dtype,))
+  unit, count = np.datetime_data(column.dtype)
+  if count != 1 or unit not in UNITS:
+    column = column.astype('datetime64[s]')
+    unit = 's'
+  values = column.view(np.int64)
+  valid = values != _NAT
+  return ( values, unit, None, None if valid.all() else valid )
+
+#------------------------------------------------------------------------------
+def _toArrow(values, unit, tz, valid):
+  pa = _arrow()
+  values = np.ascontiguousarray(values, dtype=np.int64)
+  mask = None
+  if valid is not None:
+    mask = pa.py_buffer(np.packbits(valid, bitorder='little'))
+  return pa.Array.from_buffers(
+    pa.timestamp(unit, tz), len(values), [mask, pa.py_buffer(values)],
+    null_count=0 if valid is None else int(len(valid) - valid.sum()))
+
+#------------------------------------------------------------------------------
+def _toDatetime64(values, unit, valid):
+  if valid is not None:
+    values = np.where(valid, values, _NAT)
+  return values.view('datetime64[%s]' % (unit,))
+
+#------------------------------------------------------------------------------
+def to_datetime64(column, unit=None):
+  '''
+  Returns the ``datetime64`` or Arrow timestamp `column` as a NumPy
+  ``datetime64`` array in `unit` (which defaults to the column's own
+  unit), with nulls as ``NaT``. If the unit matches and there are no
+  nulls, the result is a view of the column's memory. Arrow timezone
+  metadata is dropped, since ``datetime64`` values are always UTC.
+  '''
+  if _isArrow(column) and isinstance(column, _arrow().ChunkedArray):
+    chunks = [to_datetime64(chunk, unit) for chunk in column.chunks]
+    if len(chunks) == 1:
+      return chunks[0]
+    return np.concatenate(
+      chunks or [np.zeros((0,), 'datetime64[%s]' % (unit or column.type.unit,))])
+  values, src, tz, valid = view(column)
+  dst = _unit(unit or src)
+  if src == dst and not _isArrow(column) \
+      and np.datetime_data(np.asarray(column).dtype) == ( dst, 1 ):
+    # note: NaT elements are already NaT
+    return np.asarray(column)
+  if valid is not None and src != dst:
+    values = np.where(valid, values, 0)
+  return _toDatetime64(_rescale(values, src, dst), dst, valid)
+
+#------------------------------------------------------------------------------
+def to_arrow(column, unit=None, tz=None):
+  '''
+  Returns the ``datetime64`` or Arrow timestamp `column` as an Arrow
+  ``timestamp[unit, tz]`` array, where `unit` defaults to the column's
+  own unit and `tz` (a timezone name or UTC offset string) to its
+  timezone metadata. ``NaT`` elements become nulls. If the unit
+  matches, the result shares the column's memory. Requires `pyarrow`.
+  '''
+  pa = _arrow()
+  if isinstance(column, pa.ChunkedArray):
+    return pa.chunked_array(
+      [to_arrow(chunk, unit, tz) for chunk in column.chunks],
+      type=pa.timestamp(unit or column.type.unit, tz or column.type.tz))
+  values, src, ctz, valid = view(column)
+  dst = _unit(unit or src)
+  return _toArrow(_rescale(values, src, dst), dst, tz or ctz, valid)
+
+#------------------------------------------------------------------------------
+def tots(column):
+  '''
+  Returns a float64 array of the epoch timestamps (in seconds) of the
+  ``datetime64`` or Arrow timestamp `column`, with NaN for nulls. Note
+  that, as with :func:`epoch.ns.tots`, floats cannot represent
+  nanoseconds at current epoch magnitudes.
+  '''
+  if _isArrow(column) and isinstance(column, _arrow().ChunkedArray):
+    return np.concatenate([tots(chunk) for chunk in column.chunks] or [np.zeros((0,))])
+  values, unit, tz, valid = view(column)
+  scale = UNITS[unit]
+  sec, rem = np.divmod(values, scale)
+  ret = sec + rem / float(scale)
+  if valid is not None:
+    ret[~valid] = np.nan
+  return ret
+
+#------------------------------------------------------------------------------
+def fromts(ts, unit='ns', tz=None, arrow=False):
+  '''
+  Converts the array of float epoch timestamps (in seconds) `ts` to a
+  ``datetime64`` array in `unit`, rounded to the nearest unit, or, if
+  `arrow` is true, to an Arrow ``timestamp[unit, tz]`` array. NaN
+  elements become ``NaT`` (or nulls).
+  '''
+  unit = _unit(unit)
+  ts = np.asarray(ts, dtype=np.float64)
+  valid = np.isfinite(ts)
+  if valid.all():
+    valid = None
+  values = _fromSeconds(ts if valid is None else np.where(valid, ts, 0), unit)
+  if arrow:
+    return _toArrow(values, unit, tz, valid)
+  return _toDatetime64(values, unit, valid)
+
+#------------------------------------------------------------------------------
+def _toSeconds(values, unit):
+  # returns the float64 seconds of the int64 `values` in `unit`,
+  # truncated to microseconds (which is all that periods depend on)
+  scale = UNITS[unit]
+  if scale == 1:
+    return values.astype(np.float64)
+  sec, rem = np.divmod(values, scale)
+  if scale > 1000000:
+    rem //= scale // 1000000
+    scale = 1000000
+  return sec + rem / float(scale)
+
+#------------------------------------------------------------------------------
+def _fromSeconds(ts, unit):
+  # returns the int64 values in `unit` of the float64 seconds `ts`,
+  # rounded to the nearest microsecond (or unit, if coarser)
+  scale = UNITS[unit]
+  sec = np.floor(ts)
+  if scale > 1000000:
+    frac = np.round(( ts - sec ) * 1000000).astype(np.int64) * ( scale // 1000000 )
+  else:
+    frac = np.round(( ts - sec ) * scale).astype(np.int64)
+  if sec.size and np.abs(sec).max() >= np.iinfo(np.int64).max // scale:
+    raise OverflowError('timestamps out of range for unit %r' % (unit,))
+  return sec.astype(np.int64) * scale + frac
+
+#------------------------------------------------------------------------------
+def _period(func, column, tz, **kw):
+  if _isArrow(column) and isinstance(column, _arrow().ChunkedArray):
+    pa = _arrow()
+    return pa.chunked_array(
+      [_period(func, chunk, tz, **kw) for chunk in column.chunks],
+      type=column.type)
+  values, unit, ctz, valid = view(column)
+  if valid is not None:
+    values = values[valid]
+  ret = func(_toSeconds(values, unit), tz=tz or getTz(ctz), **kw)
+  ret = _fromSeconds(ret, unit)
+  if valid is not None:
+    full = np.zeros(valid.shape, dtype=np.int64)
+    full[valid] = ret
+    ret = full
+  if _isArrow(column):
+    return _toArrow(ret, unit, ctz, valid)
+  return _toDatetime64(ret, unit, valid)
+
+#------------------------------------------------------------------------------
+def sod(column, tz=None, boundary=None, offset=None, replace=None):
+  '''
+  Column version of :func:`epoch.vec.sod`: returns the start of the
+  day containing each element of the ``datetime64`` or Arrow timestamp
+  `column` relative to timezone `tz` (which defaults to the column's
+  timezone metadata), as a column of the same kind, unit and metadata.
+  '''
+  return _period(vec.sod, column, tz, boundary=boundary, offset=offset, replace=replace)
+
+#------------------------------------------------------------------------------
+def sow(column, tz=None, offset=None, day=None, replace=None):
+  '''
+  Column version of :func:`epoch.vec.sow` (see :func:`sod`).
+  '''
+  return _period(vec.sow, column, tz, offset=offset, day=day, replace=replace)
+
+#------------------------------------------------------------------------------
+def som(column, tz=None, offset=None, replace=None):
+  '''
+  Column version of :func:`epoch.vec.som` (see :func:`sod`).
+  '''
+  return _period(vec.som, column, tz, offset=offset, replace=replace)
+
+#------------------------------------------------------------------------------
+def soy(column, tz=None, offset=None, replace=None):
+  '''
+  Column version of :func:`epoch.vec.soy` (see :func:`sod`).
+  '''
+  return _period(vec.soy, column, tz, offset=offset, replace=replace)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
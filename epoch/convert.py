@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Streaming conversion of timestamp columns in delimited text (the
+implementation of ``python -m epoch``).
+
+Each input line is split on a single delimiter (without any CSV
+quoting rules), and each selected column is parsed (see
+:class:`epoch.iso.Parser` and :func:`epoch.parse`), optionally
+truncated to the start of its day, week, month or year, and then
+formatted as an epoch float, a zulu string, a local ISO 8601 string or
+with any :func:`epoch.formatter` pattern. Input is processed in
+chunks of whole lines, so memory use does not depend on the input
+size, and with ``--jobs N`` the chunks are converted by a pool of
+processes while the output order is preserved.
+'''
+
+import argparse
+import collections
+import io
+import os
+import sys
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+DEFAULT_CHUNKSIZE       = 1 << 22
+PERIODS                 = ('sod', 'sow', 'som', 'soy')
+FORMATS                 = ('epoch', 'zulu', 'local')
+
+# the converter of the current worker process (see `_init`)
+_worker                 = None
+
+#------------------------------------------------------------------------------
+class ConversionError(ValueError):
+  '''
+  Raised when a field cannot be converted and `errors` is ``'raise'``.
+  '''
+
+#------------------------------------------------------------------------------
+class Converter(object):
+  '''
+  Converts the timestamp fields in `columns` (zero-based indexes) of
+  lines delimited by `sep`. Each field is parsed in timezone `tz`,
+  truncated with the period function `period` (one of
+  :data:`PERIODS`, or None) in timezone `tz`, and formatted as
+  `output`, which is one of :data:`FORMATS` or an
+  :func:`epoch.formatter` pattern or preset. Fields that cannot be
+  converted raise a :class:`ConversionError` if `errors` is
+  ``'raise'`` (the default), or are left as-is if it is ``'keep'``.
+
+  Converters are picklable (their caches are rebuilt on first use), so
+  that they can be sent to worker processes.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, columns=(0,), sep=',', tz=None, period=None,
+               output='epoch', errors='raise'):
+    if period is not None and period not in PERIODS:
+      raise ValueError('unknown period: %r' % (period,))
+    if errors not in ('raise', 'keep'):
+      raise ValueError('unknown `errors` mode: %r' % (errors,))
+    if len(sep) != 1:
+      raise ValueError('the delimiter must be a single character, not %r' % (sep,))
+    self.columns  = tuple(columns)
+    self.sep      = sep
+    self.tz       = tz
+    self.period   = period
+    self.output   = output
+    self.errors   = errors
+    self._convert = None
+
+  #----------------------------------------------------------------------------
+  def __getstate__(self):
+    ret = dict(self.__dict__)
+    ret['_convert'] = None
+    return ret
+
+  #----------------------------------------------------------------------------
+  def _compile(self):
+    # builds the (unpicklable) field conversion function
+    from . import iso
+    tz = epoch.getTz(self.tz)
+    parser = iso.Parser(tz)
+    fast = epoch._parseZuluFast
+    period = getattr(epoch, self.period) if self.period else None
+    if self.output == 'epoch':
+      fmt = repr
+    elif self.output == 'zulu':
+      fmt = epoch.zulu
+    else:
+      fmt = epoch.formatter('iso8601' if self.output == 'local' else self.output, tz)
+    def convert(field):
+      text = field.strip()
+      ts = fast(text)
+      if ts is None:
+        # note: numeric fields are epoch timestamps, exactly as in
+        #       `epoch.parse`, and must not lock the sniffing parser onto
+        #       a compact date layout (e.g. ``20151031``).
+        try:
+          ts = float(text)
+        except ValueError:
+          ts = parser(text)
+        if ts is None:
+          raise ValueError('missing timestamp')
+      if period is not None:
+        ts = period(ts, tz)
+      return fmt(float(ts))
+    return convert
+
+  #----------------------------------------------------------------------------
+  def line(self, text):
+    '''
+    Returns the converted version of the single line `text`, which
+    must not include the trailing newline.
+    '''
+    convert = self._convert
+    if convert is None:
+      convert = self._convert = self._compile()
+    eol = ''
+    if text.endswith('\r'):
+      text, eol = text[:-1], '\r'
+    if not text:
+      return text + eol
+    fields = text.split(self.sep)
+    for column in self.columns:
+      if column >= len(fields):
+        if self.errors == 'raise':
+          raise ConversionError('missing column %d in line %r' % (column, text))
+        continue
+      try:
+        fields[column] = convert(fields[column])
+      except (ValueError, SyntaxError, TypeError, OverflowError) as err:
+        if self.errors == 'raise':
+          raise ConversionError(
+            'cannot convert %r (column %d): %s' % (fields[column], column, err))
+    return self.sep.join(fields) + eol
+
+  #----------------------------------------------------------------------------
+  def __call__(self, text):
+    '''
+    Returns the converted version of `text`, which consists of whole
+    lines (the last of which may lack a newline).
+    '''
+    lines = text.split('\n')
+    last = lines.pop()
+    ret = [self.line(line) for line in lines]
+    ret.append(self.line(last) if last else '')
+    return '\n'.join(ret)
+
+#------------------------------------------------------------------------------
+def _init(converter):
+  global _worker
+  _worker = converter
+
+#------------------------------------------------------------------------------
+def _convertChunk(text):
+  return _worker(text)
+
+#------------------------------------------------------------------------------
+def _convertRange(task):
+  # converts the bytes [start, end) of the file `path`
+  path, start, end = task
+  with open(path, 'rb') as fp:
+    fp.seek(start)
+    data = fp.read(end - start)
+  return _worker(data.decode('utf-8', 'surrogateescape'))
+
+#------------------------------------------------------------------------------
+def _chunks(fp, chunksize):
+  # generates chunks of about `chunksize` characters of whole lines
+  while True:
+    lines = fp.readlines(chunksize)
+    if not lines:
+      return
+    yield ''.join(lines)
+
+#------------------------------------------------------------------------------
+def _ranges(path, start, chunksize):
+  # generates (path, start, end) tuples that split the file `path`, from
+  # offset `start`, into ranges of about `chunksize` bytes of whole lines
+  size = os.path.getsize(path)
+  with open(path, 'rb') as fp:
+    while start < size:
+      fp.seek(min(start + chunksize, size))
+      if fp.tell() < size:
+        fp.readline()
+      end = min(fp.tell(), size)
+      yield ( path, start, end )
+      start = end
+
+#------------------------------------------------------------------------------
+def _imap(pool, func, tasks, window):
+  # like ``pool.imap(func, tasks)``, but with at most `window` tasks in
+  # flight, so that the `tasks` generator (e.g. the chunks of stdin) is
+  # not read ahead of the output without limit.
+  pending = collections.deque()
+  for task in tasks:
+    if len(pending) >= window:
+      yield pending.popleft().get()
+    pending.append(pool.apply_async(func, (task,)))
+  while pending:
+    yield pending.popleft().get()
+
+#------------------------------------------------------------------------------
+def _open(path):
+  # opens `path` (or stdin for '-') as text, without newline translation
+  if path == '-':
+    return io.TextIOWrapper(
+      sys.stdin.buffer, encoding='utf-8', errors='surrogateescape', newline='')
+  return io.open(path, encoding='utf-8', errors='surrogateescape', newline='')
+
+#------------------------------------------------------------------------------
+def convert(converter, paths, output, jobs=1, header=False,
+            chunksize=DEFAULT_CHUNKSIZE):
+  '''
+  Converts the files `paths` (where ``'-'`` is stdin) with the
+  :class:`Converter` `converter`, and writes the results to the text
+  stream `output`. If `header` is truthy, the first line of each file
+  is copied as-is. If `jobs` is greater than one, the chunks of about
+  `chunksize` bytes are converted by a pool of `jobs` processes;
+  regular files are then read by the workers themselves, and at most
+  two chunks per process are in flight at any time.
+  '''
+  pool = None
+  if jobs > 1:
+    import multiprocessing
+    pool = multiprocessing.Pool(jobs, initializer=_init, initargs=(converter,))
+  try:
+    for path in paths:
+      with _open(path) as fp:
+        first = fp.readline() if header else ''
+        output.write(first)
+        if pool is None:
+          for chunk in _chunks(fp, chunksize):
+            output.write(converter(chunk))
+          continue
+        if path != '-' and os.path.isfile(path):
+          start = len(first.encode('utf-8', 'surrogateescape'))
+          results = _imap(
+            pool, _convertRange, _ranges(path, start, chunksize), jobs * 2)
+        else:
+          results = _imap(
+            pool, _convertChunk, _chunks(fp, chunksize), jobs * 2)
+        for result in results:
+          output.write(result)
+  finally:
+    if pool is not None:
+      pool.terminate()
+      pool.join()
+
+#------------------------------------------------------------------------------
+def main(args=None):
+  cli = argparse.ArgumentParser(
+    prog='python -m epoch',
+    description='Converts the timestamp columns of delimited text files'
+    ' (or stdin), e.g. between epoch floats, zulu strings and local times.')
+  cli.add_argument(
+    'paths', metavar='FILENAME', nargs='*', default=['-'],
+    help='the file(s) to convert (default: stdin)')
+  cli.add_argument(
+    '-c', '--column', metavar='INDEX', type=int, action='append', dest='columns',
+    help='the zero-based index of a column to convert (default: 0);'
+    ' can be specified multiple times')
+  cli.add_argument(
+    '-d', '--delimiter', metavar='SEP', default=',',
+    help='the column delimiter, e.g. "\\t" (default: "%(default)s")')
+  cli.add_argument(
+    '-z', '--tz', metavar='TZ',
+    help='the timezone of local input and output times and of the'
+    ' period boundaries (default: UTC)')
+  cli.add_argument(
+    '-p', '--period', choices=PERIODS,
+    help='truncate the timestamps to the start of their day, week,'
+    ' month or year')
+  cli.add_argument(
+    '-f', '--format', metavar='FORMAT', default='epoch', dest='output',
+    help='the output format: "epoch", "zulu", "local" (ISO 8601 with'
+    ' the local offset), an `epoch.formatter` preset such as "rfc3339",'
+    ' or a pattern such as "%%Y-%%m-%%d %%H:%%M" (default: %(default)s)')
+  cli.add_argument(
+    '-H', '--header', action='store_true',
+    help='copy the first line of each file unchanged')
+  cli.add_argument(
+    '-e', '--errors', choices=('raise', 'keep'), default='raise',
+    help='how to handle fields that cannot be converted: abort or'
+    ' leave them unchanged (default: %(default)s)')
+  cli.add_argument(
+    '-j', '--jobs', metavar='COUNT', type=int, default=1,
+    help='the number of worker processes; 0 means one per CPU'
+    ' (default: %(default)s)')
+  cli.add_argument(
+    '-o', '--output', metavar='FILENAME', dest='filename',
+    help='write the output to FILENAME (default: stdout)')
+  cli.add_argument(
+    '--chunk-size', metavar='BYTES', type=int, default=DEFAULT_CHUNKSIZE,
+    help='the approximate size of each chunk (default: %(default)s)')
+  options = cli.parse_args(args)
+  # note: backslash escapes (e.g. "\\t") are decoded, while any other
+  #       non-ASCII characters are escaped first so that they survive.
+  sep = options.delimiter.encode('latin-1', 'backslashreplace')
+  sep = sep.decode('unicode_escape')
+  try:
+    converter = Converter(
+      columns=options.columns or (0,), sep=sep, tz=options.tz,
+      period=options.period, output=options.output, errors=options.errors)
+    epoch.getTz(options.tz)
+  except Exception as err:
+    cli.error(str(err))
+  jobs = options.jobs if options.jobs > 0 else ( os.cpu_count() or 1 )
+  if options.filename:
+    output = io.open(
+      options.filename, 'w', encoding='utf-8', errors='surrogateescape', newline='')
+  else:
+    output = io.TextIOWrapper(
+      sys.stdout.buffer, encoding='utf-8', errors='surrogateescape', newline='')
+  try:
+    convert(converter, options.paths, output, jobs=jobs,
+            header=options.header, chunksize=options.chunk_size)
+  except (ConversionError, IOError) as err:
+    output.flush()
+    sys.stderr.write('error: %s\n' % (err,))
+    return 1
+  finally:
+    if options.filename:
+      output.close()
+    else:
+      output.flush()
+      output.detach()
+  return 0
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
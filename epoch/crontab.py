@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Cron expressions compiled to next/previous fire times in arbitrary
+timezones (see :func:`epoch.cron`).
+
+An expression has the five standard fields ``minute hour
+day-of-month month day-of-week``, each of which is a comma-separated
+list of ``*``, values (``5``), ranges (``1-5``) and steps (``*/15``,
+``10-50/20`` or ``5/10``). Months and weekdays may also be given by
+their (case-insensitive) three-letter English names, and Sunday is
+either ``0`` or ``7``. If both the day-of-month and the day-of-week
+fields are restricted (i.e. not ``*``), a day matches if either of
+them does, as in the traditional cron. The macros ``@yearly``,
+``@annually``, ``@monthly``, ``@weekly``, ``@daily``, ``@midnight``
+and ``@hourly`` are also supported.
+
+Expressions are evaluated in local "wall clock" time, and local times
+that fall in a DST gap or overlap are resolved as :func:`epoch.tzcorrect`
+does: times in a gap are shifted forward by the gap size and
+ambiguous times resolve to the non-DST occurrence.
+'''
+
+from bisect import bisect_left, bisect_right
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+MACROS                  = {
+  '@yearly'     : '0 0 1 1 *',
+  '@annually'   : '0 0 1 1 *',
+  '@monthly'    : '0 0 1 * *',
+  '@weekly'     : '0 0 * * 0',
+  '@daily'      : '0 0 * * *',
+  '@midnight'   : '0 0 * * *',
+  '@hourly'     : '0 * * * *',
+}
+
+# the maximum number of years that `next` and `prev` search, which is
+# enough for any satisfiable expression (e.g. February 29th can be
+# eight years apart).
+MAXYEARS                = 10
+
+_MONTHNAMES             = ('jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                           'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+_DAYNAMES               = ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')
+
+# field name => ( minimum, maximum, names )
+_FIELDS                 = (
+  ( 'minute',       0, 59, None ),
+  ( 'hour',         0, 23, None ),
+  ( 'day-of-month', 1, 31, None ),
+  ( 'month',        1, 12, dict((name, idx + 1) for idx, name in enumerate(_MONTHNAMES)) ),
+  ( 'day-of-week',  0, 7,  dict((name, idx) for idx, name in enumerate(_DAYNAMES)) ),
+)
+
+_crons                  = dict()
+
+#------------------------------------------------------------------------------
+def _value(text, field):
+  name, lo, hi, names = field
+  if names and text.lower() in names:
+    return names[text.lower()]
+  if not text.isdigit():
+    raise ValueError('invalid %s value: %r' % (name, text))
+  ret = int(text)
+  if not lo <= ret <= hi:
+    raise ValueError('%s value out of range %d-%d: %r' % (name, lo, hi, text))
+  return ret
+
+#------------------------------------------------------------------------------
+def _parseField(text, field):
+  '''
+  Returns the sorted tuple of the values that the cron field `text`
+  matches, and whether or not it is unrestricted (i.e. ``*``).
+  '''
+  name, lo, hi, _ = field
+  values = set()
+  for item in text.split(','):
+    step = 1
+    if '/' in item:
+      item, step = item.split('/', 1)
+      if not step.isdigit() or int(step) < 1:
+        raise ValueError('invalid %s step: %r' % (name, step))
+      step = int(step)
+    if item == '*':
+      start, end = lo, hi
+    elif '-' in item:
+      start, end = [_value(part, field) for part in item.split('-', 1)]
+      if start > end:
+        raise ValueError('invalid %s range: %r' % (name, item))
+    else:
+      start = end = _value(item, field)
+      if step > 1:
+        end = hi
+    values.update(range(start, end + 1, step))
+  return ( tuple(sorted(values)), text == '*' )
+
+#------------------------------------------------------------------------------
+class Cron(object):
+  '''
+  A compiled cron expression in timezone `tz` (see :func:`epoch.cron`).
+  Each field is compiled to a sorted table of its values, so that
+  :meth:`next` and :meth:`prev` jump directly to the next (or
+  previous) matching month, day, hour and minute instead of stepping
+  minute by minute. The matching days of each month are computed once
+  per (year, month) and then cached.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, expr, tz=None):
+    self.expr     = expr
+    self.tz       = epoch.getTz(tz)
+    parts = MACROS.get(expr.strip().lower(), expr).split()
+    if len(parts) != len(_FIELDS):
+      raise ValueError(
+        'cron expressions must have %d fields: %r' % (len(_FIELDS), expr))
+    fields = [_parseField(part, field) for part, field in zip(parts, _FIELDS)]
+    self.minutes, self.hours = fields[0][0], fields[1][0]
+    self.mdays, self.months = fields[2][0], fields[3][0]
+    self.wdays = tuple(sorted(set(day % 7 for day in fields[4][0])))
+    # note: like cron, a restricted day-of-month *or* day-of-week matches
+    self._mdayAll = fields[2][1]
+    self._wdayAll = fields[4][1]
+    self._days    = dict()
+    if self._wdayAll and not any(
+        self.mdays[0] <= ( 29 if month == 2 else epoch._DAYSINMONTH[month] )
+        for month in self.months):
+      raise ValueError('cron expression never matches: %r' % (expr,))
+
+  #----------------------------------------------------------------------------
+  def __repr__(self):
+    return '<Cron %r %s>' % (
+      self.expr, getattr(self.tz, 'zone', None) or getattr(self.tz, 'key', self.tz))
+
+  #----------------------------------------------------------------------------
+  def days(self, year, month):
+    '''
+    Returns the sorted tuple of the days of `month` in `year` that
+    match this expression.
+    '''
+    key = ( year, month )
+    ret = self._days.get(key)
+    if ret is not None:
+      return ret
+    size = epoch._daysInMonth(year, month)
+    # the weekday (0 = sunday) of the 1st
+    first = ( epoch._civil2days(year, month, 1) + 4 ) % 7
+    mdays = set(day for day in self.mdays if day <= size)
+    wdays = set(day for day in range(1, size + 1)
+                if ( first + day - 1 ) % 7 in self.wdays)
+    if self._mdayAll and self._wdayAll:
+      ret = mdays
+    elif self._mdayAll:
+      ret = wdays
+    elif self._wdayAll:
+      ret = mdays
+    else:
+      ret = mdays | wdays
+    ret = self._days[key] = tuple(sorted(ret))
+    return ret
+
+  #----------------------------------------------------------------------------
+  def _after(self, local):
+    # returns the first matching local minute at or after the local
+    # "wall clock" seconds `local` (a multiple of 60), or None.
+    days, tod = divmod(local, 86400)
+    year, month, day = epoch._days2civil(days)
+    hour, minute = tod // 3600, tod // 60 % 60
+    months, hours, minutes = self.months, self.hours, self.minutes
+    limit = min(year + MAXYEARS, 9999)
+    while year <= limit:
+      idx = bisect_left(months, month)
+      if idx == len(months):
+        year, month, day, hour, minute = year + 1, months[0], 1, 0, 0
+        continue
+      if months[idx] != month:
+        month, day, hour, minute = months[idx], 1, 0, 0
+      mdays = self.days(year, month)
+      idx = bisect_left(mdays, day)
+      if idx == len(mdays):
+        year, month = ( year + 1, 1 ) if month == 12 else ( year, month + 1 )
+        day, hour, minute = 1, 0, 0
+        continue
+      if mdays[idx] != day:
+        day, hour, minute = mdays[idx], 0, 0
+      idx = bisect_left(hours, hour)
+      if idx == len(hours):
+        day, hour, minute = day + 1, 0, 0
+        continue
+      if hours[idx] != hour:
+        hour, minute = hours[idx], 0
+      idx = bisect_left(minutes, minute)
+      if idx == len(minutes):
+        hour, minute = hour + 1, 0
+        continue
+      return epoch._civil2days(year, month, day) * 86400 \
+        + hour * 3600 + minutes[idx] * 60
+    return None
+
+  #----------------------------------------------------------------------------
+  def _before(self, local):
+    # returns the last matching local minute at or before the local
+    # "wall clock" seconds `local` (a multiple of 60), or None.
+    days, tod = divmod(local, 86400)
+    year, month, day = epoch._days2civil(days)
+    hour, minute = tod // 3600, tod // 60 % 60
+    months, hours, minutes = self.months, self.hours, self.minutes
+    limit = max(year - MAXYEARS, 1)
+    while year >= limit:
+      idx = bisect_right(months, month) - 1
+      if idx < 0:
+        year, month, day, hour, minute = year - 1, months[-1], 31, 23, 59
+        continue
+      if months[idx] != month:
+        month, day, hour, minute = months[idx], 31, 23, 59
+      mdays = self.days(year, month)
+      idx = bisect_right(mdays, day) - 1
+      if idx < 0:
+        year, month = ( year - 1, 12 ) if month == 1 else ( year, month - 1 )
+        day, hour, minute = 31, 23, 59
+        continue
+      if mdays[idx] != day:
+        day, hour, minute = mdays[idx], 23, 59
+      idx = bisect_right(hours, hour) - 1
+      if idx < 0:
+        day, hour, minute = day - 1, 23, 59
+        continue
+      if hours[idx] != hour:
+        hour, minute = hours[idx], 59
+      idx = bisect_right(minutes, minute) - 1
+      if idx < 0:
+        hour, minute = hour - 1, 59
+        continue
+      return epoch._civil2days(year, month, day) * 86400 \
+        + hour * 3600 + minutes[idx] * 60
+    return None
+
+  #----------------------------------------------------------------------------
+  def next(self, ts=None):
+    '''
+    Returns the first fire time of this expression that is strictly
+    after the epoch timestamp `ts` (which defaults to now), or None if
+    there is none within :data:`MAXYEARS` years.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    sec = int(ts // 1)
+    # note: the search starts at the earliest local time that can map to
+    #       after `ts`, i.e. using the smallest UTC offset of the days
+    #       around it, so that neither a DST fall-back's repeated hour
+    #       nor a (forward-shifted) local time in a recent DST gap is
+    #       skipped.
+    local = min(
+      epoch._ts2local(sec + delta, self.tz) - delta
+      for delta in (-86400, 0, 86400))
+    local = local // 60 * 60 + 60
+    while True:
+      local = self._after(local)
+      if local is None:
+        return None
+      ret = epoch._local2ts(local, self.tz)
+      # note: a local time in a DST overlap can resolve to before `ts`
+      if ret > ts:
+        break
+      local += 60
+    # note: a local time in a DST gap is shifted forward by the gap
+    #       size, i.e. past the real local times that follow it (e.g.
+    #       01:00 in America/St_Johns on 2008/03/09 resolves to 02:00
+    #       NDT, after 01:07 NDT), so those are checked as well.
+    limit = epoch._ts2local(ret, self.tz)
+    local = self._after(local + 60)
+    while local is not None and local < limit:
+      cand = epoch._local2ts(local, self.tz)
+      if ts < cand < ret:
+        ret = cand
+      local = self._after(local + 60)
+    return float(ret)
+
+  #----------------------------------------------------------------------------
+  def prev(self, ts=None):
+    '''
+    Returns the last fire time of this expression that is strictly
+    before the epoch timestamp `ts` (which defaults to now), or None if
+    there is none within :data:`MAXYEARS` years.
+    '''
+    if ts is None:
+      ts = epoch.now()
+    sec = int(ts // 1)
+    local = epoch._ts2local(sec, self.tz)
+    local = local // 60 * 60 if sec != ts or local % 60 else local - 60
+    while True:
+      local = self._before(local)
+      if local is None:
+        return None
+      ret = epoch._local2ts(local, self.tz)
+      # note: a local time in a DST gap or overlap can resolve to after `ts`
+      if ret < ts:
+        return float(ret)
+      local -= 60
+
+  #----------------------------------------------------------------------------
+  def iter(self, start=None, end=None):
+    '''
+    Generates the fire times of this expression that are strictly after
+    `start` (which defaults to now) and, if specified, before `end`.
+    '''
+    ts = start
+    while True:
+      ts = self.next(ts)
+      if ts is None or ( end is not None and ts >= end ):
+        return
+      yield ts
+
+#------------------------------------------------------------------------------
+def cron(expr, tz=None):
+  '''
+  Returns the (cached) :class:`Cron` of the cron expression `expr` in
+  timezone `tz`.
+  '''
+  tz = epoch.getTz(tz)
+  key = ( expr, tz )
+  ret = _crons.get(key)
+  if ret is None:
+    ret = _crons[key] = Cron(expr, tz)
+  return ret
+
+#------------------------------------------------------------------------------
+def next_many(crons, ts=None):
+  '''
+  Returns a list of the next fire times (see :meth:`Cron.next`) after
+  the single epoch timestamp `ts` (which defaults to now) of each
+  item in the iterable `crons`, which may be :class:`Cron` objects or
+  ``(expr, tz)`` tuples. Each distinct expression and timezone is only
+  evaluated once.
+  '''
+  if ts is None:
+    ts = epoch.now()
+  results = dict()
+  ret = []
+  for item in crons:
+    if not isinstance(item, Cron):
+      item = cron(*item)
+    key = id(item)
+    if key not in results:
+      results[key] = ( item, item.next(ts) )
+    ret.append(results[key][1])
+  return ret
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Compiled timestamp format templates (see :func:`epoch.formatter`).
+
+A pattern is compiled once into a :class:`Formatter`, which formats
+epoch timestamps in a timezone without creating `datetime` objects:
+the UTC offset comes from the timezone's transition index, and the
+date fields from civil-date arithmetic. The following directives are
+supported (all of them locale-independent):
+
+==========  ==========================================================
+Directive   Meaning
+==========  ==========================================================
+``%Y``      four-digit year
+``%m``      two-digit month (01-12)
+``%d``      two-digit day of the month (01-31)
+``%j``      three-digit day of the year (001-366)
+``%H``      two-digit hour (00-23)
+``%M``      two-digit minute (00-59)
+``%S``      two-digit second (00-59)
+``%f``      six-digit microseconds
+``%L``      three-digit milliseconds
+``%a``      abbreviated English weekday name (e.g. ``Sat``)
+``%A``      full English weekday name (e.g. ``Saturday``)
+``%b``      abbreviated English month name (e.g. ``Oct``)
+``%B``      full English month name (e.g. ``October``)
+``%z``      UTC offset as ``+HHMM``
+``%:z``     UTC offset as ``+HH:MM``
+``%Z``      timezone abbreviation (e.g. ``CET``)
+``%s``      integer epoch seconds
+``%%``      a literal ``%``
+==========  ==========================================================
+
+Timestamps are rounded to the microsecond exactly as
+:func:`epoch.ts2dt` does.
+'''
+
+import math
+from operator import itemgetter
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+PRESETS                 = dict(
+  iso8601   = '%Y-%m-%dT%H:%M:%S.%L%:z',
+  compact   = '%Y%m%dT%H%M%SZ',
+  rfc3339   = '%Y-%m-%dT%H:%M:%S.%f%:z',
+  rfc1123   = '%a, %d %b %Y %H:%M:%S GMT',
+)
+# the presets that hard-code a UTC designator, and are therefore always
+# rendered in UTC, regardless of the formatter's timezone
+_UTCPRESETS             = frozenset(('compact', 'rfc1123'))
+
+_WEEKDAYS               = ('Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                           'Friday', 'Saturday', 'Sunday')
+_MONTHS                 = (None, 'January', 'February', 'March', 'April',
+                           'May', 'June', 'July', 'August', 'September',
+                           'October', 'November', 'December')
+# the cumulative number of days before each month, in a non-leap year
+_YDAYS                  = (None, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+# the indexes of the values in the tuple that is built for each
+# timestamp (see `Formatter._values`): the date values are cached per
+# local day, and the zone values per timezone period.
+_YEAR, _MONTH, _DAY, _YDAY, _WDAYABBR, _WDAYNAME, _MONTHABBR, _MONTHNAME, \
+  _HOUR, _MINUTE, _SECOND, _USEC, _MSEC, \
+  _OFFSET, _OFFSETCOLON, _ZONENAME, \
+  _EPOCH = range(17)
+
+# directive => ( template, value index )
+_DIRECTIVES             = {
+  'Y'   : ( '%04d', _YEAR ),
+  'm'   : ( '%02d', _MONTH ),
+  'd'   : ( '%02d', _DAY ),
+  'j'   : ( '%03d', _YDAY ),
+  'H'   : ( '%02d', _HOUR ),
+  'M'   : ( '%02d', _MINUTE ),
+  'S'   : ( '%02d', _SECOND ),
+  'f'   : ( '%06d', _USEC ),
+  'L'   : ( '%03d', _MSEC ),
+  'a'   : ( '%s',   _WDAYABBR ),
+  'A'   : ( '%s',   _WDAYNAME ),
+  'b'   : ( '%s',   _MONTHABBR ),
+  'B'   : ( '%s',   _MONTHNAME ),
+  'z'   : ( '%s',   _OFFSET ),
+  ':z'  : ( '%s',   _OFFSETCOLON ),
+  'Z'   : ( '%s',   _ZONENAME ),
+  's'   : ( '%d',   _EPOCH ),
+}
+
+_NUMBER_TYPES           = epoch._INTEGER_TYPES + ( float, )
+_formatters             = dict()
+
+#------------------------------------------------------------------------------
+def _offset(offset, sep):
+  sign = '-' if offset < 0 else '+'
+  offset = abs(offset) // 60
+  return '%s%02d%s%02d' % (sign, offset // 60, sep, offset % 60)
+
+#------------------------------------------------------------------------------
+def _compile(pattern):
+  '''
+  Compiles the directive `pattern` (or the name of one of the
+  :data:`PRESETS`) into a tuple of a ``%``-style template string and
+  the list of the value indexes of its arguments. A ValueError is
+  raised for unknown or incomplete directives.
+  '''
+  pattern = PRESETS.get(pattern, pattern)
+  template = []
+  fields = []
+  pos = 0
+  while pos < len(pattern):
+    char = pattern[pos]
+    pos += 1
+    if char != '%':
+      template.append(char.replace('%', '%%'))
+      continue
+    code = pattern[pos:pos + 1]
+    if code == ':':
+      code = pattern[pos:pos + 2]
+    pos += len(code)
+    if code == '%':
+      template.append('%%')
+      continue
+    if code not in _DIRECTIVES:
+      raise ValueError(
+        'unknown directive %r in format pattern %r' % ('%' + code, pattern))
+    spec, index = _DIRECTIVES[code]
+    template.append(spec)
+    fields.append(index)
+  return ( ''.join(template), fields )
+
+#------------------------------------------------------------------------------
+def _getter(fields):
+  # returns a function that extracts the tuple of `fields` from a
+  # values tuple (`itemgetter` returns a bare value for a single field)
+  if len(fields) == 1:
+    index = fields[0]
+    return lambda values: ( values[index], )
+  if not fields:
+    return lambda values: ()
+  return itemgetter(*fields)
+
+#------------------------------------------------------------------------------
+class Formatter(object):
+  '''
+  A compiled format pattern for timezone `tz` (see :func:`formatter`).
+  Calling it with an epoch timestamp (or None for the current time)
+  returns the formatted string; calling it with a NumPy array returns
+  a NumPy string array of the same shape, and with any other iterable
+  a list of strings. The ``compact`` and ``rfc1123`` presets, which
+  end in a literal ``Z`` and ``GMT``, are always rendered in UTC.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, pattern, tz=None):
+    self.pattern  = pattern
+    self.tz       = epoch.getTz('UTC' if pattern in _UTCPRESETS else tz)
+    self.index    = epoch.getTzIndex(self.tz)
+    self.template, self.fields = _compile(pattern)
+    self._get     = _getter(self.fields)
+    # the most recently used (local day, date values) and (start, end,
+    # zone values) of the most recently used timezone period
+    self._day     = ( None, None )
+    self._period  = ( 0, 0, None )
+
+  #----------------------------------------------------------------------------
+  def __call__(self, ts=None):
+    if ts is None:
+      ts = epoch.now()
+    elif not isinstance(ts, _NUMBER_TYPES):
+      if hasattr(ts, 'dtype') and hasattr(ts, 'shape'):
+        return self._array(ts)
+      return [self(value) for value in ts]
+    return self.template % self._get(self._values(ts))
+
+  #----------------------------------------------------------------------------
+  def _zone(self, sec):
+    # returns (and caches) the (start, end, zone values) of the period
+    # that contains `sec`; without a transition index, the "period" is
+    # just that one second.
+    index = self.index
+    if index is None:
+      dt = epoch.ts2dt(sec, self.tz)
+      offset = dt.utcoffset()
+      offset = offset.days * 86400 + offset.seconds
+      start, end, name = sec, sec + 1, dt.tzname()
+    else:
+      period = index.period(sec)
+      times = index.times
+      start = times[period]
+      end = times[period + 1] if period + 1 < len(times) else float('inf')
+      offset, name = index.offsets[period], index.names[period]
+    ret = self._period = (
+      start, end, ( offset, _offset(offset, ''), _offset(offset, ':'), name ))
+    return ret
+
+  #----------------------------------------------------------------------------
+  def _date(self, day):
+    # returns (and caches) the date values of the local `day`
+    year, month, mday = epoch._days2civil(day)
+    yday = _YDAYS[month] + mday
+    if month > 2 and epoch._isLeap(year):
+      yday += 1
+    wday = _WEEKDAYS[( day + 3 ) % 7]
+    ret = ( year, month, mday, yday, wday[:3], wday,
+            _MONTHS[month][:3], _MONTHS[month] )
+    self._day = ( day, ret )
+    return ret
+
+  #----------------------------------------------------------------------------
+  def _values(self, ts):
+    # note: this rounds to the microsecond exactly like
+    #       `datetime.fromtimestamp` does.
+    frac, whole = math.modf(ts)
+    sec = int(whole)
+    usec = int(round(frac * 1000000))
+    if usec >= 1000000:
+      sec += 1
+      usec -= 1000000
+    elif usec < 0:
+      sec -= 1
+      usec += 1000000
+    zone = self._period
+    if not zone[0] <= sec < zone[1]:
+      zone = self._zone(sec)
+    zone = zone[2]
+    day, tod = divmod(sec + zone[0], 86400)
+    date = self._day
+    date = date[1] if date[0] == day else self._date(day)
+    return date + (
+      tod // 3600, tod // 60 % 60, tod % 60, usec, usec // 1000 ) \
+      + zone[1:] + ( sec, )
+
+  #----------------------------------------------------------------------------
+  def _array(self, ts):
+    import numpy as np
+    from . import vec
+    ts = vec._asarray(ts)
+    parts = vec._decompose(ts.ravel(), self.tz)
+    if parts is None:
+      ret = [self(value) for value in ts.ravel().tolist()]
+    else:
+      sec, usec, offset = parts
+      days, tod = np.divmod(sec + offset, 86400)
+      year, month, day = vec._days2civil(days)
+      parts = dict(
+        sec=sec, usec=usec, days=days, tod=tod, year=year, month=month, day=day)
+      columns = dict(
+        (field, self._column(field, parts)) for field in set(self.fields))
+      columns = [columns[field] for field in self.fields]
+      ret = [self.template % values for values in zip(*columns)] \
+        if columns else [self.template] * ts.size
+    return np.array(ret, dtype=str).reshape(ts.shape)
+
+  #----------------------------------------------------------------------------
+  def _column(self, field, parts):
+    # returns the list of the values of `field` computed from the
+    # dictionary of arrays `parts` (see `_array`)
+    import numpy as np
+    year, month, day = parts['year'], parts['month'], parts['day']
+    tod, usec, sec = parts['tod'], parts['usec'], parts['sec']
+    if field == _YEAR:
+      ret = year
+    elif field == _MONTH:
+      ret = month
+    elif field == _DAY:
+      ret = day
+    elif field == _YDAY:
+      leap = ( year % 4 == 0 ) & ( ( year % 100 != 0 ) | ( year % 400 == 0 ) )
+      ret = np.array(_YDAYS[1:])[month - 1] + day + ( leap & ( month > 2 ) )
+    elif field in (_WDAYABBR, _WDAYNAME):
+      names = _WEEKDAYS if field == _WDAYNAME else [name[:3] for name in _WEEKDAYS]
+      ret = np.array(names, dtype=object)[( parts['days'] + 3 ) % 7]
+    elif field in (_MONTHABBR, _MONTHNAME):
+      names = _MONTHS[1:] if field == _MONTHNAME else [name[:3] for name in _MONTHS[1:]]
+      ret = np.array(names, dtype=object)[month - 1]
+    elif field == _HOUR:
+      ret = tod // 3600
+    elif field == _MINUTE:
+      ret = tod // 60 % 60
+    elif field == _SECOND:
+      ret = tod % 60
+    elif field == _USEC:
+      ret = usec
+    elif field == _MSEC:
+      ret = usec // 1000
+    elif field == _EPOCH:
+      ret = sec
+    else:
+      period = np.maximum(
+        np.searchsorted(np.frombuffer(self.index.times, dtype=np.int64),
+                        sec, side='right') - 1, 0)
+      if field == _ZONENAME:
+        names = self.index.names
+      else:
+        sep = ':' if field == _OFFSETCOLON else ''
+        names = [_offset(offset, sep) for offset in self.index.offsets]
+      ret = np.array(names, dtype=object)[period]
+    return ret.tolist()
+
+#------------------------------------------------------------------------------
+def formatter(pattern, tz=None):
+  '''
+  Returns the (cached) :class:`Formatter` of `pattern` (a directive
+  pattern or the name of one of the :data:`PRESETS`) in timezone `tz`.
+  '''
+  tz = epoch.getTz(tz)
+  key = ( pattern, tz )
+  ret = _formatters.get(key)
+  if ret is None:
+    ret = _formatters[key] = Formatter(pattern, tz)
+  return ret
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+A strict ISO 8601 date/time parser (see :func:`parse`) and a stream
+parser that sniffs the layout of the first value (see :class:`Parser`).
+
+The following layouts are supported, in both the extended (with
+separators) and basic (without) formats:
+
+* calendar dates: ``2015-10-31`` or ``20151031``
+* ordinal dates: ``2015-304`` or ``2015304``
+* week dates: ``2015-W44-6`` or ``2015W446`` (the weekday defaults
+  to Monday)
+* year and month: ``2015-10``
+
+optionally followed by ``T`` (or a space) and a time of ``hh``,
+``hh:mm`` or ``hh:mm:ss`` (or ``hhmm`` and ``hhmmss``), where the last
+component may have a fraction of any precision (separated by ``.`` or
+``,``), and ``24:00`` denotes the end of the day. The time may be
+followed by a UTC offset of ``Z``, ``+hh``, ``+hh:mm`` or ``+hhmm``.
+Values without an offset (including date-only values) are taken to be
+local times in the requested timezone.
+
+Malformed values raise a SyntaxError (as :func:`epoch.parseZulu`
+does), and well-formed values with out-of-range fields a ValueError.
+'''
+
+from operator import itemgetter
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+# the indexes of the fields in the tuple that is returned by `_scan`
+_YEAR, _MONTH, _DAY, _ORDINAL, _WEEK, _WEEKDAY, _HOUR, _MINUTE, _SECOND, \
+  _FRACTION, _SIGN, _OFFSETHOUR, _OFFSETMINUTE = range(13)
+_FIELDS                 = 13
+
+#------------------------------------------------------------------------------
+def _digits(text, pos):
+  # returns the position of the first non-digit in `text` at or after `pos`
+  size = len(text)
+  while pos < size and '0' <= text[pos] <= '9':
+    pos += 1
+  return pos
+
+#------------------------------------------------------------------------------
+def _scan(text):
+  '''
+  Scans the ISO 8601 string `text` and returns a tuple of the list of
+  field strings (None if absent), indexed by the ``_YEAR`` etc
+  constants, and the list of ``(field, start, end)`` spans of the
+  fields in `text`. Raises a SyntaxError if `text` is malformed.
+  '''
+  fields = [None] * _FIELDS
+  spans = []
+  size = len(text)
+  def take(field, start, end):
+    fields[field] = text[start:end]
+    spans.append(( field, start, end ))
+    return end
+  def fail():
+    raise SyntaxError('%r is not a valid ISO 8601 date/time string' % (text,))
+  if _digits(text, 0) < 4:
+    fail()
+  pos = take(_YEAR, 0, 4)
+  # the date
+  extended = text[pos:pos + 1] == '-'
+  pos += extended
+  if text[pos:pos + 1] == 'W':
+    if _digits(text, pos + 1) - pos - 1 < 2:
+      fail()
+    pos = take(_WEEK, pos + 1, pos + 3)
+    if extended and text[pos:pos + 1] == '-':
+      if _digits(text, pos + 1) - pos - 1 != 1:
+        fail()
+      pos = take(_WEEKDAY, pos + 1, pos + 2)
+    elif not extended and _digits(text, pos) - pos == 1:
+      pos = take(_WEEKDAY, pos, pos + 1)
+  else:
+    count = _digits(text, pos) - pos
+    if count == 3:
+      pos = take(_ORDINAL, pos, pos + 3)
+    elif extended and count == 2:
+      pos = take(_MONTH, pos, pos + 2)
+      if text[pos:pos + 1] == '-':
+        if _digits(text, pos + 1) - pos - 1 != 2:
+          fail()
+        pos = take(_DAY, pos + 1, pos + 3)
+    elif not extended and count == 4:
+      take(_MONTH, pos, pos + 2)
+      pos = take(_DAY, pos + 2, pos + 4)
+    else:
+      fail()
+  if pos == size:
+    return ( fields, spans )
+  if fields[_MONTH] is not None and fields[_DAY] is None:
+    fail()
+  # the time
+  if text[pos] not in 'T ':
+    fail()
+  pos += 1
+  count = _digits(text, pos) - pos
+  if count == 2 and text[pos + 2:pos + 3] == ':':
+    pos = take(_HOUR, pos, pos + 2)
+    if _digits(text, pos + 1) - pos - 1 != 2:
+      fail()
+    pos = take(_MINUTE, pos + 1, pos + 3)
+    if text[pos:pos + 1] == ':':
+      if _digits(text, pos + 1) - pos - 1 != 2:
+        fail()
+      pos = take(_SECOND, pos + 1, pos + 3)
+  elif count in (2, 4, 6):
+    for field in (_HOUR, _MINUTE, _SECOND)[:count // 2]:
+      pos = take(field, pos, pos + 2)
+  else:
+    fail()
+  if text[pos:pos + 1] in ('.', ','):
+    end = _digits(text, pos + 1)
+    if end == pos + 1:
+      fail()
+    pos = take(_FRACTION, pos + 1, end)
+  # the UTC offset
+  if pos < size:
+    if text[pos] not in 'Z+-':
+      fail()
+    pos = take(_SIGN, pos, pos + 1)
+    if fields[_SIGN] != 'Z':
+      count = _digits(text, pos) - pos
+      if count not in (2, 4):
+        fail()
+      pos = take(_OFFSETHOUR, pos, pos + 2)
+      if count == 4:
+        pos = take(_OFFSETMINUTE, pos, pos + 2)
+      elif text[pos:pos + 1] == ':':
+        if _digits(text, pos + 1) - pos - 1 != 2:
+          fail()
+        pos = take(_OFFSETMINUTE, pos + 1, pos + 3)
+  if pos != size:
+    fail()
+  return ( fields, spans )
+
+#------------------------------------------------------------------------------
+def _weekOne(year):
+  # returns the days since 1970/01/01 of the monday of ISO week 1
+  jan4 = epoch._civil2days(year, 1, 4)
+  return jan4 - ( jan4 + 3 ) % 7
+
+#------------------------------------------------------------------------------
+def _days(fields):
+  # returns the days since 1970/01/01 of the date `fields`
+  year = int(fields[_YEAR])
+  if year < 1:
+    raise ValueError('year 0 is out of range')
+  if fields[_WEEK] is not None:
+    week = int(fields[_WEEK])
+    start = _weekOne(year)
+    if not 1 <= week <= ( _weekOne(year + 1) - start ) // 7:
+      raise ValueError('week %d is out of range for year %d' % (week, year))
+    weekday = int(fields[_WEEKDAY] or 1)
+    if not 1 <= weekday <= 7:
+      raise ValueError('weekday must be in 1..7')
+    return start + ( week - 1 ) * 7 + weekday - 1
+  if fields[_ORDINAL] is not None:
+    ordinal = int(fields[_ORDINAL])
+    if not 1 <= ordinal <= 365 + epoch._isLeap(year):
+      raise ValueError('day %d is out of range for year %d' % (ordinal, year))
+    return epoch._civil2days(year, 1, 1) + ordinal - 1
+  month = int(fields[_MONTH] or 1)
+  day = int(fields[_DAY] or 1)
+  if not 1 <= month <= 12:
+    raise ValueError('month must be in 1..12')
+  if not 1 <= day <= epoch._daysInMonth(year, month):
+    raise ValueError('day is out of range for month')
+  return epoch._civil2days(year, month, day)
+
+#------------------------------------------------------------------------------
+def _compute(fields, tz, days=None):
+  '''
+  Converts the `fields` of `_scan` to an epoch timestamp, where local
+  times are resolved in timezone `tz`. If `days` is specified, it is
+  the (already computed) date of `fields` in days since 1970/01/01.
+  '''
+  if days is None:
+    days = _days(fields)
+  hour = int(fields[_HOUR] or 0)
+  minute = int(fields[_MINUTE] or 0)
+  second = int(fields[_SECOND] or 0)
+  fraction = fields[_FRACTION]
+  fraction = float('0.' + fraction) if fraction and fraction.strip('0') else 0
+  if hour == 24 and not ( minute or second or fraction ):
+    days, hour = days + 1, 0
+  if hour > 23 or minute > 59 or second > 59:
+    raise ValueError('time of day is out of range')
+  if fraction:
+    if fields[_SECOND] is None:
+      fraction *= 60 if fields[_MINUTE] is not None else 3600
+  local = days * 86400 + hour * 3600 + minute * 60 + second
+  sign = fields[_SIGN]
+  if sign == 'Z':
+    return local + fraction
+  if sign:
+    offhour = int(fields[_OFFSETHOUR])
+    offminute = int(fields[_OFFSETMINUTE] or 0)
+    if offhour > 23 or offminute > 59:
+      raise ValueError('UTC offset is out of range')
+    offset = offhour * 3600 + offminute * 60
+    return local - ( offset if sign == '+' else -offset ) + fraction
+  return epoch._local2ts(local, tz) + fraction
+
+#------------------------------------------------------------------------------
+def parse(text, tz=None):
+  '''
+  Parses the ISO 8601 date/time string `text` (see the module
+  documentation for the supported layouts) and returns the epoch
+  timestamp as a float. Values without a UTC offset are interpreted as
+  local times in timezone `tz` (which defaults to the package-default
+  timezone, i.e. UTC); non-existent and ambiguous local times are
+  resolved as :func:`epoch.dtreplace` does.
+  '''
+  return float(_compute(_scan(text)[0], tz))
+
+#------------------------------------------------------------------------------
+class Parser(object):
+  '''
+  A parser for streams of (mostly) homogeneous date/time strings. The
+  layout (i.e. the length, separators and field positions) of the
+  first string is sniffed (if :func:`parse` accepts it), and subsequent
+  strings with the same layout are parsed by slicing at the known
+  positions, skipping the scanning; the date of the most recent value
+  is also reused if it is unchanged. Any other value (e.g. one with a
+  fraction of a different precision) falls back to
+  :func:`epoch.parse`, which also handles canonical zulu strings and
+  numbers. The number of values parsed by the fast path and by the
+  fallback are counted in the `hits` and `misses` attributes.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, tz=None):
+    self.tz       = tz
+    self.layout   = None
+    self.hits     = 0
+    self.misses   = 0
+    self._sniffed = False
+    # the most recently parsed (date text, days since 1970/01/01)
+    self._date    = ( None, None )
+
+  #----------------------------------------------------------------------------
+  def __call__(self, text):
+    if not self._sniffed:
+      self._sniff(text)
+    if self.layout is not None:
+      fields = self._match(text)
+      if fields is not None:
+        self.hits += 1
+        date = text[:self._dateEnd]
+        if date != self._date[0]:
+          self._date = ( date, _days(fields) )
+        return float(_compute(fields, self.tz, self._date[1]))
+    self.misses += 1
+    return epoch.parse(text, self.tz)
+
+  #----------------------------------------------------------------------------
+  def _sniff(self, text):
+    # records the layout of `text`, if it is an ISO 8601 string; this is
+    # only ever attempted once.
+    self._sniffed = True
+    try:
+      fields, spans = _scan(text)
+    except (SyntaxError, TypeError):
+      return
+    # note: the sign of a UTC offset may vary ('+' or '-'), a 'Z' may not
+    spans = [span for span in spans if span[0] != _SIGN or fields[_SIGN] != 'Z']
+    covered = set()
+    for _, start, end in spans:
+      covered.update(range(start, end))
+    seps = [pos for pos in range(len(text)) if pos not in covered]
+    digits = [span for span in spans if span[0] != _SIGN]
+    signs = [span[1] for span in spans if span[0] == _SIGN]
+    self._size    = len(text)
+    self._order   = [span[0] for span in digits]
+    self._getSeps = _getter([slice(pos, pos + 1) for pos in seps])
+    self._seps    = self._getSeps(text)
+    self._getDigits = _getter([slice(start, end) for _, start, end in digits])
+    self._sign    = signs[0] if signs else None
+    self._blank   = [None] * _FIELDS
+    self._blank[_SIGN] = 'Z' if fields[_SIGN] == 'Z' else None
+    self._dateEnd = max(end for field, _, end in spans if field <= _WEEKDAY)
+    self.layout   = ''.join(
+      '0' if pos in covered and text[pos].isdigit() else text[pos]
+      for pos in range(len(text)))
+
+  #----------------------------------------------------------------------------
+  def _match(self, text):
+    # returns the fields of `text` if it has the sniffed layout
+    if len(text) != self._size or self._getSeps(text) != self._seps:
+      return None
+    values = self._getDigits(text)
+    if not ''.join(values).isdigit():
+      return None
+    fields = self._blank[:]
+    for field, value in zip(self._order, values):
+      fields[field] = value
+    if self._sign is not None:
+      sign = fields[_SIGN] = text[self._sign]
+      if sign != '+' and sign != '-':
+        return None
+    return fields
+
+#------------------------------------------------------------------------------
+def _getter(items):
+  # returns a function that returns the tuple of `items` of its argument
+  # (`itemgetter` returns a bare value for a single item)
+  if len(items) == 1:
+    item = items[0]
+    return lambda value: ( value[item], )
+  if not items:
+    return lambda value: ()
+  return itemgetter(*items)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Epoch timestamps as integer nanoseconds since 1970/01/01 (see
+:class:`epoch.units.IntegerUnit`). Example:
+
+.. code:: python
+
+  import epoch.ns
+
+  value = epoch.ns.parse('2015-10-31T15:00:00.123456Z')
+  day = epoch.ns.sod(value, tz='Europe/Paris')
+'''
+
+from .units import IntegerUnit
+
+#------------------------------------------------------------------------------
+
+unit                    = IntegerUnit(1000000000)
+
+now                     = unit.now
+fromts                  = unit.fromts
+tots                    = unit.tots
+zulu                    = unit.zulu
+parse                   = unit.parse
+sod                     = unit.sod
+sow                     = unit.sow
+som                     = unit.som
+soy                     = unit.soy
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Timezone-correct recurrence rules (see :class:`Rule`) and a heap-based
+scheduler of their next fire times (see :class:`Scheduler`).
+
+A rule fires once per local day, week, month or year, at the time (and
+day) given by its `at` fields, which are applied exactly like the
+`replace` parameter of :func:`epoch.sod` and friends. Fire times in a
+DST gap or overlap are therefore resolved as :func:`epoch.dtreplace`
+does: times in a gap are shifted forward by the gap size and ambiguous
+times resolve to the non-DST occurrence. For example:
+
+.. code:: python
+
+  from epoch.recur import Rule, Scheduler
+
+  daily   = Rule('day', 'Europe/Paris', at=dict(hour=15))
+  monday  = Rule('week', 'America/New_York', at=dict(hour=9, minute=30))
+  friday  = Rule('week', 'America/New_York', day=4, at=dict(hour=17))
+  monthly = Rule('month', 'Asia/Tokyo')     # the first, at midnight
+
+  sched = Scheduler()
+  sched.add(daily, 'report')
+  sched.add(monday, 'standup')
+  for fire, job in sched.pop_due():
+    ...
+'''
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+# period => the private period function (see `epoch._cached`)
+_PERIODS                = dict(
+  day       = epoch._sod,
+  week      = epoch._sow,
+  month     = epoch._som,
+  year      = epoch._soy,
+)
+
+#------------------------------------------------------------------------------
+class Rule(object):
+  '''
+  A recurrence that fires once per `period` (``'day'``, ``'week'``,
+  ``'month'`` or ``'year'``) in timezone `tz`, at the start of the
+  period modified by the dictionary of `datetime` attributes `at`
+  (e.g. ``dict(hour=9, minute=30)``, or ``dict(day=15)`` for a monthly
+  rule). For weekly rules, `day` selects the weekday that the week
+  starts on (and therefore fires on), where ``0`` (the default) is
+  Monday through ``6`` being Sunday.
+
+  The `at` fields must exist in every period: a ValueError is raised
+  for e.g. ``Rule('month', at=dict(day=31))``, since not every month
+  has a 31st day (and for a February 29th in yearly rules). Such rules
+  are rejected rather than clamped or skipped.
+
+  The rule's parameters are resolved once, and fire times are computed
+  through the period interval cache (see :func:`epoch.setCacheSize`),
+  so evaluating the same rule repeatedly is cheap.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, period, tz=None, at=None, day=None):
+    if period not in _PERIODS:
+      raise ValueError('unknown recurrence period: %r' % (period,))
+    if day is not None and period != 'week':
+      raise ValueError('`day` is only supported for weekly rules')
+    self.period   = period
+    self.tz       = epoch.getTz(tz)
+    self.at       = dict(at or {})
+    _validate(period, self.at)
+    self.day      = day
+    self._func    = _PERIODS[period]
+    self._replace = self.at or None
+    self._kw      = dict(day=day) if period == 'week' else dict()
+
+  #----------------------------------------------------------------------------
+  def __repr__(self):
+    return '<Rule %s %s at=%r%s>' % (
+      self.period, getattr(self.tz, 'zone', None) or getattr(self.tz, 'key', self.tz),
+      self.at, '' if self.day is None else ' day=%r' % (self.day,))
+
+  #----------------------------------------------------------------------------
+  def next(self, ts=None):
+    '''
+    Returns the first fire time of this rule that is strictly after the
+    epoch timestamp `ts` (which defaults to now).
+    '''
+    if ts is None:
+      ts = epoch.now()
+    offset = 0
+    while True:
+      ret = epoch._cached(
+        self._func, ts, self.tz, offset, self._replace, **self._kw)
+      if ret > ts:
+        return ret
+      offset += 1
+
+  #----------------------------------------------------------------------------
+  def iter(self, start=None, end=None):
+    '''
+    Generates the fire times of this rule that are strictly after
+    `start` (which defaults to now) and, if specified, before `end`.
+    '''
+    ts = start
+    while True:
+      ts = self.next(ts)
+      if end is not None and ts >= end:
+        return
+      yield ts
+
+#------------------------------------------------------------------------------
+def _validate(period, at):
+  # raises a ValueError unless the `datetime` attributes `at` can be
+  # applied to the start of every `period`, which is checked against
+  # the period starts of a (non-leap) reference year: weeks can start
+  # on any day, and days, months and years only differ in their date.
+  if not at:
+    return
+  start = datetime(2015, 1, 1)
+  if period == 'year':
+    starts = [start]
+  elif period == 'month':
+    starts = [start.replace(month=month) for month in range(1, 13)]
+  else:
+    starts = [start + timedelta(days=day) for day in range(365)]
+  for start in starts:
+    try:
+      start.replace(**at)
+    except (TypeError, ValueError) as err:
+      raise ValueError(
+        'invalid `at` for a %s rule: %r (%s)' % (period, at, err))
+
+#------------------------------------------------------------------------------
+class Scheduler(object):
+  '''
+  Keeps a set of jobs, each with a :class:`Rule`, in a heap ordered by
+  their next fire time, so that finding (and rescheduling) the due jobs
+  costs O(log n) per job. Due jobs are collected synchronously with
+  :meth:`pop_due`, or asynchronously with ``await`` :meth:`next_due`.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self):
+    # entries are [fire, sequence, rule, job]; the rule of a removed
+    # entry is set to None and the entry is discarded lazily.
+    self._heap    = []
+    self._seq     = itertools.count()
+    self._count   = 0
+    self._event   = None
+
+  #----------------------------------------------------------------------------
+  def __len__(self):
+    return self._count
+
+  #----------------------------------------------------------------------------
+  def add(self, rule, job=None, start=None):
+    '''
+    Schedules `job` (any object, which defaults to `rule` itself) to
+    fire according to `rule`, starting with the first fire time after
+    `start` (which defaults to now). Returns a handle that can be
+    passed to :meth:`remove`.
+    '''
+    entry = [rule.next(start), next(self._seq), rule, rule if job is None else job]
+    heapq.heappush(self._heap, entry)
+    self._count += 1
+    if self._event is not None:
+      self._event.set()
+    return entry
+
+  #----------------------------------------------------------------------------
+  def remove(self, handle):
+    '''
+    Unschedules the job with the `handle` returned by :meth:`add`.
+    '''
+    if handle[2] is None:
+      raise KeyError('job is not scheduled')
+    handle[2] = None
+    self._count -= 1
+
+  #----------------------------------------------------------------------------
+  def peek(self):
+    '''
+    Returns the earliest fire time of all scheduled jobs, or None if
+    there are none.
+    '''
+    heap = self._heap
+    while heap and heap[0][2] is None:
+      heapq.heappop(heap)
+    return heap[0][0] if heap else None
+
+  #----------------------------------------------------------------------------
+  def pop_due(self, now=None):
+    '''
+    Returns a list of ``(fire, job)`` tuples, in fire time order, of
+    all the jobs whose fire time is at or before `now` (which defaults
+    to :func:`epoch.now`), and reschedules each of them to its first
+    fire time after `now`. Note that a job that missed several fire
+    times is therefore only returned once. If a job's rule fails to
+    compute its next fire time, all the due jobs are left scheduled as
+    they were and the exception is raised.
+    '''
+    if now is None:
+      now = epoch.now()
+    heap = self._heap
+    entries = []
+    while heap and heap[0][0] <= now:
+      entry = heapq.heappop(heap)
+      if entry[2] is not None:
+        entries.append(entry)
+    try:
+      fires = [entry[2].next(now) for entry in entries]
+    except Exception:
+      for entry in entries:
+        heapq.heappush(heap, entry)
+      raise
+    ret = [( entry[0], entry[3] ) for entry in entries]
+    for entry, fire in zip(entries, fires):
+      entry[0] = fire
+      heapq.heappush(heap, entry)
+    return ret
+
+  #----------------------------------------------------------------------------
+  async def next_due(self):
+    '''
+    Waits (with `asyncio`) until at least one job is due and returns
+    the result of :meth:`pop_due`. Jobs that are added while waiting
+    are taken into account. The waiting is based on :func:`epoch.now`,
+    i.e. on the current clock (see :func:`epoch.setClock`).
+    '''
+    import asyncio
+    while True:
+      fire = self.peek()
+      delay = None
+      if fire is not None:
+        now = epoch.now()
+        if fire <= now:
+          return self.pop_due(now)
+        delay = fire - now
+      if self._event is None:
+        self._event = asyncio.Event()
+      self._event.clear()
+      try:
+        await asyncio.wait_for(self._event.wait(), delay)
+      except asyncio.TimeoutError:
+        pass
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
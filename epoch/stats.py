@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Opt-in instrumentation of the `epoch` hot paths.
+
+When enabled, the instrumented functions of the `epoch` module are
+replaced by wrappers that count the calls to them and accumulate the
+wall time spent in them, per stage (i.e. function) and per timezone.
+When disabled (the default), the original functions are restored, so
+there is no overhead whatsoever. Example:
+
+.. code:: python
+
+  import epoch, epoch.stats
+
+  epoch.clearCache()
+  epoch.stats.enable()
+  epoch.sod(tz='Europe/Paris')
+  epoch.stats.snapshot()['localize']['zones']['Europe/Paris']['calls']
+  # == 1 (a cache miss)
+  epoch.sod(tz='Europe/Paris')
+  epoch.stats.snapshot()['localize']['zones']['Europe/Paris']['calls']
+  # == 1 (the period interval cache was hit)
+
+Notes:
+
+* The times are inclusive, i.e. the time of ``sod`` includes the time
+  of the ``ts2dt``, ``localize`` and ``dt2ts`` calls that it makes.
+
+* Results served from the period interval cache (see
+  :func:`epoch.clearCache`) make no ``localize`` calls, so the counts
+  depend on the state of that cache.
+
+* Only calls made through the `epoch` module's attributes are seen:
+  references obtained earlier (e.g. via ``from epoch import sod``)
+  remain uninstrumented.
+'''
+
+import threading
+import time
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+_clock                  = getattr(time, 'perf_counter', time.time)
+
+#------------------------------------------------------------------------------
+def _tzArg(index):
+  # returns a function that extracts the timezone name from the
+  # positional parameter `index` (or the `tz` keyword) of a call
+  def zone(args, kw):
+    tz = args[index] if len(args) > index else kw.get('tz')
+    return _zoneName(tz)
+  return zone
+
+#------------------------------------------------------------------------------
+def _dtArg(args, kw):
+  return _zoneName(args[0].tzinfo) if args and args[0].tzinfo else None
+
+#------------------------------------------------------------------------------
+def _noArg(args, kw):
+  return None
+
+#------------------------------------------------------------------------------
+def _zoneName(tz):
+  if tz is None:
+    # note: the original (i.e. uninstrumented) `getTz` is used, since
+    #       this is called by the `getTz` wrapper itself.
+    tz = _originals.get('getTz', epoch.getTz)(None)
+  return getattr(tz, 'zone', None) or getattr(tz, 'key', None) or str(tz)
+
+#------------------------------------------------------------------------------
+
+# stage name => (`epoch` attribute, timezone extractor)
+STAGES                  = dict(
+  getTz       = ( 'getTz',      _tzArg(0) ),
+  getTzIndex  = ( 'getTzIndex', _tzArg(0) ),
+  ts2dt       = ( 'ts2dt',      _tzArg(1) ),
+  dt2ts       = ( 'dt2ts',      _dtArg ),
+  localize    = ( '_localize',  _dtArg ),
+  tsreplace   = ( 'tsreplace',  _tzArg(1) ),
+  sod         = ( 'sod',        _tzArg(1) ),
+  sow         = ( 'sow',        _tzArg(1) ),
+  som         = ( 'som',        _tzArg(1) ),
+  soy         = ( 'soy',        _tzArg(1) ),
+  zulu        = ( 'zulu',       _noArg ),
+  parse       = ( 'parse',      _noArg ),
+)
+
+_lock                   = threading.Lock()
+# stage => zone => [calls, seconds]
+_data                   = dict()
+# attribute => original function
+_originals              = dict()
+_callback               = None
+
+#------------------------------------------------------------------------------
+def _record(stage, zone, elapsed):
+  with _lock:
+    zones = _data.get(stage)
+    if zones is None:
+      zones = _data[stage] = dict()
+    entry = zones.get(zone)
+    if entry is None:
+      zones[zone] = [1, elapsed]
+    else:
+      entry[0] += 1
+      entry[1] += elapsed
+  if _callback is not None:
+    _callback(stage, zone, elapsed)
+
+#------------------------------------------------------------------------------
+def _wrap(stage, func, zone):
+  def wrapper(*args, **kw):
+    start = _clock()
+    try:
+      return func(*args, **kw)
+    finally:
+      elapsed = _clock() - start
+      _record(stage, zone(args, kw), elapsed)
+  wrapper.__name__ = func.__name__
+  wrapper.__doc__ = func.__doc__
+  wrapper.__wrapped__ = func
+  return wrapper
+
+#------------------------------------------------------------------------------
+def enable(stages=None, callback=None):
+  '''
+  Enables instrumentation of the `stages` (a list of names from
+  :data:`STAGES`), which defaults to all of them. If `callback` is
+  specified, it is called as ``callback(stage, zone, seconds)`` after
+  every instrumented call, e.g. to export the data to a metrics
+  system; `zone` is the timezone name, or None for timezone-agnostic
+  stages. Calling this when already enabled replaces the set of
+  instrumented stages and the callback.
+  '''
+  global _callback
+  stages = list(STAGES) if stages is None else list(stages)
+  for stage in stages:
+    if stage not in STAGES:
+      raise ValueError('unknown instrumentation stage %r' % (stage,))
+  disable()
+  _callback = callback
+  for stage in stages:
+    attr, zone = STAGES[stage]
+    func = getattr(epoch, attr)
+    _originals[attr] = func
+    setattr(epoch, attr, _wrap(stage, func, zone))
+
+#------------------------------------------------------------------------------
+def disable():
+  '''
+  Disables instrumentation, restoring the original functions. The
+  collected statistics are kept until :func:`reset` is called.
+  '''
+  global _callback
+  while _originals:
+    attr, func = _originals.popitem()
+    setattr(epoch, attr, func)
+  _callback = None
+
+#------------------------------------------------------------------------------
+def isEnabled():
+  '''
+  Returns True if instrumentation is currently enabled.
+  '''
+  return bool(_originals)
+
+#------------------------------------------------------------------------------
+def snapshot():
+  '''
+  Returns a copy of the statistics collected so far, as a dictionary
+  that maps each stage name to a dictionary with the total number of
+  `calls`, the total `time` in seconds, and the per-timezone
+  breakdown in `zones`, which maps each timezone name (or None) to a
+  dictionary with the `calls` and `time` of that timezone.
+  '''
+  with _lock:
+    ret = dict()
+    for stage, zones in _data.items():
+      ret[stage] = dict(
+        calls = sum(entry[0] for entry in zones.values()),
+        time  = sum(entry[1] for entry in zones.values()),
+        zones = dict(
+          (zone, dict(calls=entry[0], time=entry[1]))
+          for zone, entry in zones.items()),
+      )
+    return ret
+
+#------------------------------------------------------------------------------
+def reset():
+  '''
+  Discards all statistics collected so far.
+  '''
+  with _lock:
+    _data.clear()
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
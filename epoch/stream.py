@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Streaming extraction of epoch timestamps from line-oriented data.
+'''
+
+import mmap
+from array import array
+from contextlib import contextmanager
+
+import epoch
+
+try:
+  import numpy as np
+  from . import vec
+except ImportError:
+  np = vec = None
+
+#------------------------------------------------------------------------------
+
+DEFAULT_CHUNKSIZE       = 1 << 22
+
+#------------------------------------------------------------------------------
+@contextmanager
+def _open(source):
+  # yields a tuple of a buffer for `source` and its size
+  if isinstance(source, epoch._STRING_TYPES):
+    with open(source, 'rb') as fp:
+      with _open(fp) as ret:
+        yield ret
+    return
+  try:
+    data = memoryview(source)
+  except TypeError:
+    pass
+  else:
+    if data.ndim != 1 or data.itemsize != 1:
+      data = data.cast('B')
+    yield ( data, len(data) )
+    return
+  if hasattr(source, 'getbuffer'):
+    data = source.getbuffer()
+    try:
+      yield ( data, len(data) )
+    finally:
+      data.release()
+    return
+  try:
+    data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+  except ValueError:
+    # empty files cannot be mapped
+    yield ( b'', 0 )
+    return
+  try:
+    yield ( data, len(data) )
+  finally:
+    data.close()
+
+#------------------------------------------------------------------------------
+def scan(source, column=0, sep=b' ', chunksize=DEFAULT_CHUNKSIZE,
+         errors='raise', numpy=None):
+  '''
+  Generator that extracts the epoch timestamp in field `column` of
+  each line of `source` and yields the parsed values in chunks (one
+  per `chunksize` bytes of input) as NumPy float64 arrays, or as
+  ``array('d')`` objects if NumPy is not installed or `numpy` is
+  False.
+
+  `source` may be a filename or file object, which are memory-mapped,
+  an `io.BytesIO`, or any object supporting the buffer protocol. Lines
+  are separated by ``\\n`` (a trailing ``\\r`` is ignored) and fields
+  by the single byte `sep`. Only the timestamp field of each line is
+  ever decoded, and the memory used is proportional to `chunksize`,
+  regardless of the size of `source`.
+
+  Fields in the canonical :func:`epoch.zulu` format are parsed in
+  bulk; anything else is parsed with :func:`epoch.parse`. If a field
+  cannot be parsed (or is missing), the exception is raised if
+  `errors` is ``'raise'`` (the default), or the value is set to NaN if
+  `errors` is ``'coerce'``.
+  '''
+  if errors not in ('raise', 'coerce'):
+    raise ValueError('unknown `errors` mode: %r' % (errors,))
+  if not isinstance(sep, bytes):
+    sep = sep.encode('ascii')
+  if len(sep) != 1:
+    raise ValueError('`sep` must be a single byte, not %r' % (sep,))
+  if numpy and vec is None:
+    raise ImportError('numpy is not installed')
+  bulk = vec is not None and numpy is not False
+  with _open(source) as ( data, size ):
+    pos = 0
+    while pos < size:
+      end = min(pos + chunksize, size)
+      # extend the window until it ends with a whole line...
+      while True:
+        if bulk:
+          window = np.frombuffer(data, dtype=np.uint8, count=end - pos, offset=pos)
+          cut = _lastline(window)
+        else:
+          window = bytes(data[pos:end])
+          cut = window.rfind(b'\n') + 1
+        if cut or end >= size:
+          break
+        end = min(pos + ( end - pos ) * 2, size)
+      if end < size:
+        window = window[:cut]
+      pos += len(window)
+      if bulk:
+        chunk = _parseWindow(window, column, ord(sep), errors)
+      else:
+        chunk = _parseLines(window, column, sep, errors)
+      # note: no reference to the (possibly memory-mapped) data may be
+      #       held while suspended, otherwise it cannot be closed.
+      del window
+      yield chunk
+
+#------------------------------------------------------------------------------
+def _lastline(window):
+  # returns the offset just past the last newline in `window`, or zero
+  found = np.flatnonzero(window[::-1] == 10)
+  if not len(found):
+    return 0
+  return len(window) - found[0]
+
+#------------------------------------------------------------------------------
+def _fallback(field, errors):
+  try:
+    ret = epoch.parse(field.decode('ascii'))
+    if ret is None:
+      raise ValueError('missing timestamp')
+    return ret
+  except Exception:
+    if errors == 'raise':
+      raise
+    return float('nan')
+
+#------------------------------------------------------------------------------
+def _parseLines(window, column, sep, errors):
+  ret = array('d')
+  pos = 0
+  size = len(window)
+  while pos < size:
+    end = window.find(b'\n', pos)
+    if end < 0:
+      end = size
+    stop = end
+    if stop > pos and window[stop - 1:stop] == b'\r':
+      stop -= 1
+    start = pos
+    for idx in range(column):
+      start = window.find(sep, start, stop)
+      if start < 0:
+        start = stop
+        break
+      start += 1
+    fend = window.find(sep, start, stop)
+    if fend < 0:
+      fend = stop
+    field = window[start:fend]
+    ts = epoch._parseZuluFast(field.decode('ascii', 'replace')) \
+      if len(field) in (20, 24) else None
+    ret.append(ts if ts is not None else _fallback(field, errors))
+    pos = end + 1
+  return ret
+
+#------------------------------------------------------------------------------
+def _parseWindow(window, column, sep, errors):
+  size = len(window)
+  ends = np.flatnonzero(window == 10)
+  if not len(ends) or ends[-1] != size - 1:
+    ends = np.append(ends, size)
+  starts = np.empty_like(ends)
+  starts[0] = 0
+  starts[1:] = ends[:-1] + 1
+  # strip trailing '\r'
+  ends = ends - ( ( ends > starts ) & ( window[np.maximum(ends - 1, 0)] == 13 ) )
+  seps = np.append(np.flatnonzero(window == sep), size)
+  idx = np.searchsorted(seps, starts)
+  fstarts = starts
+  if column:
+    idx = np.minimum(idx + column - 1, len(seps) - 1)
+    fstarts = np.minimum(seps[idx] + 1, ends)
+    # lines with fewer than `column` separators have no such field
+    fstarts = np.where(seps[idx] < ends, fstarts, ends)
+    idx = np.minimum(idx + 1, len(seps) - 1)
+  fends = np.minimum(seps[idx], ends)
+  lengths = fends - fstarts
+  offsets = np.arange(24)
+  codes = window[np.minimum(fstarts[:, None] + offsets, size - 1)]
+  codes = np.where(offsets < lengths[:, None], codes, 0)
+  ret, ok = vec._parseZulu(codes)
+  ok &= lengths <= 24
+  for line in np.flatnonzero(~ok):
+    ret[line] = _fallback(window[fstarts[line]:fends[line]].tobytes(), errors)
+  return ret
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -21,6 +21,8 @@
 
 import unittest
 import time
+import random
+from datetime import datetime
 
 import pytz
 
@@ -44,6 +46,37 @@ class TestEpoch(unittest.TestCase):
     self.assertEqual(len(epoch.zulu()), 24)
     self.assertEqual(len(epoch.zulu(ms=False)), 20)
 
+  #----------------------------------------------------------------------------
+  def test_zulu_prefix(self):
+    import epoch
+    # consecutive calls within the same second and day, then across them
+    self.assertEqual(epoch.zulu(1446303600.4), '2015-10-31T15:00:00.400Z')
+    self.assertEqual(epoch.zulu(1446303600.9996), '2015-10-31T15:00:00.000Z')
+    self.assertEqual(epoch.zulu(1446303601), '2015-10-31T15:00:01.000Z')
+    self.assertEqual(epoch.zulu(1446335999.5), '2015-10-31T23:59:59.500Z')
+    self.assertEqual(epoch.zulu(1446336000.5), '2015-11-01T00:00:00.500Z')
+    self.assertEqual(epoch.zulu(-0.5), '1969-12-31T23:59:59.500Z')
+    self.assertEqual(epoch.zulu(0, ms=False), '1970-01-01T00:00:00Z')
+
+  #----------------------------------------------------------------------------
+  def test_zulu_many(self):
+    import epoch
+    values = [1446303600.4, 1446303600.5, 1446303601, 1446336000.25]
+    expect = [
+      '2015-10-31T15:00:00.400Z', '2015-10-31T15:00:00.500Z',
+      '2015-10-31T15:00:01.000Z', '2015-11-01T00:00:00.250Z']
+    self.assertEqual(epoch.zulu_many(values), expect)
+    self.assertEqual(epoch.zulu_many(iter(values)), expect)
+    self.assertEqual(
+      epoch.zulu_many(values, ms=False), [val[:19] + 'Z' for val in expect])
+    buf = bytearray(100)
+    self.assertEqual(epoch.zulu_many(values, out=buf), 96)
+    self.assertEqual(bytes(buf[:96]), ''.join(expect).encode('ascii'))
+    self.assertEqual(bytes(buf[96:]), b'\0' * 4)
+    self.assertEqual(epoch.zulu_many(values, ms=False, out=buf), 80)
+    self.assertEqual(
+      bytes(buf[:80]), ''.join(val[:19] + 'Z' for val in expect).encode('ascii'))
+
   #----------------------------------------------------------------------------
   def test_parseZulu(self):
     from epoch import parseZulu as p
@@ -66,6 +99,48 @@ class TestEpoch(unittest.TestCase):
     # sub-microsecond accuracy not possible (with current `datetime` sys library)
     self.assertEqual(p('20151031T150000.000000600Z'), 1446303600)
 
+  #----------------------------------------------------------------------------
+  def test_parseZulu_canonical(self):
+    import epoch
+    from epoch import parseZulu as p
+    rnd = random.Random(5)
+    for idx in range(2000):
+      ts = round(rnd.uniform(-30000000000, 250000000000), 3)
+      for ms in (True, False):
+        text = epoch.zulu(ts, ms=ms)
+        self.assertEqual(p(text), epoch.dt2ts(pytz.UTC.localize(
+          datetime.strptime(text, '%Y-%m-%dT%H:%M:%S' + ('.%fZ' if ms else 'Z')))))
+    self.assertEqual(p('2016-02-29T23:59:59.999Z'), 1456790399.999)
+    for text in ('2015-02-29T00:00:00Z', '2015-13-01T00:00:00.000Z',
+                 '2015-10-31T24:00:00Z', '0000-10-31T12:00:00Z'):
+      with self.assertRaises(ValueError):
+        p(text)
+    for text in ('2015-10-31 15:00:00Z', '2015-10-31T15:00:00+0000',
+                 '2015-10-31T15:00:00.000', '2015-1O-31T15:00:00Z'):
+      with self.assertRaises(SyntaxError):
+        p(text)
+
+  #----------------------------------------------------------------------------
+  def test_parse_many(self):
+    import epoch
+    from array import array
+    values = ['2015-10-31T15:00:00.600Z', b'2015-10-31T15:00:00Z', None,
+              '20151031T150000.0006Z', 1446303600, '1446303600.7']
+    result = epoch.parse_many(values)
+    self.assertIsInstance(result, array)
+    self.assertEqual(result.typecode, 'd')
+    self.assertEqual(
+      [val if val == val else None for val in result],
+      [1446303600.6, 1446303600, None, 1446303600.0006, 1446303600, 1446303600.7])
+    self.assertEqual(len(epoch.parse_many(iter([]))), 0)
+    # numeric strings are timestamps, not compact dates, as for `parse`
+    values = ['20151031', '2015-10-31T15:00:00+01:00', '20151031', '-5e3']
+    self.assertEqual(
+      list(epoch.parse_many(values)), [epoch.parse(val) for val in values])
+    self.assertEqual(epoch.parse_many(['20151031'])[0], 20151031.0)
+    with self.assertRaises(SyntaxError):
+      epoch.parse_many(['2015-10-31T15:00:00Z', 'nope'])
+
   #----------------------------------------------------------------------------
   def test_parse(self):
     from epoch import parse as p
@@ -274,6 +349,117 @@ class TestEpoch(unittest.TestCase):
     self.assertEqual(ts, 1449563433)
 
 
+  #----------------------------------------------------------------------------
+  def test_cache(self):
+    import epoch
+    rnd = random.Random(3)
+    # timestamps clustered around the 2015/11/01 US/ET DST transition
+    values = [1446350400 + rnd.randint(-3, 3) * 43200 + rnd.randint(0, 7200)
+              for idx in range(200)]
+    calls = [
+      (epoch.sod, dict()),
+      (epoch.sod, dict(offset=1, replace=dict(hour=15))),
+      (epoch.sod, dict(boundary=dict(hour=4))),
+      (epoch.sod, dict(boundary=dict(hour=16, minute=30), offset=-1)),
+      (epoch.sod, dict(boundary=dict(minute=30))),
+      (epoch.sow, dict(day=6, offset=2)),
+      (epoch.som, dict(offset=-1)),
+      (epoch.soy, dict(replace=dict(month=6))),
+    ]
+    try:
+      epoch.setCacheSize(0)
+      expect = [[func(ts, tz=tz, **kw) for ts in values]
+                for tz in ('UTC', 'America/New_York') for func, kw in calls]
+      self.assertEqual(epoch.getCacheStats()['size'], 0)
+      epoch.setCacheSize(64)
+      epoch.clearCache()
+      for attempt in range(2):
+        self.assertEqual(
+          [[func(ts, tz=tz, **kw) for ts in values]
+           for tz in ('UTC', 'America/New_York') for func, kw in calls],
+          expect)
+      stats = epoch.getCacheStats()
+      self.assertEqual(stats['maxsize'], 64)
+      self.assertLessEqual(stats['size'], 64)
+      self.assertGreater(stats['hits'], stats['misses'])
+      epoch.setCacheSize(4)
+      stats = epoch.getCacheStats()
+      self.assertEqual(stats['size'], 4)
+      self.assertGreater(stats['evictions'], 0)
+      epoch.clearCache()
+      self.assertEqual(
+        epoch.getCacheStats(),
+        dict(hits=0, misses=0, evictions=0, size=0, maxsize=4))
+    finally:
+      epoch.setCacheSize(1024)
+      epoch.clearCache()
+
+  #----------------------------------------------------------------------------
+  def test_cache_transitions(self):
+    import epoch
+    # zones whose local midnight is (or was) skipped or repeated, where
+    # a period can start after the timestamps that belong to it
+    zones = ('Atlantic/Azores', 'America/Havana', 'America/Managua',
+             'Africa/Tunis', 'America/Mexico_City', 'America/Sao_Paulo',
+             'America/New_York', 'Australia/Lord_Howe', 'Asia/Tehran')
+    calls = [
+      (epoch._sod, epoch.sod, dict()),
+      (epoch._sod, epoch.sod, dict(boundary=dict(hour=4))),
+      (epoch._sow, epoch.sow, dict(day=6)),
+      (epoch._som, epoch.som, dict()),
+      (epoch._soy, epoch.soy, dict()),
+    ]
+    lo, hi = epoch.parse('1970-01-01T00:00:00Z'), epoch.parse('2038-01-01T00:00:00Z')
+    try:
+      for name in zones:
+        tz = epoch.getTz(name)
+        epoch.clearCache()
+        for trans in epoch.getTzIndex(tz).times:
+          if not lo <= trans < hi:
+            continue
+          # note: in increasing order, so that earlier calls populate
+          #       the cache for the later ones
+          for step in (-86400, -21600, -7200, -3600, -1800, -1, 0, 1, 1800,
+                       3600, 5400, 7200, 21600, 86400):
+            ts = trans + step + 0.25
+            for private, public, kw in calls:
+              self.assertEqual(
+                public(ts, tz=tz, **kw), private(ts, tz, **kw),
+                (name, epoch.zulu(ts), public.__name__, kw))
+    finally:
+      epoch.clearCache()
+
+  #----------------------------------------------------------------------------
+  def test_iter(self):
+    import epoch
+    start, end = epoch.parse('1999-12-15T12:00:00Z'), epoch.parse('2017-02-01T00:00:00Z')
+    calls = [
+      (epoch.iter_sod, epoch.sod, dict()),
+      (epoch.iter_sod, epoch.sod, dict(step=3)),
+      (epoch.iter_sow, epoch.sow, dict(day=6)),
+      (epoch.iter_som, epoch.som, dict(step=5)),
+      (epoch.iter_soy, epoch.soy, dict()),
+    ]
+    for tz in ('UTC', 'America/Sao_Paulo', 'Australia/Lord_Howe', 'Asia/Tehran'):
+      for ifunc, func, kw in calls:
+        kw = dict(kw)
+        step = kw.pop('step', 1)
+        expect = []
+        ts = func(start, tz=tz, **kw)
+        while ts < end:
+          expect.append(ts)
+          ts = func(ts, tz=tz, offset=step, **kw)
+        self.assertEqual(list(ifunc(start, end, tz, step=step, **kw)), expect)
+    self.assertEqual(
+      [epoch.zulu(ts) for ts in epoch.iter_som(1446303600, 1454284800, 'America/New_York')],
+      ['2015-10-01T04:00:00.000Z', '2015-11-01T04:00:00.000Z',
+       '2015-12-01T05:00:00.000Z', '2016-01-01T05:00:00.000Z'])
+    days = epoch.iter_sod(0)
+    self.assertEqual([next(days) for idx in range(3)], [0, 86400, 172800])
+    with self.assertRaises(ValueError):
+      list(epoch.iter_sod(start, end, step=0))
+
+
 #------------------------------------------------------------------------------
 # end of $Id$
 # $ChangeLog$
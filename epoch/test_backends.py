@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+from datetime import datetime
+
+try:
+  import zoneinfo
+except ImportError:
+  zoneinfo = None
+
+#------------------------------------------------------------------------------
+
+# note: pytz bundles its own copy of the timezone database, which can
+#       differ from the system's for some zones, as does the handling of
+#       LMT offsets and of times beyond 2037, so the comparison is
+#       limited to zones and times where the data agrees.
+ZONES = ('UTC', 'America/New_York', 'America/Anchorage', 'Europe/Warsaw',
+         'Australia/Lord_Howe', 'America/Sao_Paulo', 'Pacific/Apia')
+
+#------------------------------------------------------------------------------
+def sample(tz, count=120, seed=17):
+  # returns timestamps between 1970 and 2037, every other one within a
+  # day of one of `tz`'s DST transitions.
+  import epoch, pytz
+  rnd = random.Random(seed)
+  trans = [ts for ts in epoch.getTzIndex(pytz.timezone(tz)).times
+           if 86400 < ts < 2140000000] or [1000000000]
+  ret = []
+  for idx in range(count):
+    if idx % 2:
+      ts = rnd.uniform(0, 2140000000)
+    else:
+      ts = rnd.choice(trans) + rnd.uniform(-86400, 86400)
+    ret.append(round(ts, 6))
+  return ret
+
+#------------------------------------------------------------------------------
+def evaluate(tz):
+  import epoch
+  rnd = random.Random(5)
+  ret = []
+  for ts in sample(tz):
+    origin = rnd.uniform(0, 2100000000)
+    row = [
+      epoch.ts2dt(ts, tz).replace(tzinfo=None),
+      epoch.tsreplace(ts, tz, hour=2, minute=30),
+      epoch.tsreplace(ts, tz, hour=1, minute=30),
+      epoch.sod(ts, tz, boundary=dict(hour=2, minute=30)),
+      epoch.sod(ts, tz, replace=dict(hour=2, minute=30)),
+      epoch.sow(ts, tz, day=6),
+      epoch.ts2age(ts, origin, tz),
+      epoch.formatter('%Y-%m-%dT%H:%M:%S.%f%z %Z', tz)(ts),
+    ]
+    for func in (epoch.sod, epoch.sow, epoch.som, epoch.soy):
+      for offset in (None, 1, -1):
+        row.append(func(ts, tz, offset=offset))
+    try:
+      row.append(epoch.age2ts(rnd.uniform(-30, 30), origin, tz))
+    except ValueError as err:
+      row.append(str(err))
+    ret.append(row)
+  ret.append(list(epoch.iter_sod(sample(tz)[0], sample(tz)[0] + 86400 * 400, tz)))
+  return ret
+
+#------------------------------------------------------------------------------
+@unittest.skipIf(zoneinfo is None, 'zoneinfo is not available')
+class TestBackends(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def tearDown(self):
+    import epoch
+    epoch.setBackend(epoch.DEFAULT_BACKEND)
+
+  #----------------------------------------------------------------------------
+  def test_setBackend(self):
+    import epoch, pytz
+    self.assertEqual(epoch.getBackend(), 'pytz')
+    self.assertIs(epoch.getTz('Europe/Paris'), pytz.timezone('Europe/Paris'))
+    epoch.setBackend('zoneinfo')
+    self.assertEqual(epoch.getBackend(), 'zoneinfo')
+    self.assertIsInstance(epoch.getTz('Europe/Paris'), zoneinfo.ZoneInfo)
+    self.assertEqual(epoch.getTz().utcoffset(None).total_seconds(), 0)
+    self.assertIsNone(epoch.getTzIndex('Europe/Paris'))
+    with self.assertRaises(KeyError):
+      epoch.getTz('No/Such_Zone')
+    with self.assertRaises(ValueError):
+      epoch.setBackend('dateutil')
+    self.assertEqual(epoch.getBackend(), 'zoneinfo')
+
+  #----------------------------------------------------------------------------
+  def test_localizeFold(self):
+    import epoch
+    tz = zoneinfo.ZoneInfo('America/New_York')
+    # ambiguous: resolves to the later (EST) occurrence
+    dt = epoch.dtreplace(epoch.ts2dt(1446350400, tz), hour=1, minute=30)
+    self.assertEqual(dt.utcoffset().total_seconds(), -18000)
+    # non-existent: uses the offset from before the gap
+    dt = epoch.dtreplace(dt, year=2016, month=3, day=13, hour=2)
+    self.assertEqual(epoch.dt2ts(dt), epoch.parse('2016-03-13T07:30:00Z'))
+    with self.assertRaises(TypeError):
+      epoch.tzcorrect(datetime(2016, 3, 13, 2, 30))
+
+  #----------------------------------------------------------------------------
+  def test_identical(self):
+    import epoch
+    for tz in ZONES:
+      epoch.setBackend('pytz')
+      expect = evaluate(tz)
+      epoch.setBackend('zoneinfo')
+      self.assertEqual(evaluate(tz), expect, tz)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
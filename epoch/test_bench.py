@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import json
+import os
+import tempfile
+
+try:
+  import zoneinfo
+except ImportError:
+  zoneinfo = None
+
+#------------------------------------------------------------------------------
+class TestBench(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_samples(self):
+    import epoch, epoch.bench
+    trans = [ts for ts in epoch.getTzIndex('Europe/Paris').times
+             if epoch.bench._RANGE[0] <= ts < epoch.bench._RANGE[1]]
+    near = epoch.bench.samples('Europe/Paris', True, count=50)
+    far = epoch.bench.samples('Europe/Paris', False, count=50)
+    self.assertEqual(near, epoch.bench.samples('Europe/Paris', True, count=50))
+    self.assertTrue(all(min(abs(ts - pt) for pt in trans) <= 7200 for ts in near))
+    self.assertTrue(all(min(abs(ts - pt) for pt in trans) >= 14 * 86400 for ts in far))
+    self.assertEqual(len(epoch.bench.samples('UTC', True, count=10)), 10)
+
+  #----------------------------------------------------------------------------
+  @unittest.skipIf(zoneinfo is None, 'zoneinfo is not available')
+  def test_samples_noindex(self):
+    import epoch, epoch.bench
+    # note: zoneinfo timezones have no transition index
+    tz = zoneinfo.ZoneInfo('Europe/Paris')
+    self.assertIsNone(epoch.getTzIndex(tz))
+    for near in (True, False):
+      values = epoch.bench.samples(tz, near, count=10)
+      self.assertEqual(len(values), 10)
+      self.assertTrue(all(
+        epoch.bench._RANGE[0] <= ts <= epoch.bench._RANGE[1] for ts in values))
+
+  #----------------------------------------------------------------------------
+  def test_compare(self):
+    import epoch.bench
+    self.assertEqual(
+      epoch.bench.compare(dict(a=1.0, b=1.3, c=2.0), dict(a=1.0, b=1.0, d=1.0), 0.2),
+      [('b', 1.0, 1.3, 1.3)])
+    self.assertEqual(epoch.bench.compare(dict(b=1.3), dict(b=1.0), 0.5), [])
+
+  #----------------------------------------------------------------------------
+  def test_cases(self):
+    import epoch.bench
+    for near in (False, True):
+      cases = dict(epoch.bench.cases('Europe/Paris', near))
+      names = ['ts2dt', 'dt2ts', 'dtreplace', 'tzcorrect', 'parse.iso',
+               'iso.parse', 'iso.Parser', 'ns.sod', 'us.sod', 'formatter.iso8601',
+               'cron.next', 'Timestamp', 'Timestamp.sod', 'Calendar.sod'] \
+        + ([] if near else ['getTz'])
+      for name in names:
+        func, count = cases[name]()
+        func()
+        self.assertEqual(count, epoch.bench.SAMPLES)
+    cases = dict(epoch.bench.cases('UTC', False))
+    for name in ('ns.zulu', 'ns.parse', 'stream.scan'):
+      func, count = cases[name]()
+      func()
+    if epoch.bench.vec is not None:
+      for name in ('vec.fields', 'vec.formatter', 'columns.sod', 'columns.tots'):
+        func, count = cases[name]()
+        func()
+
+  #----------------------------------------------------------------------------
+  def test_main(self):
+    import epoch.bench
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+      args = ['-q', '-r', '1', '-z', 'UTC', '-k', 'zulu[[]*', '-o', path]
+      self.assertEqual(epoch.bench.main(args), 0)
+      with open(path) as fp:
+        data = json.load(fp)
+      self.assertEqual(list(data['results']), ['zulu[UTC,far]'])
+      self.assertIn('python', data['environment'])
+      data['results']['zulu[UTC,far]'] /= 1000.0
+      with open(path, 'w') as fp:
+        json.dump(data, fp)
+      self.assertEqual(epoch.bench.main(args[:-2] + ['-c', path]), 1)
+    finally:
+      os.unlink(path)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
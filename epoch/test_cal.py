@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import pickle
+import random
+
+#------------------------------------------------------------------------------
+
+ZONES = ('UTC', 'America/New_York', 'Europe/Paris', 'Australia/Lord_Howe',
+         'America/Sao_Paulo', 'Etc/GMT+5')
+
+#------------------------------------------------------------------------------
+def sample(count=80, seed=17):
+  # note: every other sample is within a few hours of midnight UTC
+  rnd = random.Random(seed)
+  ret = []
+  for idx in range(count):
+    ts = rnd.randint(-2000000000, 2200000000)
+    if idx % 2:
+      ts = ts - ( ts % 86400 ) + rnd.randint(-6 * 3600, 6 * 3600)
+    ret.append(ts + rnd.randint(0, 999999) / 1000000.0)
+  return ret
+
+#------------------------------------------------------------------------------
+def outcome(func, *args, **kw):
+  try:
+    return func(*args, **kw)
+  except Exception as err:
+    return type(err)
+
+#------------------------------------------------------------------------------
+class TestCalendar(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_periods(self):
+    import epoch
+    values = sample()
+    for tz in ZONES:
+      for boundary in (None, dict(hour=4), dict(hour=2, minute=30), dict(hour=16)):
+        cal = epoch.Calendar(tz, boundary=boundary)
+        for kw in (dict(), dict(offset=-1), dict(offset=2, replace=dict(hour=2, minute=30)),
+                   dict(replace=dict(hour=24))):
+          for ts in values:
+            self.assertEqual(
+              outcome(cal.sod, ts, **kw),
+              outcome(epoch.sod, ts, tz=tz, boundary=boundary, **kw),
+              (tz, boundary, ts, kw))
+      for week_start in (0, 3, 6):
+        cal = epoch.Calendar(tz, week_start=week_start)
+        for kw in (dict(), dict(offset=-3), dict(replace=dict(hour=1))):
+          for ts in values:
+            self.assertEqual(
+              outcome(cal.sow, ts, **kw),
+              outcome(epoch.sow, ts, tz=tz, day=week_start, **kw))
+      cal = epoch.Calendar(tz)
+      for ts in values:
+        for kw in (dict(), dict(offset=-14), dict(offset=1, replace=dict(day=31))):
+          self.assertEqual(outcome(cal.som, ts, **kw), outcome(epoch.som, ts, tz=tz, **kw))
+          self.assertEqual(outcome(cal.soy, ts, **kw), outcome(epoch.soy, ts, tz=tz, **kw))
+        for kw in (dict(hour=2, minute=30), dict(month=2, day=30), dict(day=1)):
+          self.assertEqual(
+            outcome(cal.tsreplace, ts, **kw), outcome(epoch.tsreplace, ts, tz, **kw))
+        self.assertEqual(cal.ts2dt(ts), epoch.ts2dt(ts, tz))
+        self.assertEqual(cal.timestamp(ts).hour, epoch.ts2dt(ts, tz).hour)
+
+  #----------------------------------------------------------------------------
+  def test_config(self):
+    import epoch
+    cal = epoch.Calendar('Europe/Paris', boundary=dict(hour=4, minute=30), week_start=6)
+    self.assertIs(cal.tz, epoch.getTz('Europe/Paris'))
+    self.assertEqual(cal.sod(1446255000), epoch.parse('2015-10-29T23:00:00Z'))
+    self.assertEqual(cal.sow(1446303600), epoch.parse('2015-10-24T22:00:00Z'))
+    copy = pickle.loads(pickle.dumps(cal))
+    self.assertEqual(
+      (copy.zone, copy.boundary, copy.week_start), ('Europe/Paris', dict(hour=4, minute=30), 6))
+    self.assertEqual(copy.sod(1446255000), cal.sod(1446255000))
+    self.assertLess(len(pickle.dumps(cal)), 200)
+    for kw in (dict(week_start=7), dict(boundary=dict(day=2)),
+               dict(boundary=dict(minute=30)), dict(boundary=dict(hour=24))):
+      with self.assertRaises(ValueError):
+        epoch.Calendar('UTC', **kw)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import time
+
+#------------------------------------------------------------------------------
+class TestClock(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def tearDown(self):
+    import epoch
+    epoch.setClock(None)
+
+  #----------------------------------------------------------------------------
+  def test_frozen(self):
+    import epoch, epoch.ns
+    clock = epoch.setClock('frozen', 1446303600.25)
+    self.assertIs(epoch.getClock(), clock)
+    self.assertEqual(epoch.now(), 1446303600.25)
+    self.assertEqual(epoch.zulu(), '2015-10-31T15:00:00.250Z')
+    self.assertEqual(epoch.sod(tz='America/New_York'), 1446264000)
+    self.assertEqual(epoch.som(), 1443657600)
+    self.assertEqual(epoch.tsreplace(hour=0), 1446249600.25)
+    self.assertEqual(epoch.ns.now(), 1446303600250000000)
+    self.assertEqual(epoch.now_us(), 1446303600250000)
+    clock.advance(86400)
+    self.assertEqual(epoch.zulu(), '2015-11-01T15:00:00.250Z')
+    clock.set(0)
+    self.assertEqual(epoch.ts2age(epoch.parse('1971-01-01T00:00:00Z')), 1.0)
+
+  #----------------------------------------------------------------------------
+  def test_sources(self):
+    import epoch, epoch.clock
+    for name, kw in (('precise', {}), ('monotonic', dict(refresh=0.01)),
+                     ('coarse', dict(resolution=0.005))):
+      clock = epoch.setClock(name, **kw)
+      self.assertEqual(clock.name, name)
+      for attempt in range(3):
+        self.assertAlmostEqual(epoch.now(), time.time(), delta=0.05)
+        self.assertAlmostEqual(epoch.now_ns() / 1e9, time.time(), delta=0.05)
+        time.sleep(0.02)
+    clock = epoch.setClock(epoch.clock.MonotonicClock())
+    values = [epoch.now() for idx in range(1000)]
+    self.assertEqual(values, sorted(values))
+    with self.assertRaises(ValueError):
+      epoch.setClock('sundial')
+    self.assertIs(epoch.getClock(), clock)
+    epoch.setClock(None)
+    self.assertEqual(epoch.getClock().name, 'precise')
+
+  #----------------------------------------------------------------------------
+  def test_coarse(self):
+    import epoch, epoch.clock
+    clock = epoch.clock.CoarseClock(resolution=0.01)
+    first = clock.time()
+    time.sleep(0.05)
+    # not started: never refreshed
+    self.assertEqual(clock.time(), first)
+    epoch.setClock(clock)
+    self.assertIsNotNone(clock._thread)
+    time.sleep(0.05)
+    self.assertGreater(epoch.now(), first)
+    self.assertAlmostEqual(clock.time_ns() / 1e9, clock.time(), delta=1e-6)
+    epoch.setClock(None)
+    self.assertIsNone(clock._thread)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
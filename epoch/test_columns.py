@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+
+import unittest
+import random
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+try:
+  import pyarrow as pa
+except ImportError:
+  pa = None
+
+#------------------------------------------------------------------------------
+def sample(count=300, seed=11):
+  # nanosecond timestamps in 1950..2030 (i.e. well within the range of
+  # ``datetime64[ns]``)
+  rnd = random.Random(seed)
+  return [rnd.randint(-631152000, 1893456000) * 1000000000
+          + rnd.randint(0, 999999999) for idx in range(count)]
+
+#------------------------------------------------------------------------------
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestColumns(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_view(self):
+    import epoch.columns
+    values = np.array(sample(), dtype=np.int64)
+    column = values.view('datetime64[ns]')
+    view, unit, tz, valid = epoch.columns.view(column)
+    self.assertTrue(np.shares_memory(view, values))
+    self.assertEqual((unit, tz, valid), ('ns', None, None))
+    self.assertIs(epoch.columns.to_datetime64(column), column)
+    self.assertEqual(
+      epoch.columns.to_datetime64(column, 'us').tolist(),
+      column.astype('datetime64[us]').tolist())
+    days = np.array(['2015-10-31', 'NaT'], dtype='datetime64[D]')
+    view, unit, tz, valid = epoch.columns.view(days)
+    self.assertEqual((view[0], unit, valid.tolist()), (1446249600, 's', [True, False]))
+    with self.assertRaises(TypeError):
+      epoch.columns.view(values)
+    with self.assertRaises(ValueError):
+      epoch.columns.to_datetime64(column, 'ps')
+
+  #----------------------------------------------------------------------------
+  def test_tots(self):
+    import epoch.columns, epoch.ns
+    values = sample()
+    column = np.array(values + [np.iinfo(np.int64).min], dtype=np.int64).view('M8[ns]')
+    result = epoch.columns.tots(column)
+    self.assertEqual(result[:-1].tolist(), [epoch.ns.tots(val) for val in values])
+    self.assertTrue(np.isnan(result[-1]))
+    ts = [epoch.ns.tots(val) for val in values[:20]]
+    self.assertEqual(
+      epoch.columns.fromts(ts, 'us').view(np.int64).tolist(),
+      [int(round(val * 1000000)) for val in ts])
+    self.assertTrue(np.isnat(epoch.columns.fromts([np.nan], 's')[0]))
+
+  #----------------------------------------------------------------------------
+  def test_periods(self):
+    import epoch.columns, epoch.ns
+    values = sample()
+    column = np.array(values + [np.iinfo(np.int64).min], dtype=np.int64).view('M8[ns]')
+    for tz in ('UTC', 'America/New_York', 'Australia/Lord_Howe'):
+      for name, kw in (
+          ('sod', dict()), ('sod', dict(boundary=dict(hour=4), offset=1)),
+          ('sow', dict(day=6)), ('som', dict(replace=dict(day=15, microsecond=7))),
+          ('soy', dict(offset=-1))):
+        result = getattr(epoch.columns, name)(column, tz=tz, **kw)
+        self.assertEqual(result.dtype, column.dtype)
+        self.assertEqual(
+          result[:-1].view(np.int64).tolist(),
+          [getattr(epoch.ns, name)(val, tz=tz, **kw) for val in values])
+        self.assertTrue(np.isnat(result[-1]))
+    # note: DST fall-backs that repeat local midnight, every 15 minutes
+    #       from 2024/10/26 to 2024/11/04 UTC.
+    values = list(range(1729900800000000000, 1730678400000000000, 900000000000))
+    column = np.array(values, dtype=np.int64).view('M8[ns]')
+    for tz in ('Atlantic/Azores', 'America/Havana'):
+      for name, kw in (('sod', dict()), ('sow', dict(day=6))):
+        self.assertEqual(
+          getattr(epoch.columns, name)(column, tz=tz, **kw).view(np.int64).tolist(),
+          [getattr(epoch.ns, name)(val, tz=tz, **kw) for val in values])
+    self.assertEqual(
+      epoch.columns.sod(column[96:100], tz='Atlantic/Azores').astype(str).tolist(),
+      ['2024-10-27T01:00:00.000000000'] * 4)
+    values = sample()
+    column = np.array(values, dtype=np.int64).view('M8[ns]').astype('M8[ms]')
+    self.assertEqual(
+      epoch.columns.sod(column, tz='Europe/Paris').view(np.int64).tolist(),
+      [epoch.ns.sod(val, tz='Europe/Paris') // 1000000 for val in values])
+
+  #----------------------------------------------------------------------------
+  def test_getTz(self):
+    import epoch, epoch.columns
+    from datetime import timedelta
+    self.assertIs(epoch.columns.getTz(None), epoch.getTz())
+    self.assertIs(epoch.columns.getTz('Europe/Paris'), epoch.getTz('Europe/Paris'))
+    self.assertEqual(
+      epoch.columns.getTz('-03:30').utcoffset(None), timedelta(hours=-3, minutes=-30))
+
+  #----------------------------------------------------------------------------
+  @unittest.skipIf(pa is None, 'pyarrow is not installed')
+  def test_arrow(self):
+    import epoch.columns, epoch.ns
+    values = sample()
+    array = pa.array(values + [None], type=pa.timestamp('ns', 'America/New_York'))
+    view, unit, tz, valid = epoch.columns.view(array)
+    self.assertEqual((unit, tz), ('ns', 'America/New_York'))
+    self.assertEqual(view[:-1].tolist(), values)
+    self.assertEqual(valid.tolist(), [True] * len(values) + [False])
+    # the timezone metadata is the default `tz`, and is preserved
+    result = epoch.columns.sod(array)
+    self.assertEqual(result.type, array.type)
+    self.assertEqual(
+      result.cast(pa.int64()).to_pylist(),
+      [epoch.ns.sod(val, tz='America/New_York') for val in values] + [None])
+    chunked = pa.chunked_array([array[:100], array[100:]])
+    self.assertEqual(epoch.columns.sod(chunked).combine_chunks(), result)
+    column = epoch.columns.to_datetime64(array[:-1])
+    self.assertTrue(np.shares_memory(column, view))
+    back = epoch.columns.to_arrow(column, tz='+05:00')
+    self.assertEqual(back.type, pa.timestamp('ns', '+05:00'))
+    self.assertEqual(back.cast(pa.int64()).to_pylist(), values)
+    self.assertEqual(
+      epoch.columns.to_arrow(array, 'us').cast(pa.int64()).to_pylist(),
+      [val // 1000 for val in values] + [None])
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
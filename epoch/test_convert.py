@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+#------------------------------------------------------------------------------
+class TestConvert(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def setUp(self):
+    self.tmpdir = tempfile.mkdtemp()
+
+  #----------------------------------------------------------------------------
+  def tearDown(self):
+    shutil.rmtree(self.tmpdir)
+
+  #----------------------------------------------------------------------------
+  def path(self, name, content=None):
+    ret = os.path.join(self.tmpdir, name)
+    if content is not None:
+      with open(ret, 'w', newline='') as fp:
+        fp.write(content)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def read(self, name):
+    with open(self.path(name), newline='') as fp:
+      return fp.read()
+
+  #----------------------------------------------------------------------------
+  def test_converter(self):
+    from epoch.convert import Converter, ConversionError
+    conv = Converter(columns=(0, 2), tz='Europe/Paris', output='local')
+    self.assertEqual(
+      conv('1446303600,x,2015-10-31T17:00:00+02:00\r\n2015-10-31T15:00:00.250Z,y,1446303600.5\n\n'),
+      '2015-10-31T16:00:00.000+01:00,x,2015-10-31T16:00:00.000+01:00\r\n'
+      '2015-10-31T16:00:00.250+01:00,y,2015-10-31T16:00:00.500+01:00\n\n')
+    self.assertEqual(conv('2015-10-31 16:00,x,2015-10-31'),
+                     '2015-10-31T16:00:00.000+01:00,x,2015-10-31T00:00:00.000+01:00')
+    conv = Converter(sep='\t', period='som', tz='Asia/Tokyo', output='zulu')
+    self.assertEqual(conv('1446303600\tx\n'), '2015-10-31T15:00:00.000Z\tx\n')
+    conv = Converter(period='sod', output='epoch')
+    self.assertEqual(conv.line('2015-10-31T15:00:00Z'), '1446249600.0')
+    conv = Converter(columns=(1,), output='%Y/%m/%d', errors='keep')
+    self.assertEqual(conv('a,1446303600\nb,bad\nc\n'), 'a,2015/10/31\nb,bad\nc\n')
+    with self.assertRaises(ConversionError):
+      Converter()('1446303600\nbad\n')
+    with self.assertRaises(ConversionError):
+      Converter(columns=(3,))('1446303600\n')
+    for kw in (dict(period='sodd'), dict(errors='ignore'), dict(sep='::')):
+      with self.assertRaises(ValueError):
+        Converter(**kw)
+
+  #----------------------------------------------------------------------------
+  def test_numeric(self):
+    import epoch
+    from epoch.convert import Converter
+    # numeric fields are timestamps regardless of the line order
+    for text in ('20151031\n1446303600\n', '1446303600\n20151031\n'):
+      self.assertEqual(
+        Converter()(text),
+        ''.join('%r\n' % (epoch.parse(val),) for val in text.split()))
+    output = subprocess.check_output(
+      [sys.executable, '-m', 'epoch'], input=b'20151031\n2015-10-31T15:00:00Z\n')
+    self.assertEqual(output, b'20151031.0\n1446303600.0\n')
+
+  #----------------------------------------------------------------------------
+  def test_main(self):
+    import epoch
+    from epoch import convert
+    lines = ['ts,value\n'] + [
+      '%s,%d\n' % (epoch.zulu(1446303600 + idx * 7301.3), idx) for idx in range(3000)]
+    src = self.path('src.csv', ''.join(lines))
+    expect = lines[0] + ''.join(
+      '%s,%d\n' % (epoch.formatter('rfc3339', 'America/New_York')(
+        epoch.sod(1446303600 + idx * 7301.3, 'America/New_York')), idx)
+      for idx in range(3000))
+    args = ['-H', '-p', 'sod', '-z', 'America/New_York', '-f', 'rfc3339', src]
+    self.assertEqual(convert.main(args + ['-o', self.path('out1')]), 0)
+    self.assertEqual(self.read('out1'), expect)
+    self.assertEqual(
+      convert.main(args + ['-o', self.path('out2'), '-j', '2', '--chunk-size', '4096']), 0)
+    self.assertEqual(self.read('out2'), expect)
+    bad = self.path('bad.csv', '1446303600\nyesterday\n')
+    self.assertEqual(convert.main([bad, '-o', self.path('out3')]), 1)
+    self.assertEqual(convert.main([bad, '-e', 'keep', '-o', self.path('out3')]), 0)
+    self.assertEqual(self.read('out3'), '1446303600.0\nyesterday\n')
+
+  #----------------------------------------------------------------------------
+  def test_window(self):
+    from multiprocessing.pool import ThreadPool
+    from epoch import convert
+    consumed = []
+    def tasks():
+      for idx in range(100):
+        consumed.append(idx)
+        yield idx
+    pool = ThreadPool(2)
+    try:
+      results = convert._imap(pool, abs, tasks(), 4)
+      self.assertEqual(next(results), 0)
+      self.assertLessEqual(len(consumed), 5)
+      self.assertEqual(list(results), list(range(1, 100)))
+    finally:
+      pool.terminate()
+      pool.join()
+
+  #----------------------------------------------------------------------------
+  def test_delimiter(self):
+    from epoch import convert
+    src = self.path('src.txt', u'a\u00a61446303600\nb\u00a61446303601.5\n')
+    for sep in (u'\u00a6', '\\u00a6'):
+      self.assertEqual(
+        convert.main([src, '-d', sep, '-c', '1', '-f', 'zulu', '-o', self.path('out')]), 0)
+      self.assertEqual(
+        self.read('out'),
+        u'a\u00a62015-10-31T15:00:00.000Z\nb\u00a62015-10-31T15:00:01.500Z\n')
+    src = self.path('src.txt', u'a\u20ac1446303600\n')
+    self.assertEqual(
+      convert.main([src, '-d', u'\u20ac', '-c', '1', '-f', 'zulu', '-o', self.path('out')]), 0)
+    self.assertEqual(self.read('out'), u'a\u20ac2015-10-31T15:00:00.000Z\n')
+
+  #----------------------------------------------------------------------------
+  def test_stdin(self):
+    output = subprocess.check_output(
+      [sys.executable, '-m', 'epoch', '-d', '\\t', '-c', '1', '-f', 'zulu', '-j', '2'],
+      input=b'a\t1446303600\nb\t1446303601.5\n')
+    self.assertEqual(output, b'a\t2015-10-31T15:00:00.000Z\nb\t2015-10-31T15:00:01.500Z\n')
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+
+#------------------------------------------------------------------------------
+
+EXPRS = ('* * * * *', '*/7 * * * *', '15,45 9-17 * * mon-fri', '0 0 1 * *',
+         '30 4 1,15 * 5', '0 12 * jan,jul sun', '5/20 */5 10-12 * *',
+         '0 0 29 2 *', '@weekly', '@hourly')
+
+#------------------------------------------------------------------------------
+def matcher(expr):
+  # returns a brute-force cron matcher of local "wall clock" seconds
+  import epoch
+  from epoch import crontab
+  fields = crontab.MACROS.get(expr, expr).split()
+  minutes, hours, mdays, months, wdays = [
+    set(crontab._parseField(field, spec)[0])
+    for field, spec in zip(fields, crontab._FIELDS)]
+  wdays = set(day % 7 for day in wdays)
+  either = fields[2] != '*' and fields[4] != '*'
+  def matches(local):
+    days, tod = divmod(local, 86400)
+    year, month, day = epoch._days2civil(days)
+    if either:
+      dayok = day in mdays or ( days + 4 ) % 7 in wdays
+    else:
+      dayok = day in mdays and ( days + 4 ) % 7 in wdays
+    return dayok and month in months \
+      and tod // 3600 in hours and tod // 60 % 60 in minutes
+  return matches
+
+#------------------------------------------------------------------------------
+class TestCrontab(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_bruteforce(self):
+    import epoch
+    # note: zones without DST in the tested range, where every local
+    #       minute exists exactly once
+    for tz, offset in (('UTC', 0), ('Asia/Kolkata', 19800), ('Asia/Tokyo', 32400)):
+      for expr in EXPRS:
+        cron = epoch.cron(expr, tz)
+        matches = matcher(expr)
+        start = 1454284800 - offset
+        expect = [start + minute * 60 for minute in range(0, 60 * 24 * 40)
+                  if matches(start + offset + minute * 60)]
+        result = list(cron.iter(start - 1, start + 60 * 24 * 40 * 60))
+        self.assertEqual(result, expect, (tz, expr))
+        for idx in range(1, len(expect), max(1, len(expect) // 100)):
+          self.assertEqual(cron.prev(expect[idx]), expect[idx - 1])
+          self.assertEqual(cron.next(expect[idx] - 0.5), expect[idx])
+          self.assertEqual(cron.prev(expect[idx] - 0.5), expect[idx - 1])
+
+  #----------------------------------------------------------------------------
+  def test_recur(self):
+    import epoch
+    from epoch.recur import Rule
+    rnd = random.Random(13)
+    for tz in ('America/New_York', 'Europe/Paris', 'Australia/Lord_Howe'):
+      for expr, rule in (
+          ('30 2 * * *', Rule('day', tz, at=dict(hour=2, minute=30))),
+          ('0 1 * * *', Rule('day', tz, at=dict(hour=1))),
+          ('45 9 * * 1', Rule('week', tz, at=dict(hour=9, minute=45))),
+          ('0 0 1 * *', Rule('month', tz))):
+        cron = epoch.cron(expr, tz)
+        for idx in range(100):
+          ts = rnd.randint(1420070400, 1483228800)
+          self.assertEqual(cron.next(ts), rule.next(ts), (tz, expr, ts))
+          fire = rule.next(ts)
+          self.assertEqual(cron.prev(fire + 1), fire)
+
+  #----------------------------------------------------------------------------
+  def test_dst(self):
+    import epoch
+    tz = 'America/New_York'
+    fmt = epoch.formatter('%H:%M %Z', tz)
+    cron = epoch.cron('*/20 1-3 * * *', tz)
+    self.assertEqual(
+      [fmt(ts) for ts in cron.iter(
+        epoch.parse('2016-03-13T04:00:00Z'), epoch.parse('2016-03-13T09:00:00Z'))],
+      ['01:00 EST', '01:20 EST', '01:40 EST', '03:00 EDT', '03:20 EDT', '03:40 EDT'])
+    self.assertEqual(
+      [fmt(ts) for ts in cron.iter(
+        epoch.parse('2015-11-01T05:30:00Z'), epoch.parse('2015-11-01T07:30:00Z'))],
+      ['01:00 EST', '01:20 EST', '01:40 EST', '02:00 EST', '02:20 EST'])
+    # note: the fall-back's repeated hour is not skipped
+    hourly = epoch.cron('0 * * * *', tz)
+    self.assertEqual(
+      hourly.next(epoch.parse('2015-11-01T05:45:00Z')), epoch.parse('2015-11-01T06:00:00Z'))
+    self.assertEqual(
+      hourly.next(epoch.parse('2015-11-01T06:00:00Z')), epoch.parse('2015-11-01T07:00:00Z'))
+    self.assertEqual(
+      cron.prev(epoch.parse('2016-03-13T07:00:00Z')), epoch.parse('2016-03-13T06:40:00Z'))
+    # note: DST gaps at non-hour boundaries (00:01 => 01:01 in
+    #       America/St_Johns, 02:00 => 02:30 in Australia/Lord_Howe): the
+    #       real local times after a gap-shifted fire are not skipped.
+    tz = 'America/St_Johns'
+    fmt = epoch.formatter('%H:%M %Z', tz)
+    self.assertEqual(
+      [fmt(ts) for ts in epoch.cron('*/7 1 * * *', tz).iter(
+        epoch.parse('2008-03-09T00:00:00Z'), epoch.parse('2008-03-10T00:00:00Z'))],
+      ['01:07 NDT', '01:14 NDT', '01:21 NDT', '01:28 NDT', '01:35 NDT',
+       '01:42 NDT', '01:49 NDT', '01:56 NDT', '02:00 NDT'])
+    tz = 'Australia/Lord_Howe'
+    fmt = epoch.formatter('%H:%M %Z', tz)
+    self.assertEqual(
+      [fmt(ts) for ts in epoch.cron('*/20 * * * *', tz).iter(
+        epoch.parse('2015-10-03T14:30:00Z'), epoch.parse('2015-10-03T16:30:00Z'))],
+      ['01:20 +1030', '01:40 +1030', '02:30 +11', '02:40 +11', '02:50 +11',
+       '03:00 +11', '03:20 +11'])
+
+  #----------------------------------------------------------------------------
+  def test_syntax(self):
+    import epoch
+    from epoch import crontab
+    cron = epoch.cron('0 9 * JAN-Mar 7')
+    self.assertEqual(cron.months, (1, 2, 3))
+    self.assertEqual(cron.wdays, (0,))
+    self.assertIs(epoch.cron('@daily', 'Europe/Paris'), epoch.cron('@daily', epoch.getTz('Europe/Paris')))
+    self.assertEqual(epoch.cron('0 0 29 2 *').next(epoch.parse('2097-01-01T00:00:00Z')),
+                     epoch.parse('2104-02-29T00:00:00Z'))
+    self.assertIsNone(epoch.cron('0 0 1 6 *').prev(-62135596800 + 86400 * 30))
+    self.assertIsNone(epoch.cron('0 0 1 6 *').next(253402300799 - 86400 * 30))
+    for expr in ('* * * *', '60 * * * *', '* 24 * * *', '* * 0 * *', '* * * 13 *',
+                 '* * * * 8', '5-1 * * * *', '*/0 * * * *', 'x * * * *', '0 0 30 2 *',
+                 '0 0 31 4,6 *'):
+      with self.assertRaises(ValueError, msg=expr):
+        crontab.Cron(expr)
+    self.assertEqual(
+      crontab.next_many(
+        [('@daily', 'Europe/Paris'), cron, ('@daily', 'Europe/Paris'), ('@hourly', None)],
+        1446303600),
+      [1446332400, epoch.parse('2016-01-03T09:00:00Z'), 1446332400, 1446307200])
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
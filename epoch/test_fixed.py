@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+from datetime import timedelta, timezone
+
+import pytz
+
+#------------------------------------------------------------------------------
+
+ZONES = ('UTC', pytz.FixedOffset(330), pytz.FixedOffset(-600),
+         timezone(timedelta(hours=5)), 'Etc/GMT+5', 'Etc/GMT-14')
+
+# year 1..9999, less a few days to stay clear of `datetime`'s limits
+LO                      = -62135596800 + 3 * 86400
+HI                      = 253402300799 - 3 * 86400
+
+#------------------------------------------------------------------------------
+def sample(seed=7):
+  # a coarse sweep of the whole range plus dense sweeps around the
+  # turn of a few (leap) years, all with random microseconds
+  rnd = random.Random(seed)
+  ret = list(range(LO, HI, 86400 * 2003 + 3607))
+  for year in (1, 1900, 1970, 2000, 2016, 9999):
+    base = ( year - 1970 ) * 31556952
+    ret += [base + step * 3600 * 7 for step in range(-120, 120)]
+  ret = [ts + rnd.randint(0, 999999) / 1000000.0 for ts in ret if LO <= ts <= HI]
+  return ret + [0, -0.5, 0.9999995, 86399.9999996, LO, HI]
+
+#------------------------------------------------------------------------------
+def outcome(func, *args, **kw):
+  try:
+    return func(*args, **kw)
+  except Exception as err:
+    return type(err)
+
+#------------------------------------------------------------------------------
+class TestFixed(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def assertSame(self, public, private, values, tz, **kw):
+    import epoch
+    tz = epoch.getTz(tz)
+    for ts in values:
+      self.assertEqual(
+        outcome(public, ts, tz=tz, **kw), outcome(private, ts, tz, **kw),
+        (public.__name__, ts, tz, kw))
+
+  #----------------------------------------------------------------------------
+  def test_fixedOffset(self):
+    import epoch
+    self.assertEqual(epoch._fixedOffset(epoch.getTz('UTC')), 0)
+    self.assertEqual(epoch._fixedOffset(pytz.FixedOffset(-90)), -5400)
+    self.assertEqual(epoch._fixedOffset(epoch.getTz('Etc/GMT+5')), -18000)
+    self.assertIsNone(epoch._fixedOffset(epoch.getTz('Europe/Paris')))
+    self.assertIsNone(epoch._fixedOffset(timezone(timedelta(microseconds=5))))
+
+  #----------------------------------------------------------------------------
+  def test_sod(self):
+    import epoch
+    values = sample()
+    for tz in ZONES:
+      for kw in (
+          dict(), dict(offset=1), dict(offset=-3), dict(offset=1.5),
+          dict(replace=dict(hour=15, minute=30)),
+          dict(replace=dict(day=31)), dict(replace=dict(hour=24)),
+          dict(replace=dict(month=2, day=29, microsecond=5)),
+          dict(boundary=dict(hour=4)),
+          dict(boundary=dict(hour=16, minute=30), offset=-1),
+          dict(boundary=dict(hour=4), replace=dict(hour=4))):
+        self.assertSame(epoch.sod, epoch._sod, values, tz, **kw)
+
+  #----------------------------------------------------------------------------
+  def test_sow(self):
+    import epoch
+    values = sample()
+    for tz in ZONES:
+      for kw in (
+          dict(), dict(day=6), dict(day=3, offset=2), dict(day=-1, offset=-1),
+          dict(day=9), dict(replace=dict(hour=9, second=59))):
+        self.assertSame(epoch.sow, epoch._sow, values, tz, **kw)
+
+  #----------------------------------------------------------------------------
+  def test_som(self):
+    import epoch
+    values = sample()
+    for tz in ZONES:
+      for kw in (
+          dict(), dict(offset=1), dict(offset=-13), dict(offset=28),
+          dict(replace=dict(day=15, hour=2)), dict(replace=dict(day=30))):
+        self.assertSame(epoch.som, epoch._som, values, tz, **kw)
+
+  #----------------------------------------------------------------------------
+  def test_soy(self):
+    import epoch
+    values = sample()
+    for tz in ZONES:
+      for kw in (
+          dict(), dict(offset=1), dict(offset=-4),
+          dict(replace=dict(month=2, day=29)), dict(replace=dict(year=0))):
+        self.assertSame(epoch.soy, epoch._soy, values, tz, **kw)
+
+  #----------------------------------------------------------------------------
+  def test_tsreplace(self):
+    import epoch
+    def slow(ts, tz, **kw):
+      return epoch.dt2ts(epoch.dtreplace(epoch.ts2dt(ts, tz=tz), **kw))
+    values = sample()
+    for tz in ZONES:
+      for kw in (
+          dict(), dict(hour=9, minute=30), dict(year=2016, month=2, day=29),
+          dict(microsecond=1000000), dict(minute=-1), dict(second=1.5),
+          dict(tzinfo=None)):
+        self.assertSame(epoch.tsreplace, slow, values, tz, **kw)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+#------------------------------------------------------------------------------
+
+ZONES = ('UTC', 'America/New_York', 'Europe/Paris', 'Australia/Lord_Howe',
+         'Asia/Kolkata', 'America/St_Johns')
+
+#------------------------------------------------------------------------------
+def sample(count=400, seed=11):
+  rnd = random.Random(seed)
+  ret = [0, -0.5, 1.9999996, -1e-7, 951782400, 1446303600.0000005]
+  for idx in range(count):
+    ret.append(rnd.randint(-1000000000, 4000000000) + rnd.randint(0, 999999) / 1000000.0)
+  return ret
+
+#------------------------------------------------------------------------------
+def strftime(dt, pattern):
+  # `datetime.strftime` with the locale-dependent and non-standard
+  # directives of `epoch.formatter` replaced
+  offset = dt.strftime('%z')
+  pattern = pattern \
+    .replace('%a', dt.strftime('%A')[:3]) \
+    .replace('%b', ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug',
+                    'Sep', 'Oct', 'Nov', 'Dec')[dt.month - 1]) \
+    .replace('%L', '%03d' % (dt.microsecond // 1000,)) \
+    .replace('%:z', offset[:3] + ':' + offset[3:])
+  return dt.strftime(pattern)
+
+#------------------------------------------------------------------------------
+class TestFmt(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_formatter(self):
+    import epoch
+    values = sample()
+    for tz in ZONES:
+      for pattern in (
+          '%Y-%m-%dT%H:%M:%S.%f%z', '%a, %d %b %Y %H:%M:%S.%L %Z',
+          '%j %A %B %:z %% literal'):
+        func = epoch.formatter(pattern, tz)
+        self.assertEqual(
+          [func(ts) for ts in values],
+          [strftime(epoch.ts2dt(ts, tz), pattern) for ts in values],
+          (tz, pattern))
+
+  #----------------------------------------------------------------------------
+  def test_presets(self):
+    import epoch
+    ts = 1446303600.123456
+    self.assertEqual(epoch.formatter('iso8601')(ts), '2015-10-31T15:00:00.123+00:00')
+    self.assertEqual(
+      epoch.formatter('iso8601', 'America/St_Johns')(ts),
+      '2015-10-31T12:30:00.123-02:30')
+    self.assertEqual(epoch.formatter('compact')(ts), '20151031T150000Z')
+    self.assertEqual(
+      epoch.formatter('rfc3339', 'Europe/Paris')(ts),
+      '2015-10-31T16:00:00.123456+01:00')
+    self.assertEqual(epoch.formatter('rfc1123')(ts), 'Sat, 31 Oct 2015 15:00:00 GMT')
+    for tz in ('America/St_Johns', 'Europe/Paris', 'Asia/Tokyo'):
+      self.assertEqual(epoch.formatter('compact', tz)(ts), '20151031T150000Z')
+      self.assertEqual(
+        epoch.formatter('rfc1123', tz)(ts), 'Sat, 31 Oct 2015 15:00:00 GMT')
+    self.assertEqual(epoch.formatter('%s')(-0.5), '-1')
+    self.assertEqual(epoch.formatter('static')(ts), 'static')
+
+  #----------------------------------------------------------------------------
+  def test_cache(self):
+    import epoch, epoch.fmt
+    self.assertIs(
+      epoch.formatter('iso8601', 'Europe/Paris'),
+      epoch.formatter('iso8601', epoch.getTz('Europe/Paris')))
+    self.assertIsNot(epoch.formatter('iso8601'), epoch.formatter('rfc3339'))
+    self.assertEqual(epoch.fmt._compile('iso8601'), epoch.fmt._compile(epoch.fmt.PRESETS['iso8601']))
+    for pattern in ('%Q', 'trailing %', '%:x'):
+      with self.assertRaises(ValueError):
+        epoch.formatter(pattern)
+
+  #----------------------------------------------------------------------------
+  def test_iterable(self):
+    import epoch
+    func = epoch.formatter('%H:%M', 'Europe/Paris')
+    self.assertEqual(func([1446303600, 1446336000.5]), ['16:00', '01:00'])
+    self.assertEqual(len(func()), 5)
+
+  #----------------------------------------------------------------------------
+  @unittest.skipIf(np is None, 'numpy is not installed')
+  def test_array(self):
+    import epoch
+    values = sample()
+    pattern = '%a %A %b %B %j %Y-%m-%d %H:%M:%S.%f %L %z %:z %Z %s %%'
+    for tz in ZONES:
+      func = epoch.formatter(pattern, tz)
+      self.assertEqual(
+        func(np.array(values)).tolist(), [func(ts) for ts in values], tz)
+    result = epoch.formatter('compact', 'Asia/Tokyo')(np.array([[0], [86400]]))
+    self.assertEqual(result.tolist(), [['19700101T000000Z'], ['19700102T000000Z']])
+    self.assertEqual(epoch.formatter('x')(np.zeros((2,))).tolist(), ['x', 'x'])
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+
+#------------------------------------------------------------------------------
+
+# the maximum number of seconds that ``import epoch`` may take, which
+# can be overridden with the EPOCH_IMPORT_BUDGET environment variable.
+# by default, as wall-clock timings depend on the machine (and its
+# load), it is the larger of `IMPORT_FLOOR` seconds and `IMPORT_FACTOR`
+# times the import time of the `BASELINE_MODULE` standard library
+# module, which is measured the same way (``import epoch`` takes about
+# as long as ``import argparse``).
+IMPORT_BUDGET           = os.environ.get('EPOCH_IMPORT_BUDGET')
+IMPORT_FLOOR            = 0.05
+IMPORT_FACTOR           = 5
+BASELINE_MODULE         = 'argparse'
+LAZY_MODULES            = ('pytz', 'six', 'calendar', 're')
+
+_SCRIPT                 = \
+'''
+import sys, time, json
+before = set(sys.modules)
+start = time.perf_counter() if hasattr(time, 'perf_counter') else time.time()
+if len(sys.argv) > 1:
+  __import__(sys.argv[1])
+  elapsed = ( time.perf_counter() if hasattr(time, 'perf_counter') else time.time() ) - start
+  print(json.dumps(dict(elapsed=elapsed)))
+  sys.exit(0)
+import epoch
+elapsed = ( time.perf_counter() if hasattr(time, 'perf_counter') else time.time() ) - start
+epoch.now()
+epoch.zulu()
+epoch.parse('2015-10-31T15:00:00.000Z')
+print(json.dumps(dict(elapsed=elapsed, modules=sorted(set(sys.modules) - before))))
+'''
+
+#------------------------------------------------------------------------------
+class TestImport(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def setUp(self):
+    self.cache = tempfile.mkdtemp()
+
+  #----------------------------------------------------------------------------
+  def tearDown(self):
+    shutil.rmtree(self.cache, ignore_errors=True)
+
+  #----------------------------------------------------------------------------
+  def run_import(self, module=None):
+    # runs `_SCRIPT` in a new interpreter, which imports `epoch` (or the
+    # `module`, whose import time is then the only result)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+      [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+      + [path for path in [env.get('PYTHONPATH')] if path])
+    # note: byte-compilation is not part of the budget, so a private
+    #       bytecode cache is used (and warmed up by the first run).
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPYCACHEPREFIX'] = self.cache
+    output = subprocess.check_output(
+      [sys.executable, '-c', _SCRIPT] + ([module] if module else []), env=env)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+  #----------------------------------------------------------------------------
+  def test_lazy(self):
+    modules = self.run_import()['modules']
+    for name in LAZY_MODULES:
+      self.assertNotIn(name, modules)
+
+  #----------------------------------------------------------------------------
+  def test_budget(self):
+    if IMPORT_BUDGET:
+      budget = float(IMPORT_BUDGET)
+    else:
+      baseline = min(
+        self.run_import(BASELINE_MODULE)['elapsed'] for attempt in range(5))
+      budget = max(IMPORT_FLOOR, baseline * IMPORT_FACTOR)
+    self.run_import()
+    elapsed = min(self.run_import()['elapsed'] for attempt in range(5))
+    self.assertLess(
+      elapsed, budget,
+      '`import epoch` took %.1fms (budget: %.1fms)'
+      % (elapsed * 1000, budget * 1000))
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
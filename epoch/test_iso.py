@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+from datetime import datetime, timedelta
+
+#------------------------------------------------------------------------------
+
+UTC = 1446303600
+
+#------------------------------------------------------------------------------
+class TestIso(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_layouts(self):
+    from epoch import iso
+    for text, expect in (
+        ('2015-10-31',                    1446249600),
+        ('20151031',                      1446249600),
+        ('2015-304',                      1446249600),
+        ('2015304',                       1446249600),
+        ('2015-W44-6',                    1446249600),
+        ('2015W446',                      1446249600),
+        ('2015-W44',                      1445817600),
+        ('2015-10',                       1443657600),
+        ('2009-W53-7',                    1262476800),
+        ('2008-W01-1',                    1199059200),
+        ('2015-10-31T15:00:00Z',          UTC),
+        ('2015-10-31 15:00:00Z',          UTC),
+        ('20151031T150000Z',              UTC),
+        ('2015-10-31T15Z',                UTC),
+        ('2015-10-31T15:00Z',             UTC),
+        ('2015-10-31T17:00:00+02:00',     UTC),
+        ('2015-10-31T17:00:00+0200',      UTC),
+        ('2015-10-31T17+02',              UTC),
+        ('20151031T123000-0230',          UTC),
+        ('2015-10-31T15:00:00.25Z',       UTC + 0.25),
+        ('2015-10-31T15:00:00,25Z',       UTC + 0.25),
+        ('2015-10-31T15:00:00.123456789Z', UTC + 0.123456789),
+        ('2015-10-31T15:30.5Z',           UTC + 1830),
+        ('2015-10-31T15.25Z',             UTC + 900),
+        ('2015-10-30T24:00Z',             1446249600),
+        ('2015-10-30T24:00:00.000Z',      1446249600),
+        ):
+      self.assertEqual(iso.parse(text), expect, text)
+      self.assertIsInstance(iso.parse(text), float)
+
+  #----------------------------------------------------------------------------
+  def test_errors(self):
+    from epoch import iso
+    for text in (
+        '', '15-10-31', '2015-10-31T', '2015-10T10', '2015-10-31T15:0',
+        '2015-10-31T15:00+2', '2015-10-31T1500:00', '2015-10-31T15:00:00Zx',
+        '2015-10-31T15:00:00.Z', '2015W44-6', '2015-1031', '201510',
+        '2015-10-31T15:00:00 +02:00', '2015-10-31t15:00:00z'):
+      with self.assertRaises(SyntaxError, msg=text):
+        iso.parse(text)
+    for text in (
+        '2015-13-01', '2015-02-29', '2015-366', '2015-W54', '2014-W53',
+        '2015-W44-8', '2015-10-31T25:00Z', '2015-10-31T24:00:01Z',
+        '2015-10-31T15:60Z', '2015-10-31T15:00:60Z', '2015-10-31T15:00+24:00',
+        '0000-01-01'):
+      with self.assertRaises(ValueError, msg=text):
+        iso.parse(text)
+
+  #----------------------------------------------------------------------------
+  def test_weeks(self):
+    from epoch import iso
+    day = datetime(1990, 1, 1)
+    while day.year < 2030:
+      year, week, weekday = day.isocalendar()
+      expect = ( day - datetime(1970, 1, 1) ).total_seconds()
+      self.assertEqual(iso.parse('%04d-W%02d-%d' % (year, week, weekday)), expect)
+      self.assertEqual(iso.parse(day.strftime('%Y-%j')), expect)
+      day += timedelta(days=3)
+
+  #----------------------------------------------------------------------------
+  def test_local(self):
+    import epoch
+    from epoch import iso
+    tz = 'America/New_York'
+    rnd = random.Random(3)
+    for idx in range(300):
+      ts = rnd.randint(1400000000, 1500000000)
+      local = epoch.ts2dt(ts, tz).strftime('%Y-%m-%dT%H:%M:%S')
+      self.assertEqual(
+        iso.parse(local, tz),
+        epoch.tsreplace(ts, tz, **dict(zip(
+          ('hour', 'minute', 'second'), map(int, local[11:].split(':'))))))
+    # ambiguous and non-existent local times resolve as `dtreplace` does
+    self.assertEqual(
+      iso.parse('2015-11-01T01:30', tz),
+      epoch.tsreplace(1446350400, tz, hour=1, minute=30))
+    self.assertEqual(
+      iso.parse('2016-03-13T02:30', tz), epoch.parse('2016-03-13T07:30:00Z'))
+    self.assertEqual(iso.parse('2015-10-31', tz), 1446264000)
+
+  #----------------------------------------------------------------------------
+  def test_parse(self):
+    import epoch
+    self.assertEqual(epoch.parse('2015-10-31T17:00:00+02:00'), UTC)
+    self.assertEqual(epoch.parse('2015-10-31T16:00', 'Europe/Paris'), UTC)
+    self.assertEqual(epoch.parse('20151031T150000.0006Z'), UTC + 0.0006)
+    with self.assertRaises(SyntaxError):
+      epoch.parse('yesterday')
+
+  #----------------------------------------------------------------------------
+  def test_parser(self):
+    import epoch
+    from epoch import iso
+    values = [epoch.zulu(UTC + idx * 3607.5)[:-1] + ('+02:00', '-05:30')[idx % 2]
+              for idx in range(200)]
+    values += ['2015-10-31T15:00:00.5Z', '1446303600', '2015-10-31T15:00:00Z']
+    parser = iso.Parser()
+    self.assertEqual(
+      [parser(value) for value in values], [epoch.parse(value) for value in values])
+    self.assertEqual(parser.layout, '0000-00-00T00:00:00.000+00:00')
+    self.assertEqual(( parser.hits, parser.misses ), ( 200, 3 ))
+    parser = iso.Parser('Europe/Paris')
+    self.assertEqual(parser('2015-10-31 16:00'), UTC)
+    self.assertEqual(parser('2015-10-31 17:00'), UTC + 3600)
+    self.assertEqual(parser('2015-10-31 16:00Z'), UTC + 3600)
+    self.assertEqual(( parser.hits, parser.misses ), ( 2, 1 ))
+    parser = iso.Parser()
+    self.assertEqual(parser('1446303600'), UTC)
+    self.assertEqual(parser('2015-10-31'), 1446249600)
+    self.assertIsNone(parser.layout)
+    self.assertEqual(
+      list(epoch.parse_many(['2015-10-31T17:00:00+02:00', '2015-10-31T10:00:00-05:00', None])[:2]),
+      [UTC, UTC])
+    with self.assertRaises(ValueError):
+      parser = iso.Parser()
+      parser('2015-10-31T15:00:00Z')
+      parser('2015-10-31T25:00:00Z')
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+import asyncio
+
+#------------------------------------------------------------------------------
+
+ZONES = ('UTC', 'America/New_York', 'Europe/Paris', 'Australia/Lord_Howe')
+
+#------------------------------------------------------------------------------
+class TestRecur(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def tearDown(self):
+    import epoch
+    epoch.setClock()
+
+  #----------------------------------------------------------------------------
+  def test_next(self):
+    import epoch
+    from epoch.recur import Rule
+    rnd = random.Random(7)
+    values = [rnd.randint(1420070400, 1483228800) for idx in range(200)]
+    for tz in ZONES:
+      for rule, func, kw in (
+          (Rule('day', tz, at=dict(hour=2, minute=30)), epoch.sod, dict()),
+          (Rule('week', tz, at=dict(hour=9, minute=30)), epoch.sow, dict()),
+          (Rule('week', tz, day=4, at=dict(hour=17)), epoch.sow, dict(day=4)),
+          (Rule('month', tz), epoch.som, dict()),
+          (Rule('month', tz, at=dict(day=15, hour=1, minute=30)), epoch.som, dict()),
+          (Rule('year', tz, at=dict(month=3, day=13, hour=2)), epoch.soy, dict())):
+        for ts in values:
+          fire = rule.next(ts)
+          expect = [func(ts, tz, offset=offset, replace=rule.at or None, **kw)
+                    for offset in (0, 1, 2)]
+          self.assertEqual(fire, min(val for val in expect if val > ts), (rule, ts))
+          self.assertEqual(rule.next(fire - 1), fire)
+
+  #----------------------------------------------------------------------------
+  def test_dst(self):
+    import epoch
+    from epoch.recur import Rule
+    tz = 'America/New_York'
+    # 02:30 does not exist on 2016-03-13, 01:30 is ambiguous on 2015-11-01
+    rule = Rule('day', tz, at=dict(hour=2, minute=30))
+    self.assertEqual(
+      [epoch.zulu(ts) for ts in rule.iter(
+        epoch.parse('2016-03-12T12:00:00Z'), epoch.parse('2016-03-14T12:00:00Z'))],
+      ['2016-03-13T07:30:00.000Z', '2016-03-14T06:30:00.000Z'])
+    rule = Rule('day', tz, at=dict(hour=1, minute=30))
+    self.assertEqual(
+      rule.next(epoch.parse('2015-10-31T12:00:00Z')),
+      epoch.dt2ts(epoch.dtreplace(epoch.ts2dt(1446350400, tz), hour=1, minute=30)))
+    # the 2024-10-27 local midnight in the Azores is repeated, and
+    # resolves to the second (i.e. 01:00Z) occurrence
+    rule = Rule('day', 'Atlantic/Azores')
+    epoch.clearCache()
+    self.assertEqual(
+      [epoch.zulu(ts) for ts in rule.iter(
+        epoch.parse('2024-10-26T12:00:00Z'), epoch.parse('2024-10-28T12:00:00Z'))],
+      ['2024-10-27T01:00:00.000Z', '2024-10-28T01:00:00.000Z'])
+    self.assertEqual(
+      rule.next(epoch.parse('2024-10-27T00:30:00Z')), epoch.parse('2024-10-27T01:00:00Z'))
+    with self.assertRaises(ValueError):
+      Rule('fortnight')
+    with self.assertRaises(ValueError):
+      Rule('day', day=1)
+
+  #----------------------------------------------------------------------------
+  def test_scheduler(self):
+    from epoch.recur import Rule, Scheduler
+    start = 1446249600
+    sched = Scheduler()
+    self.assertIsNone(sched.peek())
+    self.assertEqual(sched.pop_due(start), [])
+    sched.add(Rule('day', at=dict(hour=12)), 'noon', start=start)
+    sched.add(Rule('day', at=dict(hour=6)), 'six', start=start)
+    weekly = sched.add(Rule('week'), 'weekly', start=start)
+    self.assertEqual(len(sched), 3)
+    self.assertEqual(sched.peek(), start + 6 * 3600)
+    self.assertEqual(sched.pop_due(start + 3600), [])
+    self.assertEqual(
+      sched.pop_due(start + 13 * 3600),
+      [(start + 6 * 3600, 'six'), (start + 12 * 3600, 'noon')])
+    self.assertEqual(sched.peek(), start + 86400 + 6 * 3600)
+    # missed fires are coalesced (2015-10-31 is a saturday)
+    self.assertEqual(
+      sched.pop_due(start + 5 * 86400),
+      [(start + 86400 + 6 * 3600, 'six'), (start + 86400 + 12 * 3600, 'noon'),
+       (start + 2 * 86400, 'weekly')])
+    self.assertEqual(sched.peek(), start + 5 * 86400 + 6 * 3600)
+    sched.remove(weekly)
+    self.assertEqual(len(sched), 2)
+    with self.assertRaises(KeyError):
+      sched.remove(weekly)
+    self.assertEqual(
+      [job for _, job in sched.pop_due(start + 30 * 86400)], ['six', 'noon'])
+
+  #----------------------------------------------------------------------------
+  def test_invalid(self):
+    from epoch.recur import Rule, Scheduler
+    for period, at in (
+        ('month', dict(day=31)), ('month', dict(day=29)),
+        ('year', dict(month=2, day=29)), ('year', dict(month=4, day=31)),
+        ('day', dict(hour=24)), ('week', dict(minute=-1)), ('day', dict(fortnight=1))):
+      with self.assertRaises(ValueError):
+        Rule(period, 'UTC', at=at)
+    self.assertEqual(
+      Rule('month', 'UTC', at=dict(day=28)).next(1446249600), 1448668800)
+    self.assertEqual(
+      Rule('year', 'UTC', at=dict(month=12, day=31)).next(1446249600), 1451520000)
+    # a rule that fails leaves every due job scheduled as it was
+    class Broken(object):
+      fail = False
+      def next(self, ts=None):
+        if self.fail:
+          raise ValueError('broken')
+        return ts + 10
+    broken = Broken()
+    sched = Scheduler()
+    sched.add(Rule('day', 'UTC'), 'daily', start=0)
+    sched.add(broken, 'broken', start=0)
+    broken.fail = True
+    with self.assertRaises(ValueError):
+      sched.pop_due(86400)
+    self.assertEqual(len(sched), 2)
+    self.assertEqual(sorted(entry[3] for entry in sched._heap), ['broken', 'daily'])
+    self.assertEqual(sched.peek(), 10)
+    broken.fail = False
+    self.assertEqual(sched.pop_due(86400), [(10, 'broken'), (86400, 'daily')])
+    self.assertEqual(sched.peek(), 86410)
+
+  #----------------------------------------------------------------------------
+  def test_next_due(self):
+    import epoch
+    from epoch.recur import Rule, Scheduler
+    clock = epoch.setClock('frozen', 1446303600)
+    sched = Scheduler()
+    async def run():
+      waiter = asyncio.ensure_future(sched.next_due())
+      await asyncio.sleep(0.01)
+      self.assertFalse(waiter.done())
+      sched.add(Rule('day'), 'daily', start=clock.time() - 86400)
+      return await asyncio.wait_for(waiter, 5)
+    self.assertEqual(asyncio.run(run()), [(1446249600, 'daily')])
+    self.assertEqual(sched.peek(), 1446336000)
+    clock.set(1446336000)
+    self.assertEqual(asyncio.run(sched.next_due()), [(1446336000, 'daily')])
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+
+#------------------------------------------------------------------------------
+class TestStats(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def tearDown(self):
+    import epoch.stats
+    epoch.stats.disable()
+    epoch.stats.reset()
+
+  #----------------------------------------------------------------------------
+  def test_enable(self):
+    import epoch, epoch.stats
+    originals = dict((attr, getattr(epoch, attr)) for attr, _ in epoch.stats.STAGES.values())
+    epoch.stats.enable()
+    self.assertTrue(epoch.stats.isEnabled())
+    self.assertIsNot(epoch.sod, originals['sod'])
+    self.assertIs(epoch.sod.__wrapped__, originals['sod'])
+    # re-enabling must not wrap the wrappers
+    epoch.stats.enable(['sod'])
+    self.assertIs(epoch.sod.__wrapped__, originals['sod'])
+    self.assertIs(epoch.dt2ts, originals['dt2ts'])
+    epoch.stats.disable()
+    self.assertFalse(epoch.stats.isEnabled())
+    for attr, func in originals.items():
+      self.assertIs(getattr(epoch, attr), func)
+    with self.assertRaises(ValueError):
+      epoch.stats.enable(['nosuchstage'])
+
+  #----------------------------------------------------------------------------
+  def test_defaultTz(self):
+    import epoch, epoch.stats
+    epoch.stats.enable()
+    # with `tz` omitted, the default timezone is resolved without
+    # recursing into the instrumented `getTz`
+    self.assertEqual(epoch.sod(1400000000.0), 1399939200)
+    self.assertEqual(epoch.getTz(), epoch.getDefaultTz())
+    self.assertEqual(epoch.ts2dt(0).year, 1970)
+    self.assertIn('UTC', epoch.stats.snapshot()['getTz']['zones'])
+
+  #----------------------------------------------------------------------------
+  def test_snapshot(self):
+    import epoch, epoch.stats
+    events = []
+    epoch.stats.enable(callback=lambda *args: events.append(args))
+    epoch.setCacheSize(0)
+    try:
+      self.assertEqual(epoch.sod(1446303600, tz='Europe/Paris', offset=1), 1446332400)
+      epoch.sod(1446303600, tz='America/New_York')
+      epoch.zulu(0)
+    finally:
+      epoch.setCacheSize(1024)
+    data = epoch.stats.snapshot()
+    self.assertEqual(data['sod']['calls'], 2)
+    self.assertEqual(
+      sorted(data['sod']['zones']), ['America/New_York', 'Europe/Paris'])
+    self.assertEqual(data['sod']['zones']['Europe/Paris']['calls'], 1)
+    self.assertGreater(data['sod']['time'], 0)
+    self.assertGreaterEqual(data['sod']['time'], data['localize']['time'])
+    self.assertEqual(data['zulu']['zones'], {None: data['zulu']['zones'][None]})
+    self.assertEqual(
+      len(events), sum(stage['calls'] for stage in data.values()))
+    self.assertIn(('zulu', None), [event[:2] for event in events])
+    epoch.stats.disable()
+    epoch.sod(1446303600)
+    self.assertEqual(epoch.stats.snapshot()['sod']['calls'], 2)
+    epoch.stats.reset()
+    self.assertEqual(epoch.stats.snapshot(), dict())
+
+  #----------------------------------------------------------------------------
+  def test_example(self):
+    # the module docstring example: a cold cache misses once, then hits
+    import epoch, epoch.stats
+    epoch.clearCache()
+    epoch.stats.enable()
+    ts = 1446303600
+    epoch.sod(ts, tz='Europe/Paris')
+    zones = epoch.stats.snapshot()['localize']['zones']
+    self.assertEqual(zones['Europe/Paris']['calls'], 1)
+    epoch.sod(ts + 60, tz='Europe/Paris')
+    zones = epoch.stats.snapshot()['localize']['zones']
+    self.assertEqual(zones['Europe/Paris']['calls'], 1)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
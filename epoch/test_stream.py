@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+import tempfile
+import os
+import io
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+#------------------------------------------------------------------------------
+def logdata(count=2000, seed=7):
+  import epoch
+  rnd = random.Random(seed)
+  lines = []
+  expect = []
+  for idx in range(count):
+    ts = round(rnd.uniform(0, 2000000000), 3)
+    kind = rnd.random()
+    if kind < 0.8:
+      lines.append(epoch.zulu(ts) + ' INFO something happened')
+    elif kind < 0.9:
+      ts = float(int(ts))
+      lines.append(epoch.zulu(ts, ms=False) + '\r')
+    else:
+      lines.append('%r DEBUG' % (ts,))
+    expect.append(ts)
+  return ( '\n'.join(lines).encode('ascii'), expect )
+
+#------------------------------------------------------------------------------
+class TestStream(unittest.TestCase):
+
+  MODES = (None, False) if numpy else (False,)
+
+  #----------------------------------------------------------------------------
+  def scan(self, *args, **kw):
+    import epoch
+    return [val for chunk in epoch.scan(*args, **kw) for val in chunk]
+
+  #----------------------------------------------------------------------------
+  def test_buffer(self):
+    data, expect = logdata()
+    for mode in self.MODES:
+      for chunksize in (100, 4096, None):
+        self.assertEqual(
+          self.scan(data, chunksize=chunksize, numpy=mode), expect)
+        self.assertEqual(
+          self.scan(bytearray(data + b'\n'), chunksize=chunksize, numpy=mode),
+          expect)
+      self.assertEqual(self.scan(io.BytesIO(data), numpy=mode), expect)
+      self.assertEqual(self.scan(b'', numpy=mode), [])
+
+  #----------------------------------------------------------------------------
+  def test_chunks(self):
+    import epoch
+    data, expect = logdata()
+    for mode in self.MODES:
+      chunks = list(epoch.scan(data, chunksize=4096, numpy=mode))
+      self.assertGreater(len(chunks), 10)
+      self.assertLess(max(len(chunk) for chunk in chunks), 4096 // 20)
+
+  #----------------------------------------------------------------------------
+  def test_file(self):
+    import epoch
+    data, expect = logdata()
+    fd, path = tempfile.mkstemp()
+    try:
+      os.write(fd, data)
+      os.close(fd)
+      for mode in self.MODES:
+        self.assertEqual(self.scan(path, chunksize=4096, numpy=mode), expect)
+        with open(path, 'rb') as fp:
+          self.assertEqual(self.scan(fp, chunksize=4096, numpy=mode), expect)
+        # abandoning the generator must release the memory map
+        scanner = epoch.scan(path, chunksize=4096, numpy=mode)
+        next(scanner)
+        scanner.close()
+      open(path, 'wb').close()
+      self.assertEqual(self.scan(path), [])
+    finally:
+      os.unlink(path)
+
+  #----------------------------------------------------------------------------
+  def test_column(self):
+    data = b'a,2015-10-31T15:00:00.400Z,x\nb,1446303600,y\r\nc,,z\nd\ne,20151031T150000Z'
+    for mode in self.MODES:
+      result = self.scan(data, column=1, sep=',', errors='coerce', numpy=mode)
+      self.assertEqual(result[:2], [1446303600.4, 1446303600])
+      self.assertTrue(all(val != val for val in result[2:4]))
+      self.assertEqual(result[4], 1446303600)
+      with self.assertRaises(SyntaxError):
+        self.scan(data, column=1, sep=',', numpy=mode)
+      self.assertEqual(
+        self.scan(b'x\t1446303600\t2015-10-31T15:00:00Z', column=2, sep='\t', numpy=mode),
+        [1446303600])
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
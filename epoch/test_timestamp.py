@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+
+import unittest
+import random
+import pickle
+
+#------------------------------------------------------------------------------
+
+ZONES = ('UTC', 'America/New_York', 'Europe/Paris', 'Australia/Lord_Howe',
+         'America/Sao_Paulo', 'Etc/GMT-14')
+
+#------------------------------------------------------------------------------
+def sample(count=200, seed=13):
+  # note: every other sample is pulled to within a few hours of local
+  #       midnight around a DST transition (i.e. the first of the
+  #       month), to exercise gaps and overlaps
+  rnd = random.Random(seed)
+  ret = []
+  for idx in range(count):
+    ts = rnd.randint(-2000000000, 2200000000)
+    if idx % 2:
+      ts = ts - ( ts % 86400 ) + rnd.randint(-6 * 3600, 6 * 3600)
+    ret.append(ts + rnd.randint(0, 999999) / 1000000.0)
+  return ret
+
+#------------------------------------------------------------------------------
+def outcome(func, *args, **kw):
+  try:
+    return float(func(*args, **kw))
+  except Exception as err:
+    return type(err)
+
+#------------------------------------------------------------------------------
+class TestTimestamp(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_fields(self):
+    import epoch
+    for tz in ZONES:
+      for ts in sample():
+        value = epoch.Timestamp(ts, tz)
+        dt = epoch.ts2dt(ts, tz)
+        self.assertEqual(value.ts, epoch.dt2ts(dt))
+        self.assertEqual(
+          (value.year, value.month, value.day, value.hour, value.minute,
+           value.second, value.microsecond, value.weekday(), value.isoweekday(),
+           value.offset),
+          (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second,
+           dt.microsecond, dt.weekday(), dt.isoweekday(),
+           dt.utcoffset().total_seconds()))
+        self.assertEqual(value.datetime(), dt)
+        self.assertEqual(value.zulu(), epoch.zulu(ts))
+
+  #----------------------------------------------------------------------------
+  def test_periods(self):
+    import epoch
+    values = sample(count=60)
+    for tz in ZONES:
+      for name, kw in (
+          ('sod', dict()), ('sod', dict(offset=-2, replace=dict(hour=2, minute=30))),
+          ('sod', dict(boundary=dict(hour=4))), ('sod', dict(replace=dict(hour=25))),
+          ('sow', dict()), ('sow', dict(day=6, offset=1)),
+          ('som', dict()), ('som', dict(offset=13, replace=dict(day=31))),
+          ('soy', dict(offset=-1)), ('soy', dict(replace=dict(month=3, day=27, hour=2)))):
+        for ts in values:
+          self.assertEqual(
+            outcome(getattr(epoch.Timestamp(ts, tz), name), **kw),
+            outcome(getattr(epoch, name), ts, tz=tz, **kw),
+            (name, ts, tz, kw))
+      for ts in values:
+        for kw in (dict(hour=2, minute=30), dict(day=31), dict(month=2, day=29)):
+          self.assertEqual(
+            outcome(epoch.Timestamp(ts, tz).replace, **kw),
+            outcome(epoch.tsreplace, ts, tz=tz, **kw))
+
+  #----------------------------------------------------------------------------
+  def test_value(self):
+    import epoch
+    tz = epoch.getTz('Europe/Paris')
+    value = epoch.Timestamp('2015-10-31T15:00:00.25Z', 'Europe/Paris')
+    self.assertEqual(value.us, 1446303600250000)
+    self.assertEqual(float(value), 1446303600.25)
+    self.assertEqual(int(value), 1446303600)
+    self.assertIs(value.tz, tz)
+    # the per-period pytz tzinfos are interned to the timezone
+    self.assertIs(epoch.Timestamp(0, epoch.ts2dt(1446303600, tz).tzinfo).tz, tz)
+    self.assertEqual(value.sod().tz, tz)
+    self.assertEqual(repr(value), "Timestamp('2015-10-31T15:00:00.250Z', tz='Europe/Paris')")
+    self.assertEqual(value, value.astz('UTC'))
+    self.assertEqual(value.astz('UTC').hour, 15)
+    self.assertEqual(epoch.Timestamp(value).hour, 16)
+    self.assertLess(value.sod(), value)
+    self.assertEqual(len(set([value, epoch.Timestamp(1446303600.25)])), 1)
+    self.assertEqual(pickle.loads(pickle.dumps(value)).hour, 16)
+    self.assertFalse(hasattr(value, '__dict__'))
+    with self.assertRaises(AttributeError):
+      value.year = 2016
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+from datetime import datetime, timedelta
+
+import pytz
+
+#------------------------------------------------------------------------------
+
+ZONES = ('America/New_York', 'America/Anchorage', 'Europe/Paris',
+         'Australia/Lord_Howe', 'Europe/Warsaw', 'America/Sao_Paulo')
+
+#------------------------------------------------------------------------------
+class TestTzIndex(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_utcoffset(self):
+    import epoch
+    for name in ZONES:
+      tz = pytz.timezone(name)
+      index = epoch.getTzIndex(tz)
+      for ts in range(-1800000000, 2200000000, 3599999):
+        self.assertEqual(
+          index.utcoffset(ts),
+          epoch.ts2dt(ts, tz).utcoffset().total_seconds())
+        self.assertEqual(
+          index.toLocal(ts),
+          epoch.dt2ts(epoch.ts2dt(ts, tz).replace(tzinfo=pytz.UTC)))
+
+  #----------------------------------------------------------------------------
+  def test_localize(self):
+    import epoch
+    for name in ZONES:
+      tz = pytz.timezone(name)
+      index = epoch.getTzIndex(tz)
+      # check every 30 minutes within 12 hours of each transition
+      for trans in index.times[1:]:
+        for step in range(-24, 24):
+          local = trans + step * 1800
+          naive = datetime(1970, 1, 1) + timedelta(seconds=local)
+          utc, idx = index.localize(local)
+          expect = tz.localize(naive)
+          self.assertEqual(utc, epoch.dt2ts(expect), (name, naive))
+          self.assertIs(index.tzinfos[idx], expect.tzinfo, (name, naive))
+
+  #----------------------------------------------------------------------------
+  def test_getTzIndex(self):
+    import epoch
+    tz = pytz.timezone('Europe/Paris')
+    index = epoch.getTzIndex('Europe/Paris')
+    self.assertIs(index.zone, tz)
+    self.assertFalse(index.fixed)
+    self.assertIs(epoch.getTzIndex(epoch.ts2dt(1446303600, tz).tzinfo), index)
+    self.assertEqual(epoch.getTzIndex().offsets.tolist(), [0])
+    self.assertTrue(epoch.getTzIndex(pytz.FixedOffset(90)).fixed)
+    self.assertEqual(epoch.getTzIndex('Etc/GMT+5').offsets.tolist(), [-18000])
+
+  #----------------------------------------------------------------------------
+  def test_dtreplace(self):
+    import epoch
+    tz = pytz.timezone('America/New_York')
+    dt = epoch.ts2dt(1446303600, tz)
+    # 2015-11-01 01:30 is ambiguous, 2016-03-13 02:30 does not exist
+    for fields in (dict(day=1, hour=1, minute=30), dict(year=2016, month=3, day=13, hour=2, minute=30)):
+      self.assertEqual(
+        epoch.dtreplace(dt, **fields),
+        tz.localize(dt.replace(tzinfo=None).replace(**fields)))
+    with self.assertRaises(TypeError):
+      epoch.dtreplace(datetime(2015, 11, 1), hour=3)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
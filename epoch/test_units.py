@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+import time
+
+#------------------------------------------------------------------------------
+class TestUnits(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def test_now(self):
+    import epoch, epoch.ns, epoch.us
+    before = int(time.time() * 1000000) - 1000
+    val = epoch.now_us()
+    self.assertIsInstance(val, int)
+    self.assertGreaterEqual(val, before)
+    self.assertLessEqual(epoch.now_ns() // 1000, epoch.us.now() + 1000)
+    self.assertIsInstance(epoch.ns.now(), int)
+
+  #----------------------------------------------------------------------------
+  def test_zulu(self):
+    import epoch.ns, epoch.us
+    val = 1446303600123456789
+    self.assertEqual(epoch.ns.zulu(val), '2015-10-31T15:00:00.123456789Z')
+    self.assertEqual(epoch.ns.zulu(val, digits=3), '2015-10-31T15:00:00.123Z')
+    self.assertEqual(epoch.ns.zulu(val, digits=0), '2015-10-31T15:00:00Z')
+    self.assertEqual(epoch.us.zulu(val // 1000), '2015-10-31T15:00:00.123456Z')
+    self.assertEqual(epoch.us.zulu(val // 1000, digits=9), '2015-10-31T15:00:00.123456000Z')
+    self.assertEqual(epoch.ns.zulu(-1), '1969-12-31T23:59:59.999999999Z')
+
+  #----------------------------------------------------------------------------
+  def test_parse(self):
+    import epoch.ns, epoch.us
+    self.assertIsNone(epoch.ns.parse(None))
+    self.assertEqual(epoch.ns.parse(12), 12)
+    self.assertEqual(epoch.ns.parse('12'), 12)
+    self.assertEqual(epoch.us.parse(1446303600.5), 1446303600500000)
+    self.assertEqual(epoch.ns.parse('2015-10-31T15:00:00Z'), 1446303600000000000)
+    self.assertEqual(epoch.ns.parse('2015-10-31T15:00:00.123Z'), 1446303600123000000)
+    self.assertEqual(epoch.ns.parse(b'20151031T150000.123456789Z'), 1446303600123456789)
+    self.assertEqual(epoch.us.parse('2015-10-31T15:00:00.1234569Z'), 1446303600123456)
+    with self.assertRaises(SyntaxError):
+      epoch.ns.parse('2015-10-31 15:00:00Z')
+    with self.assertRaises(ValueError):
+      epoch.ns.parse('2015-02-29T15:00:00.5Z')
+    rnd = random.Random(7)
+    for unit in (epoch.ns, epoch.us):
+      for idx in range(500):
+        val = rnd.randint(-10 ** 10, 10 ** 11) * unit.unit.scale \
+          + rnd.randint(0, unit.unit.scale - 1)
+        self.assertEqual(unit.parse(unit.zulu(val)), val)
+
+  #----------------------------------------------------------------------------
+  def test_periods(self):
+    import epoch, epoch.ns, epoch.us
+    rnd = random.Random(11)
+    for tz in ('UTC', 'America/New_York', 'Australia/Lord_Howe'):
+      for idx in range(100):
+        val = rnd.randint(1420070400, 1483228800) * 10 ** 9 + rnd.randint(0, 10 ** 9 - 1)
+        ts = val // 1000 / 1000000.0
+        for name in ('sod', 'sow', 'som', 'soy'):
+          expect = getattr(epoch, name)(ts, tz=tz, offset=1)
+          self.assertEqual(
+            getattr(epoch.ns, name)(val, tz=tz, offset=1), int(expect) * 10 ** 9)
+          self.assertEqual(
+            getattr(epoch.us, name)(val // 1000, tz=tz, offset=1), int(expect) * 10 ** 6)
+        self.assertEqual(
+          epoch.ns.sod(val, tz=tz, boundary=dict(hour=4)),
+          int(epoch.sod(ts, tz=tz, boundary=dict(hour=4))) * 10 ** 9)
+    # note: around DST transitions, including the fall-backs that repeat
+    #       local midnight in Atlantic/Azores and America/Havana.
+    for tz in ('Atlantic/Azores', 'America/Havana', 'Etc/GMT+5'):
+      for sec in range(1729900800, 1730678400, 1800):
+        val = sec * 10 ** 9 + 999999999
+        ts = sec + 0.999999
+        for name, kw in (
+            ('sod', dict()), ('sod', dict(boundary=dict(hour=0, minute=30))),
+            ('sow', dict(day=6)), ('som', dict(offset=-1)), ('soy', dict())):
+          self.assertEqual(
+            getattr(epoch.ns, name)(val, tz=tz, **kw),
+            int(getattr(epoch, name)(ts, tz=tz, **kw)) * 10 ** 9, (tz, name, sec))
+    val = epoch.ns.parse('2015-10-31T15:00:00.999999999Z')
+    self.assertEqual(
+      epoch.ns.sod(val, replace=dict(hour=12, microsecond=123456)),
+      epoch.ns.parse('2015-10-31T12:00:00.123456Z'))
+    self.assertEqual(
+      epoch.us.sow(epoch.us.parse('2015-10-31T15:00:00Z'), replace=dict(microsecond=5)),
+      epoch.us.parse('2015-10-26T00:00:00.000005Z'))
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
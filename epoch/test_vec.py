@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+import unittest
+import random
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+#------------------------------------------------------------------------------
+
+ZONES = ('UTC', 'America/New_York', 'America/Anchorage', 'Europe/Paris',
+         'Australia/Lord_Howe')
+
+#------------------------------------------------------------------------------
+def sample(count=300, lo=1420070400, hi=1483228800, seed=19):
+  # note: 2015..2017, which includes plenty of DST transitions; every
+  #       other sample is pulled to within a few hours of midnight UTC
+  #       to exercise the day edges. the samples have microsecond
+  #       precision, as `datetime` rounds anything finer.
+  rnd = random.Random(seed)
+  ret = []
+  for idx in range(count):
+    ts = rnd.randint(lo, hi)
+    if idx % 2:
+      ts = ts - ( ts % 86400 ) + rnd.randint(-4 * 3600, 4 * 3600)
+    ret.append(ts + rnd.randint(0, 999999) / 1000000.0)
+  return ret
+
+#------------------------------------------------------------------------------
+def straddle(tz, lo=1704067200, hi=1735689600, step=900):
+  # note: every `step` seconds from 26 hours before to 26 hours after
+  #       each of the UTC offset changes of `tz` during 2024, which
+  #       includes fall-backs that repeat local midnight (such as in
+  #       Atlantic/Azores and America/Havana).
+  import epoch
+  ret = []
+  for ts in epoch.getTzIndex(tz).times:
+    if lo <= ts < hi:
+      ret.extend(range(ts - 93600, ts + 93600, step))
+  return [ts + 0.25 for ts in ret]
+
+#------------------------------------------------------------------------------
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestVec(unittest.TestCase):
+
+  #----------------------------------------------------------------------------
+  def assertVec(self, vfunc, sfunc, values, **kw):
+    result = vfunc(np.array(values), **kw)
+    self.assertEqual(result.dtype, np.float64)
+    self.assertEqual(result.tolist(), [sfunc(ts, **kw) for ts in values])
+
+  #----------------------------------------------------------------------------
+  def test_sod(self):
+    import epoch, epoch.vec
+    values = sample()
+    for tz in ZONES:
+      for offset in (None, 1, -2):
+        self.assertVec(epoch.vec.sod, epoch.sod, values, tz=tz, offset=offset)
+      self.assertVec(
+        epoch.vec.sod, epoch.sod, values, tz=tz, replace=dict(hour=15, minute=30))
+
+  #----------------------------------------------------------------------------
+  def test_sod_boundary(self):
+    import epoch, epoch.vec
+    values = sample()
+    for tz in ZONES:
+      for boundary in (dict(hour=4), dict(hour=2, minute=30), dict(hour=16)):
+        for offset in (None, 1, -1):
+          self.assertVec(
+            epoch.vec.sod, epoch.sod, values,
+            tz=tz, boundary=boundary, offset=offset)
+    with self.assertRaises(ValueError):
+      epoch.vec.sod(np.array(values), boundary=dict(day=2))
+    with self.assertRaises(ValueError):
+      epoch.vec.sod(np.array(values), boundary=dict(minute=30))
+
+  #----------------------------------------------------------------------------
+  def test_sow(self):
+    import epoch, epoch.vec
+    values = sample()
+    for tz in ZONES:
+      for day in (None, 1, 6):
+        for offset in (None, 2, -1):
+          self.assertVec(
+            epoch.vec.sow, epoch.sow, values, tz=tz, day=day, offset=offset)
+
+  #----------------------------------------------------------------------------
+  def test_transitions(self):
+    import epoch, epoch.vec
+    for tz in ('Atlantic/Azores', 'America/Havana', 'America/New_York'):
+      values = straddle(tz)
+      for offset in (None, 1, -1):
+        self.assertVec(epoch.vec.sod, epoch.sod, values, tz=tz, offset=offset)
+        self.assertVec(
+          epoch.vec.sod, epoch.sod, values,
+          tz=tz, offset=offset, boundary=dict(hour=4))
+        self.assertVec(
+          epoch.vec.sow, epoch.sow, values, tz=tz, offset=offset, day=6)
+        self.assertVec(epoch.vec.som, epoch.som, values, tz=tz, offset=offset)
+        self.assertVec(epoch.vec.soy, epoch.soy, values, tz=tz, offset=offset)
+    ts = epoch.parseZulu('2024-10-27T00:30:00Z')
+    self.assertEqual(
+      epoch.vec.sod([ts - 86400, ts], 'Atlantic/Azores').tolist(),
+      [epoch.parseZulu('2024-10-26T00:00:00Z'),
+       epoch.parseZulu('2024-10-27T01:00:00Z')])
+    self.assertEqual(
+      epoch.vec.sow([ts - 86400, ts], 'Atlantic/Azores', day=6).tolist(),
+      [epoch.parseZulu('2024-10-20T00:00:00Z'),
+       epoch.parseZulu('2024-10-27T01:00:00Z')])
+
+  #----------------------------------------------------------------------------
+  def test_som(self):
+    import epoch, epoch.vec
+    values = sample()
+    for tz in ZONES:
+      for offset in (None, 1, -13, 28):
+        self.assertVec(epoch.vec.som, epoch.som, values, tz=tz, offset=offset)
+      self.assertVec(
+        epoch.vec.som, epoch.som, values, tz=tz, replace=dict(day=15, hour=2))
+
+  #----------------------------------------------------------------------------
+  def test_soy(self):
+    import epoch, epoch.vec
+    values = sample()
+    for tz in ZONES:
+      for offset in (None, 1, -4):
+        self.assertVec(epoch.vec.soy, epoch.soy, values, tz=tz, offset=offset)
+
+  #----------------------------------------------------------------------------
+  def test_bucketize(self):
+    import epoch, epoch.vec
+    values = np.array(sample())
+    for tz in ZONES:
+      for period, func, kw in (
+          ('day', epoch.sod, dict()),
+          ('day', epoch.sod, dict(boundary=dict(hour=4))),
+          ('week', epoch.sow, dict(day=6)),
+          ('month', epoch.som, dict()),
+          ('year', epoch.soy, dict())):
+        starts, idx, counts = epoch.vec.bucketize(
+          values, period, tz=tz, counts=True, **kw)
+        self.assertEqual(idx.dtype, np.int64)
+        self.assertEqual(starts[idx].tolist(), [func(ts, tz=tz, **kw) for ts in values])
+        self.assertEqual(idx.min(), 0)
+        self.assertEqual(len(starts), idx.max() + 1)
+        self.assertEqual(counts.sum(), len(values))
+        self.assertEqual(counts.tolist(), np.bincount(idx).tolist())
+    for tz in ('Atlantic/Azores', 'America/Havana'):
+      values = np.array(straddle(tz))
+      for period, func, kw in (
+          ('day', epoch.sod, dict()),
+          ('day', epoch.sod, dict(boundary=dict(hour=4))),
+          ('week', epoch.sow, dict(day=6))):
+        starts, idx = epoch.vec.bucketize(values, period, tz=tz, **kw)
+        self.assertEqual(starts[idx].tolist(), [func(ts, tz=tz, **kw) for ts in values])
+    starts, idx = epoch.bucketize(
+      [1446303600, 1446476400, 1446303601], 'day', tz='America/New_York')
+    self.assertEqual(starts.tolist(), [1446264000, 1446350400, 1446440400])
+    self.assertEqual(idx.tolist(), [0, 2, 0])
+    starts, idx, counts = epoch.bucketize(np.zeros((0,)), 'week', counts=True)
+    self.assertEqual((len(starts), len(idx), len(counts)), (0, 0, 0))
+    with self.assertRaises(ValueError):
+      epoch.bucketize(values, 'fortnight')
+    with self.assertRaises(ValueError):
+      epoch.bucketize(values, 'month', day=1)
+
+  #----------------------------------------------------------------------------
+  def test_ts2age(self):
+    import epoch, epoch.vec
+    values = sample(lo=-1000000000, hi=2000000000)
+    origins = sample(lo=-1000000000, hi=2000000000, seed=23)
+    for tz in ZONES:
+      self.assertEqual(
+        epoch.vec.ts2age(np.array(values), np.array(origins), tz=tz).tolist(),
+        [epoch.ts2age(ts, origin, tz=tz) for ts, origin in zip(values, origins)])
+      self.assertEqual(
+        epoch.vec.ts2age(np.array(values), 1234567890.5, tz=tz).tolist(),
+        [epoch.ts2age(ts, 1234567890.5, tz=tz) for ts in values])
+    self.assertEqual(
+      epoch.vec.ts2age([epoch.parse('2009-02-13T23:31:30Z')],
+                       origin=epoch.parse('2008-02-13T23:31:30Z')).tolist(),
+      [1.0])
+
+  #----------------------------------------------------------------------------
+  def test_age2ts(self):
+    import epoch, epoch.vec
+    rnd = random.Random(5)
+    ages = [rnd.uniform(-60, 60) for idx in range(300)] + [0, 2.5, -1 / 24.0]
+    origins = sample(count=len(ages), lo=-1000000000, hi=2000000000)
+    for tz in ZONES:
+      expect, valid = [], []
+      for age, origin in zip(ages, origins):
+        try:
+          expect.append(epoch.age2ts(age, origin, tz=tz))
+          valid.append(True)
+        except ValueError:
+          valid.append(False)
+      valid = np.array(valid)
+      self.assertEqual(
+        epoch.vec.age2ts(np.array(ages)[valid], np.array(origins)[valid], tz=tz).tolist(),
+        expect)
+    self.assertEqual(
+      epoch.vec.age2ts([2.5, -1], origin=epoch.parse('2008-02-13T23:31:30Z')).tolist(),
+      [epoch.parse('2010-08-13T23:31:30Z'), epoch.parse('2007-02-13T23:31:30Z')])
+    with self.assertRaises(ValueError):
+      epoch.vec.age2ts([0, 1], origin=epoch.parse('2008-02-29T12:00:00Z'))
+
+  #----------------------------------------------------------------------------
+  def test_zulu(self):
+    import epoch, epoch.vec
+    values = sample(lo=-2000000000, hi=4000000000) + [0, -0.5, 1.9996, 86399.9999]
+    for ms in (True, False):
+      expect = [epoch.zulu(ts, ms=ms) for ts in values]
+      self.assertEqual(epoch.vec.zulu(np.array(values), ms=ms).tolist(), expect)
+      self.assertEqual(epoch.zulu_many(np.array(values), ms=ms).tolist(), expect)
+      buf = bytearray(len(values) * 24)
+      size = epoch.zulu_many(np.array(values), ms=ms, out=buf)
+      self.assertEqual(bytes(buf[:size]), ''.join(expect).encode('ascii'))
+    self.assertEqual(
+      epoch.vec.zulu(np.array([[1446303600.4], [1446336000]])).tolist(),
+      [['2015-10-31T15:00:00.400Z'], ['2015-11-01T00:00:00.000Z']])
+
+  #----------------------------------------------------------------------------
+  def test_parseZulu(self):
+    import epoch, epoch.vec
+    values = [epoch.zulu(ts, ms=bool(idx % 2))
+              for idx, ts in enumerate(sample(lo=-30000000000, hi=250000000000))]
+    values += ['20151031T150000.0006Z', '2015-10-31T15:00:00.6Z', '1446303600']
+    expect = [epoch.parse(val) for val in values]
+    self.assertEqual(epoch.vec.parseZulu(np.array(values)).tolist(), expect)
+    self.assertEqual(epoch.vec.parseZulu(np.array(values, dtype='S')).tolist(), expect)
+    self.assertEqual(epoch.parse_many(np.array(values)).tolist(), expect)
+    self.assertEqual(epoch.parse_many(values, numpy=True).tolist(), expect)
+    self.assertEqual(
+      epoch.vec.parseZulu(np.array([['2015-10-31T15:00:00Z']], dtype='S20')).tolist(),
+      [[1446303600]])
+    with self.assertRaises(ValueError):
+      epoch.vec.parseZulu(np.array(['2015-10-31T15:00:00Z', '2015-02-29T15:00:00Z']))
+    for dtype in ('U', 'S'):
+      with self.assertRaises((SyntaxError, ValueError)):
+        epoch.vec.parseZulu(
+          np.array(['2015-10-31T15:00:00Z', '2015-01-01T00:00:00.123Zjunk'], dtype=dtype))
+
+  #----------------------------------------------------------------------------
+  def test_fields(self):
+    import epoch, epoch.vec
+    values = sample(lo=-2000000000, hi=4000000000) + [0, -0.5, 1.9999996]
+    which = epoch.vec.FIELDS + ('microsecond', 'dayofyear', 'offset')
+    for tz in ZONES + ('Etc/GMT+5',):
+      result = epoch.fields(np.array(values), tz=tz, which=which)
+      self.assertEqual([arr.dtype for arr in result], [np.int64] * len(which))
+      for idx, ts in enumerate(values):
+        dt = epoch.ts2dt(ts, tz)
+        self.assertEqual(
+          tuple(arr[idx] for arr in result),
+          (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second,
+           dt.weekday(), dt.microsecond, dt.timetuple().tm_yday,
+           dt.utcoffset().total_seconds()), (tz, ts))
+    self.assertEqual(
+      epoch.fields(np.array([[1446303600]]), 'America/New_York', 'hour').tolist(), [[11]])
+    self.assertEqual(len(epoch.fields([0, 1])), 7)
+    with self.assertRaises(ValueError):
+      epoch.fields([0], which=('hour', 'fortnight'))
+
+  #----------------------------------------------------------------------------
+  def test_types(self):
+    import epoch, epoch.vec
+    ints = np.array([1446303600, 1446390000, 1446476400], dtype=np.int64)
+    self.assertEqual(
+      epoch.vec.sod(ints, tz='America/New_York').tolist(),
+      [1446264000, 1446350400, 1446440400])
+    self.assertEqual(epoch.vec.sod(np.zeros((2, 0))).shape, (2, 0))
+    self.assertEqual(epoch.vec.som(ints.reshape(3, 1)).shape, (3, 1))
+    with self.assertRaises(ValueError):
+      epoch.vec.sod(np.array([1446303600, np.nan]))
+    with self.assertRaises(TypeError):
+      epoch.vec.sod(np.array(['2015-10-31T15:00:00Z']))
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
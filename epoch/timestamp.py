@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+
+'''
+A compact epoch timestamp value type with lazily computed local
+calendar fields.
+'''
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+# tzinfo => the canonical tzinfo of its timezone (see `_intern`)
+_zones                  = dict()
+
+#------------------------------------------------------------------------------
+def _intern(tz):
+  # returns a single shared tzinfo object for each timezone, so that
+  # e.g. the per-period tzinfos that pytz attaches to `datetime`
+  # objects all map to the same reference.
+  tz = epoch.getTz(tz)
+  try:
+    return _zones[tz]
+  except KeyError:
+    pass
+  index = epoch.getTzIndex(tz)
+  ret = _zones[tz] = _zones.setdefault(index.zone, index.zone) \
+    if index is not None else tz
+  return ret
+
+#------------------------------------------------------------------------------
+def _field(index, doc):
+  # returns a read-only property of item `index` of `Timestamp._civil()`
+  return property(lambda self: self._civil()[index], doc=doc)
+
+#------------------------------------------------------------------------------
+class Timestamp(object):
+  '''
+  An immutable epoch timestamp in timezone `tz`, which is stored as an
+  integer number of microseconds since 1970/01/01 (rounded exactly as
+  :func:`epoch.ts2dt` rounds) plus a reference to a shared tzinfo
+  object. `ts` can be an epoch timestamp, another Timestamp, anything
+  accepted by :func:`epoch.parse` or None for the current time.
+
+  The local calendar fields (:attr:`year`, :attr:`month`, etc.) are
+  computed on first access, without a `datetime`, and then cached;
+  the :meth:`sod`, :meth:`sow`, :meth:`som`, :meth:`soy` and
+  :meth:`replace` methods are computed from them and return new
+  Timestamp objects in the same timezone, with results identical to
+  the corresponding `epoch` functions.
+  '''
+
+  __slots__ = ( '_us', '_tz', '_fields' )
+
+  #----------------------------------------------------------------------------
+  def __init__(self, ts=None, tz=None):
+    if isinstance(ts, Timestamp):
+      self._us      = ts._us
+      self._tz      = _intern(tz) if tz is not None else ts._tz
+      self._fields  = ts._fields if self._tz is ts._tz else None
+      return
+    if ts is None:
+      ts = epoch.now()
+    elif not isinstance(ts, epoch._INTEGER_TYPES + (float,)):
+      ts = epoch.parse(ts, tz)
+    sec, usec = epoch._splitTs(ts)
+    self._us      = sec * 1000000 + usec
+    self._tz      = _intern(tz)
+    self._fields  = None
+
+  #----------------------------------------------------------------------------
+  @classmethod
+  def _make(cls, us, tz):
+    ret = cls.__new__(cls)
+    ret._us     = us
+    ret._tz     = tz
+    ret._fields = None
+    return ret
+
+  #----------------------------------------------------------------------------
+  @property
+  def ts(self):
+    '''
+    The float epoch timestamp (in seconds).
+    '''
+    sec, usec = divmod(self._us, 1000000)
+    return float(sec) + ( usec / 1000000.0 )
+
+  #----------------------------------------------------------------------------
+  @property
+  def us(self):
+    '''
+    The integer number of microseconds since 1970/01/01.
+    '''
+    return self._us
+
+  #----------------------------------------------------------------------------
+  @property
+  def tz(self):
+    '''
+    The `datetime.tzinfo` of this timestamp's timezone.
+    '''
+    return self._tz
+
+  #----------------------------------------------------------------------------
+  def _civil(self):
+    # returns (and caches) the local (year, month, day, hour, minute,
+    # second, days since 1970/01/01, UTC offset)
+    ret = self._fields
+    if ret is None:
+      sec = self._us // 1000000
+      local = epoch._ts2local(sec, self._tz)
+      days, tod = divmod(local, 86400)
+      ret = self._fields = epoch._days2civil(days) \
+        + ( tod // 3600, tod // 60 % 60, tod % 60, days, local - sec )
+    return ret
+
+  year        = _field(0, 'The local year.')
+  month       = _field(1, 'The local month (1-12).')
+  day         = _field(2, 'The local day of the month.')
+  hour        = _field(3, 'The local hour (0-23).')
+  minute      = _field(4, 'The local minute.')
+  second      = _field(5, 'The local second.')
+  offset      = _field(7, 'The UTC offset, in seconds.')
+
+  #----------------------------------------------------------------------------
+  @property
+  def microsecond(self):
+    '''
+    The microsecond (0-999999).
+    '''
+    return self._us % 1000000
+
+  #----------------------------------------------------------------------------
+  def weekday(self):
+    '''
+    Returns the local day of the week, where Monday is 0 and Sunday
+    is 6 (as :meth:`datetime.datetime.weekday`).
+    '''
+    # note: 1970/01/01 was a thursday
+    return ( self._civil()[6] + 3 ) % 7
+
+  #----------------------------------------------------------------------------
+  def isoweekday(self):
+    '''
+    Returns the local ISO day of the week, where Monday is 1 and
+    Sunday is 7.
+    '''
+    return self.weekday() + 1
+
+  #----------------------------------------------------------------------------
+  def datetime(self):
+    '''
+    Returns this timestamp as a timezone-aware `datetime.datetime`.
+    '''
+    return epoch.ts2dt(self.ts, self._tz)
+
+  #----------------------------------------------------------------------------
+  def zulu(self, ms=True):
+    '''
+    Returns this timestamp as a zulu string (see :func:`epoch.zulu`).
+    '''
+    return epoch.zulu(self.ts, ms=ms)
+
+  #----------------------------------------------------------------------------
+  def _resolve(self, fields, replace):
+    # returns the Timestamp of the local `fields` after `replace`, as
+    # `epoch.dtreplace` resolves it, or None if `datetime` would reject
+    # it.
+    ret = epoch._wallResult(fields, replace)
+    if ret is None:
+      return None
+    local, usec = ret
+    return self._make(epoch._local2ts(local, self._tz) * 1000000 + usec, self._tz)
+
+  #----------------------------------------------------------------------------
+  def _start(self, days, replace):
+    # returns the Timestamp of the local midnight that starts `days`
+    # after `replace`, or None
+    if not epoch._MINDAYS <= days <= epoch._MAXDAYS:
+      return None
+    return self._resolve(list(epoch._days2civil(days)) + [0, 0, 0, 0], replace)
+
+  #----------------------------------------------------------------------------
+  def _fallback(self, func, **kw):
+    # computes the period with the `epoch` function `func`, which
+    # raises the appropriate exception for invalid parameters
+    sec, usec = epoch._splitTs(func(self.ts, tz=self._tz, **kw))
+    return self._make(sec * 1000000 + usec, self._tz)
+
+  #----------------------------------------------------------------------------
+  def sod(self, offset=None, replace=None, boundary=None):
+    '''
+    Returns the start of this timestamp's local day (see
+    :func:`epoch.sod`).
+    '''
+    fields = self._civil()
+    days = fields[6]
+    ret = None
+    if boundary:
+      edge = self._resolve(list(fields[:6]) + [self.microsecond], boundary)
+      if edge is not None and self._us < edge._us:
+        days = epoch._ts2local(self._us // 1000000 - 43200, self._tz) // 86400
+    if not boundary or edge is not None:
+      ret = self._start(days + int(offset or 0), replace)
+    if ret is None:
+      return self._fallback(
+        epoch.sod, offset=offset, replace=replace, boundary=boundary)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def sow(self, offset=None, day=None, replace=None):
+    '''
+    Returns the start of this timestamp's local week (see
+    :func:`epoch.sow`).
+    '''
+    days = self._civil()[6]
+    weekday = ( days + 3 ) % 7
+    first = min(max(int(day or 0), 0), 6)
+    days += first - weekday if first <= weekday else first - weekday - 7
+    ret = None
+    if days >= epoch._MINDAYS:
+      ret = self._start(days + int(offset or 0) * 7, replace)
+    if ret is None:
+      return self._fallback(epoch.sow, offset=offset, day=day, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def som(self, offset=None, replace=None):
+    '''
+    Returns the start of this timestamp's local month (see
+    :func:`epoch.som`).
+    '''
+    fields = self._civil()
+    year, month = divmod(fields[0] * 12 + fields[1] - 1 + int(offset or 0), 12)
+    ret = self._resolve([year, month + 1, 1, 0, 0, 0, 0], replace)
+    if ret is None:
+      return self._fallback(epoch.som, offset=offset, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def soy(self, offset=None, replace=None):
+    '''
+    Returns the start of this timestamp's local year (see
+    :func:`epoch.soy`).
+    '''
+    year = self._civil()[0] + int(offset or 0)
+    ret = self._resolve([year, 1, 1, 0, 0, 0, 0], replace)
+    if ret is None:
+      return self._fallback(epoch.soy, offset=offset, replace=replace)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def replace(self, **kw):
+    '''
+    Returns a new Timestamp with the specified local fields (`year`,
+    `month`, `day`, `hour`, `minute`, `second` and/or `microsecond`)
+    replaced (see :func:`epoch.tsreplace`).
+    '''
+    ret = self._resolve(list(self._civil()[:6]) + [self.microsecond], kw)
+    if ret is None:
+      return self._fallback(epoch.tsreplace, **kw)
+    return ret
+
+  #----------------------------------------------------------------------------
+  def astz(self, tz):
+    '''
+    Returns the same instant in timezone `tz`.
+    '''
+    return self._make(self._us, _intern(tz))
+
+  #----------------------------------------------------------------------------
+  def __float__(self):
+    return self.ts
+
+  #----------------------------------------------------------------------------
+  def __int__(self):
+    return self._us // 1000000
+
+  #----------------------------------------------------------------------------
+  def __hash__(self):
+    return hash(self._us)
+
+  #----------------------------------------------------------------------------
+  def __eq__(self, other):
+    if isinstance(other, Timestamp):
+      return self._us == other._us
+    return NotImplemented
+
+  #----------------------------------------------------------------------------
+  def __ne__(self, other):
+    if isinstance(other, Timestamp):
+      return self._us != other._us
+    return NotImplemented
+
+  #----------------------------------------------------------------------------
+  def __lt__(self, other):
+    if isinstance(other, Timestamp):
+      return self._us < other._us
+    return NotImplemented
+
+  #----------------------------------------------------------------------------
+  def __le__(self, other):
+    if isinstance(other, Timestamp):
+      return self._us <= other._us
+    return NotImplemented
+
+  #----------------------------------------------------------------------------
+  def __gt__(self, other):
+    if isinstance(other, Timestamp):
+      return self._us > other._us
+    return NotImplemented
+
+  #----------------------------------------------------------------------------
+  def __ge__(self, other):
+    if isinstance(other, Timestamp):
+      return self._us >= other._us
+    return NotImplemented
+
+  #----------------------------------------------------------------------------
+  def __reduce__(self):
+    return ( _restore, ( self._us, self._tz ) )
+
+  #----------------------------------------------------------------------------
+  def __repr__(self):
+    zone = getattr(self._tz, 'zone', None) or getattr(self._tz, 'key', None) \
+      or str(self._tz)
+    return 'Timestamp(%r, tz=%r)' % (self.zulu(), zone)
+
+#------------------------------------------------------------------------------
+def _restore(us, tz):
+  return Timestamp._make(us, _intern(tz))
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Compiled timezone transition indexes.
+
+A :class:`TzIndex` flattens a timezone's UTC transition instants and
+the UTC offsets that apply from each of them into flat arrays that
+are searched with :func:`bisect.bisect_right`, which allows
+converting epoch timestamps between UTC and local "wall clock" time
+in O(log n) without creating any `datetime` objects.
+'''
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+
+#------------------------------------------------------------------------------
+
+_EPOCH                  = datetime(1970, 1, 1)
+
+#------------------------------------------------------------------------------
+def _seconds(delta):
+  return delta.days * 86400 + delta.seconds
+
+#------------------------------------------------------------------------------
+class TzIndex(object):
+  '''
+  A compiled transition index for a single timezone. The following
+  attributes are available:
+
+  * `zone`: the `datetime.tzinfo` object that this index was built
+    from.
+
+  * `times`: a sorted `array('q')` of the UTC epoch timestamps at
+    which each period starts; the first period extends infinitely
+    into the past.
+
+  * `offsets`: an `array('q')` of the UTC offsets, in seconds, of
+    each period.
+
+  * `dst`: an `array('b')` of flags indicating whether or not each
+    period is a daylight savings period.
+
+  * `names`: a tuple of the timezone abbreviations of each period.
+
+  * `tzinfos`: a tuple of the `datetime.tzinfo` objects to attach to
+    a `datetime` in each period.
+  '''
+
+  __slots__ = ('zone', 'times', 'offsets', 'dst', 'names', 'tzinfos')
+
+  #----------------------------------------------------------------------------
+  def __init__(self, zone, times, offsets, dst, names, tzinfos):
+    self.zone     = zone
+    self.times    = array('q', times)
+    self.offsets  = array('q', offsets)
+    self.dst      = array('b', dst)
+    self.names    = tuple(names)
+    self.tzinfos  = tuple(tzinfos)
+
+  #----------------------------------------------------------------------------
+  @property
+  def fixed(self):
+    '''
+    True if this timezone has a fixed UTC offset, i.e. no transitions.
+    '''
+    return len(self.times) == 1
+
+  #----------------------------------------------------------------------------
+  def period(self, ts):
+    '''
+    Returns the index of the period that contains the UTC epoch
+    timestamp `ts`.
+    '''
+    return max(0, bisect_right(self.times, ts) - 1)
+
+  #----------------------------------------------------------------------------
+  def utcoffset(self, ts):
+    '''
+    Returns the UTC offset, in seconds, that is in effect at the UTC
+    epoch timestamp `ts`.
+    '''
+    return self.offsets[max(0, bisect_right(self.times, ts) - 1)]
+
+  #----------------------------------------------------------------------------
+  def toLocal(self, ts):
+    '''
+    Converts the UTC epoch timestamp `ts` to local "wall clock"
+    seconds since 1970/01/01 (i.e. as if the local time were UTC).
+    '''
+    return ts + self.offsets[max(0, bisect_right(self.times, ts) - 1)]
+
+  #----------------------------------------------------------------------------
+  def localize(self, local):
+    '''
+    Converts the local "wall clock" seconds since 1970/01/01 `local`
+    to a UTC epoch timestamp, and returns a tuple of that timestamp
+    and the index of the period that applies to it.
+
+    Non-existent and ambiguous local times are resolved exactly as
+    :meth:`pytz.tzinfo.DstTzInfo.localize` does with the default
+    ``is_dst=False``: times in a gap are shifted forward by the gap
+    size and ambiguous times resolve to the non-DST (or, failing that,
+    the later) candidate.
+    '''
+    times = self.times
+    offsets = self.offsets
+    if len(times) == 1:
+      return ( local - offsets[0], 0 )
+    cands = {}
+    for probe in ( local - 86400, local + 86400 ):
+      offset = offsets[max(0, bisect_right(times, probe) - 1)]
+      utc = local - offset
+      idx = max(0, bisect_right(times, utc) - 1)
+      if offsets[idx] == offset:
+        cands[utc] = idx
+    if len(cands) == 1:
+      return cands.popitem()
+    if not cands:
+      # note: 21600 is 6h, which is what pytz uses to step out of a
+      #       gap... the resulting period is the one before the gap.
+      utc, idx = self.localize(local - 21600)
+      return ( utc + 21600, idx )
+    std = [item for item in cands.items() if not self.dst[item[1]]]
+    if len(std) == 1:
+      return std[0]
+    return max(std or cands.items())
+
+#------------------------------------------------------------------------------
+def build(zone):
+  '''
+  Returns a :class:`TzIndex` for the `datetime.tzinfo` object `zone`,
+  or None if `zone` is not of a supported type. Supported types are
+  pytz timezones and any other timezone with a fixed UTC offset
+  (i.e. one whose ``utcoffset(None)`` is not None).
+  '''
+  trans = getattr(zone, '_utc_transition_times', None)
+  infos = getattr(zone, '_transition_info', None)
+  tzinfos = getattr(zone, '_tzinfos', None)
+  if trans and infos and tzinfos:
+    times = [_seconds(tm - _EPOCH) for tm in trans]
+    return TzIndex(
+      zone,
+      times     = times,
+      offsets   = [_seconds(info[0]) for info in infos],
+      dst       = [1 if info[1] else 0 for info in infos],
+      names     = [info[2] for info in infos],
+      tzinfos   = [tzinfos[info] for info in infos],
+    )
+  try:
+    offset = zone.utcoffset(None)
+  except Exception:
+    return None
+  if offset is None:
+    return None
+  dst = zone.dst(None)
+  return TzIndex(
+    zone,
+    times     = [-(2 ** 62)],
+    offsets   = [_seconds(offset)],
+    dst       = [1 if dst else 0],
+    names     = [zone.tzname(None)],
+    tzinfos   = [zone],
+  )
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
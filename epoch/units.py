@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Integer-precision epoch timestamps.
+
+An :class:`IntegerUnit` provides versions of :func:`epoch.now`,
+:func:`epoch.zulu`, :func:`epoch.parse`, :func:`epoch.sod`,
+:func:`epoch.sow`, :func:`epoch.som` and :func:`epoch.soy` that
+operate on integer counts of a fixed fraction of a second since
+1970/01/01 (such as the values of an int64 column), which round-trip
+exactly. See :mod:`epoch.ns` and :mod:`epoch.us`.
+'''
+
+import re
+from datetime import datetime
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+_zones                  = dict()
+_zulu_cre = re.compile(r'^(\d{4})-?(\d{2})-?(\d{2})T(\d{2}):?(\d{2}):?(\d{2})(?:\.(\d+))?Z$')
+
+#------------------------------------------------------------------------------
+class IntegerUnit(object):
+  '''
+  The epoch functions for integer timestamps that count `scale` units
+  per second, where `scale` is a power of ten (e.g. ``1000000000`` for
+  nanoseconds). Period starts are computed with integer arithmetic on
+  the local "wall clock" seconds (carrying the sub-second part
+  separately), so values are never rounded.
+  '''
+
+  #----------------------------------------------------------------------------
+  def __init__(self, scale):
+    self.scale    = int(scale)
+    self.digits   = len(str(self.scale)) - 1
+    if self.scale != 10 ** self.digits:
+      raise ValueError('`scale` must be a power of ten, not %r' % (scale,))
+
+  #----------------------------------------------------------------------------
+  def now(self):
+    '''
+    Returns the current epoch time as an integer, from the active
+    clock (see :func:`epoch.setClock`).
+    '''
+    return epoch._nowNs() * self.scale // 1000000000
+
+  #----------------------------------------------------------------------------
+  def fromts(self, ts):
+    '''
+    Converts the float epoch timestamp `ts` (in seconds) to an integer
+    timestamp, rounding to the nearest unit.
+    '''
+    if ts is None:
+      return None
+    return int(round(ts * self.scale))
+
+  #----------------------------------------------------------------------------
+  def tots(self, value):
+    '''
+    Converts the integer timestamp `value` to a float epoch timestamp
+    (in seconds). Note that floats cannot represent nanoseconds at
+    current epoch magnitudes.
+    '''
+    if value is None:
+      return None
+    sec, rem = divmod(value, self.scale)
+    return sec + rem / float(self.scale)
+
+  #----------------------------------------------------------------------------
+  def zulu(self, value=None, digits=None):
+    '''
+    Returns the integer timestamp `value` (or the current time if None
+    or not provided) as an ISO 8601 Combined string in zulu time with
+    `digits` fractional second digits, which defaults to the full
+    precision of this unit (e.g. 9 for nanoseconds). Digits beyond the
+    unit's precision are zero, and the value is truncated (not
+    rounded) to fewer digits. A `digits` of zero omits the fraction.
+    '''
+    if value is None:
+      value = self.now()
+    digits = self.digits if digits is None else int(digits)
+    sec, rem = divmod(int(value), self.scale)
+    prefix = epoch._zulu_second
+    if prefix[0] != sec:
+      prefix = epoch._zuluPrefix(sec)
+    if not digits:
+      return prefix[1] + 'Z'
+    if digits <= self.digits:
+      frac = rem // 10 ** ( self.digits - digits )
+    else:
+      frac = rem * 10 ** ( digits - self.digits )
+    return '%s.%0*dZ' % (prefix[1], digits, frac)
+
+  #----------------------------------------------------------------------------
+  def parse(self, text):
+    '''
+    Extracts an integer timestamp from `text`, which may be:
+
+    * None, which is returned as-is
+    * an integer, which is taken to already be in this unit
+    * a float, which is taken to be in seconds (see :meth:`fromts`)
+    * an all-digits string, which is taken to be in this unit
+    * an ISO 8601 Combined string in zulu time (as generated by
+      :meth:`zulu` or :func:`epoch.zulu`) with any number of
+      fractional second digits, which are truncated to this unit's
+      precision.
+
+    A SyntaxError is raised for unparseable strings.
+    '''
+    if text is None or isinstance(text, epoch._INTEGER_TYPES):
+      return text
+    if isinstance(text, float):
+      return self.fromts(text)
+    if isinstance(text, bytes) and not isinstance(text, str):
+      text = text.decode('ascii')
+    ret = epoch._zuluFields(text)
+    if ret is not None:
+      return ret[0] * self.scale + ret[1] * self.scale // 1000
+    if text.isdigit() or ( text[:1] == '-' and text[1:].isdigit() ):
+      return int(text)
+    res = _zulu_cre.match(text)
+    if not res:
+      raise SyntaxError(
+        '%r is not a valid ISO 8601 Combined date/time string' % (text,))
+    fields = [int(val) for val in res.groups()[:6]]
+    # validate the date and time
+    datetime(*fields)
+    ret = epoch._civil2days(*fields[:3]) * 86400 \
+      + fields[3] * 3600 + fields[4] * 60 + fields[5]
+    frac = ( res.group(7) or '' )[:self.digits]
+    return ret * self.scale + int(frac.ljust(self.digits, '0') or 0)
+
+  #----------------------------------------------------------------------------
+  def _split(self, value):
+    # returns the (UTC seconds, microseconds) of the integer timestamp
+    # `value` (or now). periods only ever start on microsecond
+    # boundaries, so the timestamp is only needed to that precision.
+    if value is None:
+      value = self.now()
+    sec, rem = divmod(int(value), self.scale)
+    return ( sec, rem * 1000000 // self.scale )
+
+  #----------------------------------------------------------------------------
+  def _start(self, days, zone, replace):
+    # returns the integer timestamp of the local midnight that starts
+    # `days` (since 1970/01/01) after `replace`, or None if it cannot
+    # be done arithmetically (see `epoch._wallResult`).
+    if days is None or not epoch._MINDAYS <= days <= epoch._MAXDAYS:
+      return None
+    local, usec = days * 86400, 0
+    if replace:
+      wall = epoch._wallResult(epoch._fixedFields(days), replace)
+      if wall is None:
+        return None
+      local, usec = wall
+    return zone.toUtc(local) * self.scale + usec * self.scale // 1000000
+
+  #----------------------------------------------------------------------------
+  def _period(self, func, value, tz, replace, kw):
+    # evaluates the float period function `func` for the integer
+    # timestamp `value`, adding any replaced microseconds exactly. this
+    # is only used for what the integer arithmetic does not support
+    # (such as out-of-range dates), so that the appropriate exception
+    # is raised.
+    sec, usec = self._split(value)
+    ts = sec + usec / 1000000.0 if usec else sec
+    usec = 0
+    if replace and replace.get('microsecond'):
+      replace = dict(replace)
+      usec = replace.pop('microsecond')
+      replace['microsecond'] = 0
+    ret = int(round(func(ts, tz, replace=replace, **kw))) * self.scale
+    return ret + usec * self.scale // 1000000
+
+  #----------------------------------------------------------------------------
+  def sod(self, value=None, tz=None, boundary=None, offset=None, replace=None):
+    '''
+    Integer version of :func:`epoch.sod`.
+    '''
+    if value is None:
+      value = self.now()
+    zone = _getZone(tz)
+    sec, usec = self._split(value)
+    days = zone.toLocal(sec) // 86400
+    if boundary:
+      edge = epoch._timeOfDay(boundary)
+      if edge is not None:
+        edge = epoch._wallResult(epoch._fixedFields(days), edge)
+      if edge is None:
+        days = None
+      elif ( sec - zone.toUtc(edge[0]) ) * 1000000 + usec < edge[1]:
+        # note: 43200 is 12h, exactly as in `epoch.sod`...
+        days = zone.toLocal(sec - 43200) // 86400
+    if days is not None:
+      days += int(offset or 0)
+    ret = self._start(days, zone, replace)
+    if ret is None:
+      ret = self._period(
+        epoch.sod, value, zone.tz, replace, dict(boundary=boundary, offset=offset))
+    return ret
+
+  #----------------------------------------------------------------------------
+  def sow(self, value=None, tz=None, offset=None, day=None, replace=None):
+    '''
+    Integer version of :func:`epoch.sow`.
+    '''
+    if value is None:
+      value = self.now()
+    zone = _getZone(tz)
+    days = zone.toLocal(self._split(value)[0]) // 86400
+    # note: 1970/01/01 was a thursday
+    weekday = ( days + 3 ) % 7
+    day = min(max(int(day or 0), 0), 6)
+    days += day - weekday if day <= weekday else day - weekday - 7
+    # note: the start of the week must itself be within range
+    ret = None
+    if days >= epoch._MINDAYS:
+      ret = self._start(days + int(offset or 0) * 7, zone, replace)
+    if ret is None:
+      ret = self._period(
+        epoch.sow, value, zone.tz, replace, dict(offset=offset, day=day))
+    return ret
+
+  #----------------------------------------------------------------------------
+  def som(self, value=None, tz=None, offset=None, replace=None):
+    '''
+    Integer version of :func:`epoch.som`.
+    '''
+    if value is None:
+      value = self.now()
+    zone = _getZone(tz)
+    days = zone.toLocal(self._split(value)[0]) // 86400
+    year, month, _ = epoch._days2civil(days)
+    year, month = divmod(year * 12 + month - 1 + int(offset or 0), 12)
+    ret = None
+    if 1 <= year <= 9999:
+      ret = self._start(epoch._civil2days(year, month + 1, 1), zone, replace)
+    if ret is None:
+      ret = self._period(epoch.som, value, zone.tz, replace, dict(offset=offset))
+    return ret
+
+  #----------------------------------------------------------------------------
+  def soy(self, value=None, tz=None, offset=None, replace=None):
+    '''
+    Integer version of :func:`epoch.soy`.
+    '''
+    if value is None:
+      value = self.now()
+    zone = _getZone(tz)
+    days = zone.toLocal(self._split(value)[0]) // 86400
+    year = epoch._days2civil(days)[0] + int(offset or 0)
+    ret = None
+    if 1 <= year <= 9999:
+      ret = self._start(epoch._civil2days(year, 1, 1), zone, replace)
+    if ret is None:
+      ret = self._period(epoch.soy, value, zone.tz, replace, dict(offset=offset))
+    return ret
+
+#------------------------------------------------------------------------------
+class _Zone(object):
+  # the integer local "wall clock" conversions of a timezone: by fixed
+  # offset arithmetic if it has no transitions, otherwise by its
+  # transition index (or, failing that, `datetime`).
+
+  __slots__ = ( 'tz', 'fixed', 'index', 'hint' )
+
+  #----------------------------------------------------------------------------
+  def __init__(self, tz):
+    self.tz     = tz
+    self.fixed  = epoch._fixedOffset(tz)
+    self.index  = epoch.getTzIndex(tz)
+    # the index of the most recently used transition period
+    self.hint   = 0
+
+  #----------------------------------------------------------------------------
+  def toLocal(self, sec):
+    # converts the integer UTC seconds `sec` to local seconds
+    if self.fixed is not None:
+      return sec + self.fixed
+    if self.index is None:
+      return epoch._ts2local(sec, self.tz)
+    idx = self.hint = self.index.period(sec)
+    return sec + self.index.offsets[idx]
+
+  #----------------------------------------------------------------------------
+  def toUtc(self, local):
+    # the inverse of `toLocal`, which resolves non-existent and
+    # ambiguous local times exactly as `datetime` localization does.
+    if self.fixed is not None:
+      return local - self.fixed
+    index = self.index
+    if index is None:
+      return epoch._local2ts(local, self.tz)
+    times = index.times
+    offsets = index.offsets
+    idx = self.hint
+    utc = local - offsets[idx]
+    # note: if the candidate is more than a day away from the edges of
+    #       its period, no other period can claim it, i.e. it is neither
+    #       ambiguous nor in a gap. the hinted period is tried first.
+    for attempt in range(2):
+      if times[idx] + 86400 <= utc \
+          and ( idx + 1 == len(times) or utc + 86400 < times[idx + 1] ):
+        return utc
+      idx = index.period(utc)
+      utc = local - offsets[idx]
+    return index.localize(local)[0]
+
+#------------------------------------------------------------------------------
+def _getZone(tz):
+  # returns the (cached) `_Zone` of `tz`, which can be anything that
+  # :func:`epoch.getTz` accepts. names are cached per backend (see
+  # :func:`epoch.setBackend`), and None (i.e. the default timezone) is
+  # not cached, since the default can change.
+  key = ( epoch._backend, tz )
+  try:
+    return _zones[key]
+  except KeyError:
+    pass
+  zone = epoch.getTz(tz)
+  ret = _zones.get(( epoch._backend, zone ))
+  if ret is None:
+    ret = _zones[( epoch._backend, zone )] = _Zone(zone)
+  if tz is not None:
+    _zones[key] = ret
+  return ret
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
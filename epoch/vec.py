@@ -0,0 +1,645 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# file: $Id$
+# auth: metagriffin <mg.github@metagriffin.net>
+# date: 2026/10/17
+# copy: (C) Copyright 2016-EOT metagriffin -- see LICENSE.txt
+#------------------------------------------------------------------------------
+# This software is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This software is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see http://www.gnu.org/licenses/.
+#------------------------------------------------------------------------------
+
+'''
+Vectorized (NumPy array) versions of `epoch` functions.
+
+Each function accepts a NumPy array (or anything `numpy.asarray`
+accepts) of epoch timestamps and returns a float64 array of the same
+shape. Rather than doing a datetime round trip per element, the
+period boundaries spanning the array's minimum and maximum values are
+computed once with the scalar functions, and the elements are then
+assigned to them with :func:`numpy.searchsorted`. The results are
+therefore identical to calling the scalar function per element
+(for timestamps of up to microsecond precision), including across DST
+transitions, and the cost of the scalar work is
+proportional to the number of periods spanned, not to the size of
+the array.
+
+This module requires `numpy`, which is an optional dependency of the
+`epoch` package.
+'''
+
+import numpy as np
+
+import epoch
+
+#------------------------------------------------------------------------------
+
+_MIDNIGHT               = dict(hour=0, minute=0, second=0, microsecond=0)
+_DAYSINMONTH            = np.array(
+  (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31), dtype=np.int64)
+FIELDS                  = (
+  'year', 'month', 'day', 'hour', 'minute', 'second', 'weekday')
+_EXTRAFIELDS            = ('microsecond', 'dayofyear', 'offset')
+_BUCKETS                = dict(
+  day   = epoch._sod,
+  week  = epoch._sow,
+  month = epoch._som,
+  year  = epoch._soy,
+)
+_ADVANCE                = {
+  epoch._sod: epoch._nextDay,
+  epoch._sow: epoch._nextWeek,
+  epoch._som: epoch._nextMonth,
+  epoch._soy: epoch._nextYear,
+}
+
+#------------------------------------------------------------------------------
+def _asarray(ts):
+  ts = np.asarray(ts)
+  if ts.dtype.kind not in 'iuf':
+    raise TypeError(
+      'expected an array of numeric epoch timestamps, not %r' % (ts.dtype,))
+  ts = ts.astype(np.float64, copy=False)
+  if ts.size and not np.isfinite(ts).all():
+    raise ValueError('epoch timestamp arrays cannot contain NaN or infinity')
+  return ts
+
+#------------------------------------------------------------------------------
+def _table(func, lo, hi, tz, before=0, after=0, **kw):
+  '''
+  Returns a sorted float64 array of the consecutive period starts, as
+  computed by the (uncached) scalar period function `func` and then
+  advanced incrementally (see :func:`epoch.iter_sod`), that span the
+  range [`lo`, `hi`] plus `before` additional periods before and
+  `after` additional periods after it.
+  '''
+  ret = []
+  extra = -1
+  periods = epoch._iterPeriods(
+    func, func(lo, tz, -before, **kw), None, tz, 1, _ADVANCE[func], **kw)
+  for start in periods:
+    ret.append(start)
+    if start > hi:
+      extra += 1
+      if extra >= after:
+        break
+  return np.array(ret, dtype=np.float64)
+
+#------------------------------------------------------------------------------
+def _locate(table, ts):
+  return np.maximum(np.searchsorted(table, ts, side='right') - 1, 0)
+
+#------------------------------------------------------------------------------
+def _replace(table, idx, tz, replace):
+  # note: the replacement is applied to the local midnight of each
+  #       period start (not to `ts2dt(start)`, which differs when
+  #       midnight falls in a DST gap) exactly as the scalar versions
+  #       do. it is done once per distinct period, not per element.
+  fields = dict(_MIDNIGHT)
+  fields.update(replace)
+  uniq, inverse = np.unique(idx, return_inverse=True)
+  values = np.array(
+    [epoch.tsreplace(table[i], tz=tz, **fields) for i in uniq],
+    dtype=np.float64)
+  return values[inverse.reshape(idx.shape)]
+
+#------------------------------------------------------------------------------
+def _settle(func, table, idx, ts, tz, shifts=(0,), **kw):
+  # locating `ts` in the sorted `table` assumes that each period start
+  # is before every timestamp in its period, which does not hold when
+  # a DST fall-back repeats local midnight and it resolves to the later
+  # instant (e.g. Atlantic/Azores on 2024/10/27): the timestamps up to
+  # `drop` seconds before such a start (where `drop` is how much the
+  # UTC offset fell by during the preceding day) are then located in
+  # the previous period. those few elements (plus the ones that are
+  # `shifts` seconds later, for day boundaries) are re-assigned with
+  # the (cached) scalar period function.
+  index = epoch.getTzIndex(tz)
+  if index is not None:
+    if index.fixed:
+      return idx
+    times = np.frombuffer(index.times, dtype=np.int64)
+    offsets = np.frombuffer(index.offsets, dtype=np.int64)
+    sec = table.astype(np.int64)
+    drops = offsets[
+      np.maximum(np.searchsorted(times, sec - 86400, side='right') - 1, 0)] \
+      - offsets[np.maximum(np.searchsorted(times, sec, side='right') - 1, 0)]
+  else:
+    drops = np.array(
+      [epoch._ts2local(int(start) - 86400, tz) + 86400
+       - epoch._ts2local(int(start), tz) for start in table],
+      dtype=np.int64)
+  rows = np.zeros(ts.shape, dtype=bool)
+  for start, drop in zip(table[drops > 0], drops[drops > 0]):
+    for shift in shifts:
+      rows |= ( ts >= start + shift - drop ) & ( ts < start + shift )
+  if not rows.any():
+    return idx
+  starts = np.array(
+    [epoch._cached(func, value, tz, None, None, **kw) for value in ts[rows]],
+    dtype=np.float64)
+  idx = idx.copy()
+  idx[rows] = _locate(table, starts)
+  return idx
+
+#------------------------------------------------------------------------------
+def _assign(func, ts, tz, offset=0, boundary=None, **kw):
+  # returns a tuple of the table of period starts spanning the
+  # non-empty float64 array `ts` and the index of each element's
+  # period (plus `offset`) in it.
+  lo = ts.min()
+  if boundary:
+    tod = epoch._timeOfDay(boundary)
+    if tod is None:
+      raise ValueError(
+        'vectorized `sod` only supports time-of-day boundaries, not %r'
+        % (boundary,))
+    lo -= 43200
+  table = _table(
+    func, lo, ts.max(), tz,
+    before=max(-offset, 0), after=max(offset, 0), **kw)
+  idx = _locate(table, ts)
+  if boundary:
+    cutoff = np.array(
+      [epoch.tsreplace(start, tz=tz, **tod) for start in table],
+      dtype=np.float64)
+    # note: just like `epoch.sod`, a timestamp before its day's boundary
+    #       belongs to the day 12 hours earlier...
+    idx = np.where(ts < cutoff[idx], _locate(table, ts - 43200), idx)
+    idx = _settle(
+      func, table, idx, ts, tz, (0, 43200), boundary=boundary, **kw)
+  else:
+    idx = _settle(func, table, idx, ts, tz, **kw)
+  return ( table, idx + offset )
+
+#------------------------------------------------------------------------------
+def _period(func, ts, tz, offset, replace, **kw):
+  tz = epoch.getTz(tz)
+  ts = _asarray(ts)
+  if not ts.size:
+    return ts.copy()
+  table, idx = _assign(func, ts, tz, int(offset or 0), **kw)
+  if replace:
+    return _replace(table, idx, tz, replace)
+  return table[idx]
+
+#------------------------------------------------------------------------------
+def sod(ts, tz=None, boundary=None, offset=None, replace=None):
+  '''
+  Vectorized version of :func:`epoch.sod`: returns an array of the
+  start of the day containing each timestamp in `ts`, relative to
+  timezone `tz`. The `boundary`, `offset` and `replace` parameters
+  have the same semantics as for :func:`epoch.sod`, with the
+  restriction that `boundary` must be a time of day (i.e. `hour`,
+  optionally followed by `minute`, `second` and `microsecond`).
+  '''
+  return _period(epoch._sod, ts, tz, offset, replace, boundary=boundary)
+
+#------------------------------------------------------------------------------
+def sow(ts, tz=None, offset=None, day=None, replace=None):
+  '''
+  Vectorized version of :func:`epoch.sow`: returns an array of the
+  start of the week containing each timestamp in `ts`, relative to
+  timezone `tz`. The `offset`, `day` and `replace` parameters have the
+  same semantics as for :func:`epoch.sow`.
+  '''
+  return _period(epoch._sow, ts, tz, offset, replace, day=day)
+
+#------------------------------------------------------------------------------
+def som(ts, tz=None, offset=None, replace=None):
+  '''
+  Vectorized version of :func:`epoch.som`: returns an array of the
+  start of the month containing each timestamp in `ts`, relative to
+  timezone `tz`. The `offset` and `replace` parameters have the same
+  semantics as for :func:`epoch.som`.
+  '''
+  return _period(epoch._som, ts, tz, offset, replace)
+
+#------------------------------------------------------------------------------
+def soy(ts, tz=None, offset=None, replace=None):
+  '''
+  Vectorized version of :func:`epoch.soy`: returns an array of the
+  start of the year containing each timestamp in `ts`, relative to
+  timezone `tz`. The `offset` and `replace` parameters have the same
+  semantics as for :func:`epoch.soy`.
+  '''
+  return _period(epoch._soy, ts, tz, offset, replace)
+
+#------------------------------------------------------------------------------
+def bucketize(ts, period='day', tz=None, boundary=None, day=None, counts=False):
+  '''
+  Assigns each timestamp in `ts` to the local calendar `period`
+  (``'day'``, ``'week'``, ``'month'`` or ``'year'``) that contains it
+  in timezone `tz`, and returns a tuple of:
+
+  * `starts`: a float64 array of the start of each consecutive period
+    from the one containing the smallest timestamp to the one
+    containing the largest (including any empty periods in between).
+
+  * `indices`: an int64 array, of the same shape as `ts`, of the index
+    into `starts` of each timestamp's period, i.e. ``starts[indices]``
+    is the same as calling :func:`sod` (or :func:`sow`, etc) on `ts`.
+
+  * `counts`: only included if `counts` is truthy, an int64 array of
+    the number of timestamps in each period.
+
+  The `boundary` parameter (for days) and the `day` parameter (for
+  weeks) have the same semantics as for :func:`sod` and :func:`sow`.
+  '''
+  try:
+    func = _BUCKETS[period]
+  except KeyError:
+    raise ValueError(
+      'unknown period %r (expected one of %s)'
+      % (period, ', '.join(sorted(_BUCKETS))))
+  kw = dict()
+  if boundary:
+    if func is not epoch._sod:
+      raise ValueError('`boundary` is only supported for daily buckets')
+    kw['boundary'] = boundary
+  if day is not None:
+    if func is not epoch._sow:
+      raise ValueError('`day` is only supported for weekly buckets')
+    kw['day'] = day
+  tz = epoch.getTz(tz)
+  ts = _asarray(ts)
+  if not ts.size:
+    starts, idx = np.zeros(0, dtype=np.float64), np.zeros(ts.shape, dtype=np.int64)
+  else:
+    table, idx = _assign(func, ts, tz, **kw)
+    first = idx.min()
+    starts, idx = table[first:idx.max() + 1], idx - first
+  if counts:
+    return ( starts, idx, np.bincount(idx.ravel(), minlength=len(starts)) )
+  return ( starts, idx )
+
+#------------------------------------------------------------------------------
+def _decompose(ts, tz):
+  '''
+  Returns a tuple of the integer UTC epoch seconds, microseconds and
+  UTC offsets (in seconds) of the timestamps in the float64 array
+  `ts` in timezone `tz`, rounded to the microsecond exactly as
+  :func:`epoch.ts2dt` does, or None if `tz` has no transition index.
+  '''
+  index = epoch.getTzIndex(tz)
+  if index is None:
+    return None
+  # note: `datetime.fromtimestamp` rounds the fraction half-to-even
+  sec = np.trunc(ts)
+  usec = np.round(( ts - sec ) * 1000000).astype(np.int64)
+  sec = sec.astype(np.int64)
+  sec += usec // 1000000
+  usec %= 1000000
+  times = np.frombuffer(index.times, dtype=np.int64)
+  offsets = np.frombuffer(index.offsets, dtype=np.int64)
+  offset = offsets[np.maximum(np.searchsorted(times, sec, side='right') - 1, 0)]
+  return ( sec, usec, offset )
+
+#------------------------------------------------------------------------------
+def _localFields(ts, tz):
+  # returns the local (year, month, day, seconds of day, microsecond)
+  # arrays and the UTC offsets of `ts`, or None (see `_decompose`).
+  parts = _decompose(ts, tz)
+  if parts is None:
+    return None
+  sec, usec, offset = parts
+  days, tod = np.divmod(sec + offset, 86400)
+  return _days2civil(days) + ( tod, usec, offset )
+
+#------------------------------------------------------------------------------
+def _split(fields):
+  # splits the seconds of day of `_localFields` into the time fields
+  year, month, day, tod, usec = fields[:5]
+  return ( year, month, day, tod // 3600, tod // 60 % 60, tod % 60, usec )
+
+#------------------------------------------------------------------------------
+def fields(ts, tz=None, which=FIELDS):
+  '''
+  Returns the local calendar fields of each timestamp in `ts` in
+  timezone `tz` as a tuple of int64 arrays (of the same shape as
+  `ts`), one per field name in `which`, or a single array if `which`
+  is a string. The available fields are:
+
+  * ``'year'``, ``'month'``, ``'day'``, ``'hour'``, ``'minute'``,
+    ``'second'`` and ``'microsecond'``
+  * ``'weekday'``: Monday is 0 through Sunday being 6
+  * ``'dayofyear'``: January 1st is 1
+  * ``'offset'``: the UTC offset, in seconds
+
+  The values are identical to those of :func:`epoch.ts2dt`, but the
+  UTC offsets are looked up in the timezone's transition index and
+  the civil date is computed arithmetically for the whole array.
+  '''
+  single = isinstance(which, str)
+  if single:
+    which = ( which, )
+  for name in which:
+    if name not in FIELDS and name not in _EXTRAFIELDS:
+      raise ValueError('unknown field: %r' % (name,))
+  tz = epoch.getTz(tz)
+  ts = _asarray(ts)
+  parts = _decompose(ts, tz)
+  if parts is None:
+    sec, usec, _ = _decompose(ts, epoch.getTz('UTC'))
+    offset = np.vectorize(
+      lambda val: epoch._ts2local(val, tz) - val, otypes=[np.int64])(sec)
+  else:
+    sec, usec, offset = parts
+  days, tod = np.divmod(sec + offset, 86400)
+  values = dict(microsecond=usec, offset=offset)
+  if set(which) & set(('year', 'month', 'day', 'dayofyear')):
+    values['year'], values['month'], values['day'] = _days2civil(days)
+  ret = []
+  for name in which:
+    if name not in values:
+      if name == 'hour':
+        values[name] = tod // 3600
+      elif name == 'minute':
+        values[name] = tod // 60 % 60
+      elif name == 'second':
+        values[name] = tod % 60
+      elif name == 'weekday':
+        # note: 1970/01/01 was a thursday
+        values[name] = ( days + 3 ) % 7
+      elif name == 'dayofyear':
+        values[name] = days - _civil2days(
+          values['year'], np.ones_like(days), np.ones_like(days)) + 1
+    ret.append(values[name])
+  return ret[0] if single else tuple(ret)
+
+#------------------------------------------------------------------------------
+def ts2age(ts, origin=None, tz=None):
+  '''
+  Vectorized version of :func:`epoch.ts2age`: returns a float64 array
+  of the age, in years, of each timestamp in `ts` relative to
+  `origin` (which defaults to the current time, and can be either a
+  single timestamp or an array that is broadcast against `ts`),
+  evaluated in timezone `tz`. The results are identical to the
+  scalar version's, which are computed from the differences of the
+  local date and time fields.
+  '''
+  if origin is None:
+    origin = epoch.now()
+  tz = epoch.getTz(tz)
+  ts, origin = np.broadcast_arrays(_asarray(ts), _asarray(origin))
+  lhs = _localFields(ts, tz)
+  if lhs is None:
+    return np.vectorize(epoch.ts2age, otypes=[np.float64])(ts, origin, tz)
+  rhs = _localFields(origin, tz)
+  diff = [lval - rval for lval, rval in zip(_split(lhs), _split(rhs))]
+  # note: the same operations in the same order as the scalar version,
+  #       which makes the results bit-for-bit identical.
+  year, month, day, hour, minute, second, usec = diff
+  ret = usec / 1000000.0
+  ret += second
+  ret /= 60.0
+  ret += minute
+  ret /= 60.0
+  ret += hour
+  ret /= 24.0
+  ret += day
+  ret /= ( epoch.DAYSPERYEAR / 12.0 )
+  ret += month
+  ret /= 12.0
+  ret += year
+  return ret
+
+#------------------------------------------------------------------------------
+def age2ts(age, origin=None, tz=None):
+  '''
+  Vectorized version of :func:`epoch.age2ts`: returns a float64 array
+  of the timestamp of each age (in years) in `age` relative to
+  `origin` (which defaults to the current time, and can be either a
+  single timestamp or an array that is broadcast against `age`),
+  evaluated in timezone `tz`. The results are identical to the scalar
+  version's and, like it, a ValueError is raised if any whole year or
+  month step lands on an invalid date (e.g. February 29th of a
+  non-leap year).
+  '''
+  if origin is None:
+    origin = epoch.now()
+  tz = epoch.getTz(tz)
+  age, origin = np.broadcast_arrays(_asarray(age), _asarray(origin))
+  fields = _localFields(origin, tz)
+  if fields is None:
+    return np.vectorize(epoch.age2ts, otypes=[np.float64])(age, origin, tz)
+  year, month, day, tod, usec, offset = fields
+  # note: the same operations in the same order as the scalar version
+  whole = np.trunc(age)
+  year = year + whole.astype(np.int64)
+  age = age - whole
+  _checkDate(year, month, day)
+  age = age * 12.0
+  whole = np.trunc(age).astype(np.int64)
+  month = month + whole
+  year = year + ( month > 12 ) - ( month < 1 )
+  month = ( month - 1 ) % 12 + 1
+  age = age - whole
+  _checkDate(year, month, day)
+  age = age * ( epoch.DAYSPERYEAR / 12.0 )
+  local = ( _civil2days(year, month, day) * 86400 + tod ) * 1000000 \
+    + usec + _days2us(age)
+  # note: just like the scalar version, the origin's UTC offset is used
+  #       for the result, without any DST correction.
+  sec, usec = np.divmod(local, 1000000)
+  return ( sec - offset ).astype(np.float64) + usec / 1000000.0
+
+#------------------------------------------------------------------------------
+def _checkDate(year, month, day):
+  bad = ( year < 1 ) | ( year > 9999 ) | ( day > _daysInMonth(year, month) )
+  if bad.any():
+    idx = np.flatnonzero(bad.ravel())[0]
+    raise ValueError('day is out of range for month: %04d-%02d-%02d' % (
+      year.ravel()[idx], month.ravel()[idx], day.ravel()[idx]))
+
+#------------------------------------------------------------------------------
+def _days2us(days):
+  '''
+  Converts a float64 array of days to integer microseconds, rounding
+  exactly as ``datetime.timedelta(days=...)`` does.
+  '''
+  whole = np.trunc(days)
+  frac = ( days - whole ) * 86400000000.0
+  part = np.trunc(frac)
+  left = frac - part
+  ret = whole.astype(np.int64) * 86400000000 + part.astype(np.int64)
+  # round the leftover half-away-from-zero, except that exact halves
+  # are rounded to make the result even
+  rnd = _roundAway(left)
+  odd = ret & 1
+  half = np.abs(rnd - left) == 0.5
+  rnd = np.where(half, 2.0 * _roundAway(( left + odd ) * 0.5) - odd, rnd)
+  return ret + rnd.astype(np.int64)
+
+#------------------------------------------------------------------------------
+def _roundAway(values):
+  # rounds half away from zero (like C's `round`), unlike `numpy.round`
+  return np.trunc(values + np.copysign(0.5, values))
+
+#------------------------------------------------------------------------------
+def _days2civil(days):
+  '''
+  Converts an integer array of days since 1970/01/01 to a tuple of
+  proleptic Gregorian (year, month, day) integer arrays.
+  '''
+  # see http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+  days = days + 719468
+  era = days // 146097
+  doe = days - era * 146097
+  yoe = ( doe - doe // 1460 + doe // 36524 - doe // 146096 ) // 365
+  doy = doe - ( 365 * yoe + yoe // 4 - yoe // 100 )
+  mp = ( 5 * doy + 2 ) // 153
+  day = doy - ( 153 * mp + 2 ) // 5 + 1
+  month = mp + 3 - 12 * ( mp // 10 )
+  year = yoe + era * 400 + ( month <= 2 )
+  return ( year, month, day )
+
+#------------------------------------------------------------------------------
+def _civil2days(year, month, day):
+  '''
+  Converts proleptic Gregorian (year, month, day) integer arrays to an
+  integer array of days since 1970/01/01.
+  '''
+  # see http://howardhinnant.github.io/date_algorithms.html#days_from_civil
+  year = year - ( month <= 2 )
+  era = year // 400
+  yoe = year - era * 400
+  doy = ( 153 * ( month + 9 - 12 * ( month > 2 ) ) + 2 ) // 5 + day - 1
+  return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+
+#------------------------------------------------------------------------------
+def _daysInMonth(year, month):
+  leap = ( year % 4 == 0 ) & ( ( year % 100 != 0 ) | ( year % 400 == 0 ) )
+  return _DAYSINMONTH[np.clip(month, 0, 12)] + ( leap & ( month == 2 ) )
+
+#------------------------------------------------------------------------------
+def _number(digits, start, stop):
+  ret = np.zeros(digits.shape[:-1], dtype=np.int64)
+  for pos in range(start, stop):
+    ret = ret * 10 + digits[..., pos]
+  return ret
+
+#------------------------------------------------------------------------------
+def _parseZulu(codes):
+  '''
+  Parses the canonical :func:`epoch.zulu` strings in the integer
+  character code array `codes`, whose last dimension holds the
+  characters of each string (padded with zeroes). Returns a tuple of
+  the parsed float64 timestamps and a boolean array indicating which
+  of them could be parsed (the others must be parsed with
+  :func:`epoch.parseZulu`).
+  '''
+  shape = codes.shape[:-1]
+  width = codes.shape[-1]
+  if width < 20:
+    return ( np.zeros(shape), np.zeros(shape, dtype=bool) )
+  # note: a millisecond string must end right after its "Z"
+  tail = codes[..., 24] == 0 if width > 24 else True
+  codes = codes[..., :24].astype(np.int64)
+  if width < 24:
+    codes = np.concatenate(
+      [codes, np.zeros(shape + (24 - width,), dtype=np.int64)], axis=-1)
+  digits = codes - 48
+  isms = ( codes[..., 19] == ord('.') ) & ( codes[..., 23] == ord('Z') ) & tail
+  ok = isms | ( ( codes[..., 19] == ord('Z') ) & ( codes[..., 20] == 0 ) )
+  for pos, char in ((4, '-'), (7, '-'), (10, 'T'), (13, ':'), (16, ':')):
+    ok &= codes[..., pos] == ord(char)
+  for pos in (0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18):
+    ok &= ( digits[..., pos] >= 0 ) & ( digits[..., pos] <= 9 )
+  for pos in (20, 21, 22):
+    ok &= ~isms | ( ( digits[..., pos] >= 0 ) & ( digits[..., pos] <= 9 ) )
+  year = _number(digits, 0, 4)
+  month = _number(digits, 5, 7)
+  day = _number(digits, 8, 10)
+  hour = _number(digits, 11, 13)
+  minute = _number(digits, 14, 16)
+  second = _number(digits, 17, 19)
+  msec = np.where(isms, _number(digits, 20, 23), 0)
+  ok &= ( year >= 1 ) & ( month >= 1 ) & ( month <= 12 ) & ( day >= 1 ) \
+    & ( day <= _daysInMonth(year, month) ) \
+    & ( hour <= 23 ) & ( minute <= 59 ) & ( second <= 59 )
+  secs = _civil2days(year, month, day) * 86400 \
+    + hour * 3600 + minute * 60 + second
+  return ( secs.astype(np.float64) + ( msec * 1000 ) / 1000000.0, ok )
+
+#------------------------------------------------------------------------------
+def parseZulu(values):
+  '''
+  Vectorized version of :func:`epoch.parseZulu`: returns a float64
+  array of the epoch timestamps parsed from the NumPy string (or
+  bytes) array `values`. Strings in the canonical :func:`epoch.zulu`
+  format are parsed in a single vectorized pass; any others are
+  parsed individually by :func:`epoch.parse`.
+  '''
+  values = np.asarray(values)
+  if values.dtype.kind == 'S':
+    codes = values.view(np.uint8).reshape(values.shape + (values.itemsize,))
+  elif values.dtype.kind == 'U':
+    codes = values.view(np.uint32).reshape(values.shape + (values.itemsize // 4,))
+  else:
+    codes = np.zeros(values.shape + (0,), dtype=np.uint8)
+  ret, ok = _parseZulu(codes)
+  if not ok.all():
+    for idx in zip(*np.nonzero(~ok)):
+      value = values[idx]
+      if isinstance(value, bytes):
+        value = value.decode('ascii')
+      ret[idx] = epoch.parse(value)
+  return ret
+
+#------------------------------------------------------------------------------
+def _digits(out, pos, values, count):
+  for idx in range(count):
+    out[..., pos + count - 1 - idx] = values // ( 10 ** idx ) % 10 + 48
+
+#------------------------------------------------------------------------------
+def _zulu(ts, ms=True):
+  '''
+  Returns a uint8 array with an extra trailing dimension holding the
+  ASCII :func:`epoch.zulu` representation of each timestamp in `ts`.
+  '''
+  ts = _asarray(ts)
+  sec = np.floor(ts).astype(np.int64)
+  days, rem = np.divmod(sec, 86400)
+  year, month, day = _days2civil(days)
+  ret = np.empty(ts.shape + (24 if ms else 20,), dtype=np.uint8)
+  _digits(ret, 0, year, 4)
+  _digits(ret, 5, month, 2)
+  _digits(ret, 8, day, 2)
+  _digits(ret, 11, rem // 3600, 2)
+  _digits(ret, 14, rem // 60 % 60, 2)
+  _digits(ret, 17, rem % 60, 2)
+  ret[..., (4, 7)] = ord('-')
+  ret[..., 10] = ord('T')
+  ret[..., (13, 16)] = ord(':')
+  if ms:
+    ret[..., 19] = ord('.')
+    _digits(ret, 20, np.round(ts * 1000).astype(np.int64) % 1000, 3)
+  ret[..., -1] = ord('Z')
+  return ret
+
+#------------------------------------------------------------------------------
+def zulu(ts, ms=True):
+  '''
+  Vectorized version of :func:`epoch.zulu`: returns a NumPy string
+  array of the zulu representation of each timestamp in `ts`, with
+  the same `ms` semantics.
+  '''
+  data = _zulu(ts, ms)
+  return np.ascontiguousarray(data).view('S%d' % (data.shape[-1],)) \
+    .reshape(data.shape[:-1]).astype(str)
+
+#------------------------------------------------------------------------------
+# end of $Id$
+# $ChangeLog$
+#------------------------------------------------------------------------------
@@ -39,9 +39,18 @@ test_dependencies = [
 
 dependencies = [
   'pytz                 >= 2013b',
-  'six                  >= 1.4.1',
 ]
 
+extras_dependencies = {
+  'numpy': [
+    'numpy              >= 1.9.0',
+  ],
+  'arrow': [
+    'numpy              >= 1.17.0',
+    'pyarrow            >= 1.0.0',
+  ],
+}
+
 classifiers = [
   'Development Status :: 3 - Alpha',
   # 'Development Status :: 4 - Beta',
@@ -73,6 +82,7 @@ setup(
   include_package_data  = True,
   zip_safe              = True,
   install_requires      = dependencies,
+  extras_require        = extras_dependencies,
   tests_require         = test_dependencies,
   test_suite            = 'epoch',
   license               = 'GPLv3+',